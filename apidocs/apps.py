@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class ApidocsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apidocs'
+
+
+class LeanSpectacularConfig(AppConfig):
+    """
+    drf-spectacular for ``DJANGO_PROFILE=lean``: templates and settings as
+    usual, but its system checks (which import the schema generator) are not
+    loaded at startup.
+    """
+    name = 'drf_spectacular'
+    verbose_name = "drf-spectacular"
@@ -0,0 +1,116 @@
+"""
+OpenAPI schema build artifact.
+
+``build_schema`` renders the schema once per format and stores only the
+compressed variants (``schema.<format>.gz`` and, when the ``brotli`` package
+is installed, ``schema.<format>.br``) plus a ``manifest.json`` holding the
+sha256 of every uncompressed document. At runtime the artifact is loaded once
+per process and served as-is; the plain body is only inflated for clients
+that accept neither encoding.
+"""
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+try:
+    import brotli
+except ImportError:  # gzip is always produced, brotli only when available
+    brotli = None
+
+MANIFEST = 'manifest.json'
+RENDERERS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(urlconf=spectacular_settings.SERVE_URLCONF)
+    return generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+
+
+def compress(body, encoding):
+    if encoding == 'gzip':
+        # mtime=0 keeps the output (and the build) reproducible
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    return brotli.compress(body, quality=11)
+
+
+def build(directory, schema=None):
+    """Render ``schema`` (generated if omitted) into ``directory``; returns the manifest."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    schema = generate_schema() if schema is None else schema
+    encodings = [encoding for encoding in SUFFIXES if encoding != 'br' or brotli is not None]
+
+    manifest = {}
+    for fmt, renderer_class in RENDERERS.items():
+        body = renderer_class().render(schema, renderer_class.media_type, {})
+        variants = {}
+        for encoding in encodings:
+            filename = f"schema.{fmt}{SUFFIXES[encoding]}"
+            data = compress(body, encoding)
+            (directory / filename).write_bytes(data)
+            variants[encoding] = {'file': filename, 'size': len(data)}
+        manifest[fmt] = {
+            'sha256': hashlib.sha256(body).hexdigest(),
+            'size': len(body),
+            'variants': variants,
+        }
+
+    # written last: a directory without a manifest is treated as missing
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+class SchemaDocument:
+    """One rendered format: its precompressed bodies and their strong ETags."""
+
+    def __init__(self, sha256, bodies):
+        self.sha256 = sha256
+        self.bodies = bodies
+
+    @property
+    def encodings(self):
+        return tuple(encoding for encoding in SUFFIXES if encoding in self.bodies)
+
+    def etag(self, encoding=None):
+        # the bytes differ per content-coding, so must the strong validator
+        return f'"{self.sha256}-{encoding}"' if encoding else f'"{self.sha256}"'
+
+    def body(self, encoding=None):
+        if encoding is None:
+            if None not in self.bodies:
+                self.bodies[None] = gzip.decompress(self.bodies['gzip'])
+            return self.bodies[None]
+        return self.bodies[encoding]
+
+
+def load(directory):
+    """Read an artifact built by ``build()``; ``None`` if there is none."""
+    directory = Path(directory)
+    try:
+        manifest = json.loads((directory / MANIFEST).read_text())
+    except FileNotFoundError:
+        return None
+
+    documents = {}
+    for fmt, entry in manifest.items():
+        bodies = {
+            encoding: (directory / variant['file']).read_bytes()
+            for encoding, variant in entry['variants'].items()
+        }
+        documents[fmt] = SchemaDocument(entry['sha256'], bodies)
+    return documents
+
+
+@lru_cache(maxsize=1)
+def get_artifact():
+    return load(settings.OPENAPI_SCHEMA_DIR)
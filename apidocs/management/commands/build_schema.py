@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apidocs import artifact
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once and store it as precompressed files served by /api/schema/."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir', default=str(settings.OPENAPI_SCHEMA_DIR),
+            help="Artifact directory (default: settings.OPENAPI_SCHEMA_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        manifest = artifact.build(options['output_dir'])
+        elapsed = time.perf_counter() - start
+
+        for fmt, entry in manifest.items():
+            sizes = ", ".join(f"{encoding} {variant['size']} B" for encoding, variant in entry['variants'].items())
+            self.stdout.write(f"schema.{fmt}: {entry['size']} B ({sizes})")
+        if artifact.brotli is None:
+            self.stdout.write(self.style.WARNING("brotli is not installed, only gzip variants were written."))
+        self.stdout.write(self.style.SUCCESS(
+            f"Schema written to {options['output_dir']} in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,10 @@
+from django.urls import path
+from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
+
+from .views import SchemaView
+
+urlpatterns = [
+    path('schema/', SchemaView.as_view(), name='schema'),
+    path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+]
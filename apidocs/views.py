@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.views import SpectacularAPIView
+
+from ecommerce.compression import accepted_encodings
+
+from .artifact import get_artifact
+
+
+class SchemaView(SpectacularAPIView):
+    """
+    Serve the OpenAPI schema from the artifact written by ``build_schema``.
+
+    The format is still picked by DRF content negotiation; the body is the
+    precompressed variant matching ``Accept-Encoding`` (brotli, then gzip) with
+    a strong ETag per variant, so revalidation costs a hash comparison. In
+    DEBUG, when no artifact has been built, or for ``?lang=``/``?version=``
+    requests the schema is generated live as before.
+    """
+
+    def get(self, request, *args, **kwargs):
+        artifact = None if settings.DEBUG else get_artifact()
+        if artifact is None or 'lang' in request.GET or 'version' in request.GET:
+            return super().get(request, *args, **kwargs)
+
+        renderer, media_type = self.perform_content_negotiation(request)
+        document = artifact[renderer.format]
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding = next((coding for coding in document.encodings if coding in accepted), None)
+        etag = document.etag(encoding)
+
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match)):
+            response = HttpResponseNotModified()
+        else:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(document.body(encoding), content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
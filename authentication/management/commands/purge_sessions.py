@@ -0,0 +1,59 @@
+"""
+Delete expired sessions (and, with ``--carts``, anonymous carts nobody
+touched for ``--cart-days``) in small batches, each its own short
+transaction, instead of the single ``DELETE`` of ``clearsessions`` that
+locks ``django_session`` for as long as it runs.
+
+    manage.py purge_sessions                             # e.g. hourly from cron
+    manage.py purge_sessions --carts --batch-size 500 --pause 0.1
+
+Only the database rows of the ``db``/``cached_db`` engines are purged;
+``cache`` and ``signed_cookies`` sessions expire on their own.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cart.models import CartItem
+
+BATCH_SIZE = 1000
+
+
+def purge(queryset, batch_size=BATCH_SIZE, pause=0):
+    """Delete the rows of ``queryset`` ``batch_size`` at a time; returns how many were deleted."""
+    model, total = queryset.model, 0
+    while True:
+        keys = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not keys:
+            return total
+        # nothing references sessions or cart items: skip the deletion collector
+        batch = model.objects.filter(pk__in=keys)
+        total += batch._raw_delete(batch.db)
+        if pause:
+            time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions (and stale anonymous carts) in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument('--carts', action='store_true', help="Also delete stale anonymous carts.")
+        parser.add_argument('--cart-days', type=int, default=settings.SESSION_COOKIE_AGE // 86400,
+                            help="Anonymous carts untouched for this many days are stale "
+                                 "(default: the session cookie age, %(default)s).")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        start = time.perf_counter()
+        sessions = purge(Session.objects.filter(expire_date__lt=now), options['batch_size'], options['pause'])
+        message = f"Deleted {sessions} expired session(s)"
+        if options['carts']:
+            stale = CartItem.objects.filter(user__isnull=True, updated_at__lt=now - timedelta(days=options['cart_days']))
+            message += f" and {purge(stale, options['batch_size'], options['pause'])} stale anonymous cart item(s)"
+        self.stdout.write(self.style.SUCCESS(f"{message} in {time.perf_counter() - start:.1f}s."))
@@ -1,12 +1,13 @@
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import authenticate, logout
+from django.contrib.auth.signals import user_logged_in
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .models import CustomUser
+from mailer.outbox import enqueue
 from rest_framework.authtoken.models import Token
 from .serializers import (
     RegisterSerializer, LoginSerializer, UserProfileSerializer, ResetPasswordSerializer
@@ -25,7 +26,8 @@ class LoginView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         user = serializer.user  # Retrieve the authenticated user
-        login(request, user)  # Log the user in
+        # the API authenticates with the token: no session, only what login() signals (last_login)
+        user_logged_in.send(sender=user.__class__, request=request, user=user)
         token, created = Token.objects.get_or_create(user=user)  # Generate or retrieve token
 
         return Response({"token": token.key, "message": "Login successful"}, status=status.HTTP_200_OK)
@@ -51,10 +53,6 @@ class ResetPasswordView(generics.GenericAPIView):
         user = get_object_or_404(CustomUser, email=serializer.validated_data['email'])
         token = default_token_generator.make_token(user)
         reset_link = f"http://yourdomain.com/reset-password/{user.pk}/{token}/"
-        send_mail(
-            subject="Password Reset",
-            message=f"Reset your password using the following link: {reset_link}",
-            from_email="noreply@yourdomain.com",
-            recipient_list=[user.email]
-        )
+        # sent by `manage.py send_outbox`; repeated requests are coalesced
+        enqueue('password_reset', user.email, {'reset_link': reset_link}, key=f'password-reset:{user.pk}')
         return Response({"message": "Password reset link sent"}, status=status.HTTP_200_OK)
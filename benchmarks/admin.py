@@ -0,0 +1,76 @@
+"""
+Latency and query count of the admin change lists staff use on large
+tables: unfiltered, filtered by status and searched, plus a deep page.
+
+    python -m benchmarks.admin --scale 1000000
+"""
+import argparse
+import io
+import time
+
+from .common import print_table, setup_django, test_database
+
+PAGES = {
+    "products": "/admin/products/product/",
+    "products, page 5000": "/admin/products/product/?p=5000",
+    "products, search": "/admin/products/product/?q=Smart+Glass",
+    "orders": "/admin/orders/order/",
+    "orders, pending": "/admin/orders/order/?status__exact=PENDING",
+    "orders, search user": "/admin/orders/order/?q=bench-user-00001",
+    "payments": "/admin/payments/payment/",
+    "payments, pending": "/admin/payments/payment/?status__exact=PENDING",
+    "payments, search order": "/admin/payments/payment/?q=4242",
+    "reviews": "/admin/reviews/review/",
+    "reviews, pending": "/admin/reviews/review/?is_approved__exact=0",
+    "reviews, search product": "/admin/reviews/review/?q=Smart+Glass",
+    "cart items": "/admin/cart/cartitem/",
+    "cart items, search user": "/admin/cart/cartitem/?q=bench-user-00001",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client, override_settings
+
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        started = time.perf_counter()
+        call_command("seed_data", scale=args.scale, stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        print(f"seeded {args.scale} products in {time.perf_counter() - started:.0f}s")
+
+        client = Client()
+        client.force_login(get_user_model().objects.create_superuser("admin-bench", "admin-bench@example.com", None))
+        for name, path in PAGES.items():
+            response = client.get(path)
+            assert response.status_code == 200, (path, response.status_code)
+            timings = []
+            for _ in range(args.repeat):
+                queries.clear()
+                with connection.execute_wrapper(count):
+                    began = time.perf_counter()
+                    client.get(path)
+                    timings.append(time.perf_counter() - began)
+            rows.append({"page": name, "best_ms": round(min(timings) * 1000, 1),
+                         "median_ms": round(sorted(timings)[len(timings) // 2] * 1000, 1), "queries": len(queries)})
+
+    print_table(rows, ["page", "best_ms", "median_ms", "queries"])
+
+
+if __name__ == "__main__":
+    main()
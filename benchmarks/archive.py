@@ -0,0 +1,127 @@
+"""
+Order list latency against the size of the order history, before and after
+``manage.py archive_orders``:
+
+1. all orders hot, foreign key index on ``user`` only (the old schema),
+2. all orders hot, ``(user, created_at)`` index,
+3. after archiving everything older than ``--days``,
+4. same, with ``?include_archived=true``.
+
+``--orders`` rows are spread over three years, ``--users`` users and the
+anonymous bucket (``--anonymous`` share of the orders, ``user IS NULL``).
+
+    python -m benchmarks.archive --orders 10000000
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from .common import print_table, setup_django, summarize, test_database
+
+STATUSES = ["COMPLETED"] * 7 + ["CANCELLED"] + ["PENDING", "PROCESSING"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--anonymous", type=float, default=0.2)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import override_settings
+    from django.utils import timezone
+    from orders import archive
+    from orders.models import ArchivedOrder, Order
+    from payments.models import Payment
+    from rest_framework.test import APIClient
+
+    User = get_user_model()
+    rows = []
+
+    def seed(users):
+        qn = connection.ops.quote_name
+        now = timezone.now()
+        rng = random.Random(0)
+        span = 3 * 365 * 86400
+        order_sql = (f"INSERT INTO {qn(Order._meta.db_table)} (id, user_id, created_at, updated_at, status, total_amount) "
+                     f"VALUES (%s, %s, %s, %s, %s, %s)")
+        payment_sql = (f"INSERT INTO {qn(Payment._meta.db_table)} (order_id, payment_method, transaction_id, amount, "
+                       f"status, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s)")
+        batch = 50000
+        with connection.cursor() as cursor:
+            for first in range(1, args.orders + 1, batch):
+                orders, payments = [], []
+                # ids ascend with created_at, like real traffic
+                for pk in range(first, min(first + batch, args.orders + 1)):
+                    created = now - timedelta(seconds=span * (1 - pk / args.orders))
+                    user = None if rng.random() < args.anonymous else rng.choice(users)
+                    status = STATUSES[rng.randrange(len(STATUSES))] if created < now - timedelta(days=7) else "PENDING"
+                    amount = Decimal(rng.randrange(500, 50000)) / 100
+                    orders.append((pk, user, created, created, status, amount))
+                    if pk % 4 == 0:
+                        payments.append((pk, "CREDIT_CARD", f"txn-{pk}", amount,
+                                         "COMPLETED" if status == "COMPLETED" else "PENDING", created, created))
+                cursor.executemany(order_sql, orders)
+                cursor.executemany(payment_sql, payments)
+
+    def measure(case, client, url, user):
+        client.force_authenticate(user)
+        assert client.get(url).status_code == 200
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            began = time.perf_counter()
+            client.get(url)
+            latencies.append(time.perf_counter() - began)
+        summary = summarize(latencies, time.perf_counter() - start)
+        rows.append({"case": case, "caller": "user" if user else "anonymous",
+                     "p50_ms": summary["p50_ms"], "p99_ms": summary["p99_ms"]})
+
+    def measure_all(case, url="/api/orders/"):
+        client = APIClient()
+        for user in (users_by_pk[0], None):
+            measure(case, client, url, user)
+
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        User.objects.bulk_create(User(username=f"bench{i}", email=f"bench{i}@example.com") for i in range(args.users))
+        users_by_pk = list(User.objects.order_by("pk"))
+        start = time.perf_counter()
+        seed([user.pk for user in users_by_pk])
+        seed_seconds = time.perf_counter() - start
+
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX order_user_created_idx")
+            cursor.execute(f"CREATE INDEX order_user_id_idx ON {Order._meta.db_table} (user_id)")
+            cursor.execute("ANALYZE")
+        measure_all("hot, user index only")
+
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX order_user_id_idx")
+            cursor.execute(f"CREATE INDEX order_user_created_idx ON {Order._meta.db_table} (user_id, created_at)")
+            cursor.execute("ANALYZE")
+        measure_all("hot, (user, created_at)")
+
+        start = time.perf_counter()
+        moved = archive.archive(timezone.now() - timedelta(days=args.days), batch_size=5000)
+        archive_seconds = time.perf_counter() - start
+        hot = Order.objects.count()
+        assert hot + ArchivedOrder.objects.count() == args.orders
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        measure_all("archived")
+        measure_all("archived, include_archived", "/api/orders/?include_archived=true")
+
+    print(f"{args.orders} orders seeded in {seed_seconds:.0f}s; {moved} archived in {archive_seconds:.0f}s "
+          f"({moved / archive_seconds:.0f}/s), {hot} left hot")
+    print_table(rows, ["case", "caller", "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Sync (gunicorn sync workers + WSGI) vs async (gunicorn uvicorn workers + ASGI)
+load comparison on the hot read paths.
+
+    python -m benchmarks.async_views --connections 500 --duration 30
+
+Without ``--database-url`` a throw-away SQLite database is migrated and seeded;
+point it at PostgreSQL for numbers that are representative of production.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from .common import print_table, setup_django
+from .loadgen import gunicorn_server, run_load
+
+SYNC_PATHS = [
+    "/api/products/",
+    "/api/products/{product}/",
+    "/api/categories/all/",
+    "/api/reviews/product/{product}/",
+    "/api/cart/my_cart/",
+]
+ASYNC_PATHS = [
+    "/api/products/async/",
+    "/api/products/async/{product}/",
+    "/api/categories/all/async/",
+    "/api/reviews/product/{product}/async/",
+    "/api/cart/async/my_cart/",
+]
+
+
+def seed(products):
+    from django.core.management import call_command
+    from categories.models import Category
+    from products.models import Product
+    from reviews.models import Review
+
+    call_command("migrate", verbosity=0)
+    if Product.objects.exists():
+        return list(Product.objects.values_list("id", flat=True)[:200])
+
+    rng = random.Random(42)
+    Category.objects.bulk_create(Category(name=f"Category {i}") for i in range(50))
+    Product.objects.bulk_create(
+        Product(name=f"Product {i}", description="Lorem ipsum " * 20,
+                price=f"{rng.uniform(1, 500):.2f}", stock=rng.randint(0, 100))
+        for i in range(products)
+    )
+    ids = list(Product.objects.values_list("id", flat=True)[:200])
+    Review.objects.bulk_create(
+        Review(product_id=rng.choice(ids), rating=rng.randint(1, 5),
+               comment="Great value", is_approved=True)
+        for _ in range(products)
+    )
+    return ids
+
+
+def expand(paths, product_ids, count=200):
+    rng = random.Random(7)
+    return [rng.choice(paths).format(product=rng.choice(product_ids)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite3"
+    os.environ["DATABASE_URL"] = database_url
+    setup_django()
+    product_ids = seed(args.products)
+
+    rows = []
+    for stack, mode, paths in (("sync", "wsgi", SYNC_PATHS), ("async", "asgi", ASYNC_PATHS)):
+        with gunicorn_server(mode, args.port, args.workers, env={"DATABASE_URL": database_url}):
+            result = run_load("127.0.0.1", args.port, expand(paths, product_ids),
+                              connections=args.connections, duration=args.duration)
+        rows.append({"stack": stack, "connections": args.connections, **result})
+
+    print_table(rows, ["stack", "connections", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
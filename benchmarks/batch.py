@@ -0,0 +1,74 @@
+"""
+Resolving ``--ids`` products, orders and payments: one detail request per
+id vs one ``batch/?ids=`` request with a cold cache, a warm cache and half
+of the ids cached.
+
+    python -m benchmarks.batch --products 20000 --ids 100
+"""
+import argparse
+import io
+
+from .common import print_table, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--ids", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client, override_settings
+    from orders.models import Order
+    from payments.models import Payment
+    from products.models import Product
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        client = Client()
+
+        def measure(resource, case, func, prepare=lambda: None):
+            queries = []
+            prepare()
+            with connection.execute_wrapper(lambda execute, *params: queries.append(1) or execute(*params)):
+                func()
+
+            best = float("inf")
+            for _ in range(args.repeat):
+                prepare()
+                best = min(best, timed(func, 1))
+            rows.append({"resource": resource, "case": case, "ms": round(best * 1000, 2), "queries": len(queries)})
+
+        for resource, model in (("products", Product), ("orders", Order), ("payments", Payment)):
+            # spread over the table, in no particular order
+            ids = list(model.objects.order_by("?").values_list("pk", flat=True)[:args.ids])
+            url = f"/api/{resource}/batch/?ids={','.join(map(str, ids))}"
+            half = f"/api/{resource}/batch/?ids={','.join(map(str, ids[::2]))}"
+
+            def details():
+                for pk in ids:
+                    assert client.get(f"/api/{resource}/{pk}/").status_code == 200
+
+            def batch():
+                response = client.get(url)
+                assert response.status_code == 200 and len(response.json()["results"]) == len(ids)
+
+            def warm_half():
+                cache.clear()
+                client.get(half)
+
+            measure(resource, f"{len(ids)} detail requests", details)
+            measure(resource, "batch, cold cache", batch, cache.clear)
+            measure(resource, "batch, half cached", batch, warm_half)
+            measure(resource, "batch, warm cache", batch)
+
+    print_table(rows, ["resource", "case", "ms", "queries"])
+
+
+if __name__ == "__main__":
+    main()
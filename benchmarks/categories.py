@@ -0,0 +1,90 @@
+"""
+Category tree benchmark: subtree product filtering through the materialized
+path range vs walking parent links level by level, and the cached tree
+endpoint vs the paginated category list.
+
+    python -m benchmarks.categories --categories 10000 --depth 8 --products 100000
+"""
+import argparse
+
+from .common import print_table, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=10000)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection
+    from django.db.models import Count
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+    from categories.models import Category, subtree_q
+    from categories.tree import bump_tree_version, get_tree
+    from products.models import Product
+
+    def recursive_ids(root):
+        # what a plain parent/child model needs: one query per level
+        ids, level = [root.pk], [root.pk]
+        while level:
+            level = list(Category.objects.filter(parent_id__in=level).values_list("pk", flat=True))
+            ids.extend(level)
+        return ids
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, categories=args.categories,
+                     max_depth=args.depth, verbosity=0, stdout=open("/dev/null", "w"))
+        levels = Category.objects.values("depth").annotate(n=Count("pk")).order_by("depth")
+        print("categories per level:", {row["depth"]: row["n"] for row in levels})
+
+        # the largest and a mid-level subtree
+        root = Category.objects.filter(depth=0).annotate(n=Count("children")).order_by("-n").first()
+        mid = Category.objects.filter(depth=args.depth // 2).order_by("pk").first()
+        for label, node in (("root", root), (f"depth {mid.depth}", mid)):
+            path_query = lambda: Product.objects.filter(subtree_q(node.path, prefix="category__")).count()
+            walk_query = lambda: Product.objects.filter(category_id__in=recursive_ids(node)).count()
+            assert path_query() == walk_query()
+            with CaptureQueriesContext(connection) as walk_queries:
+                walk_query()
+            rows.append({
+                "case": f"subtree products ({label}: {Category.objects.subtree(node).count()} categories, "
+                        f"{path_query()} products)",
+                "path_range_ms": round(timed(path_query, args.repeat) * 1000, 2),
+                "recursive_ms": round(timed(walk_query, args.repeat) * 1000, 2),
+                "recursive_queries": len(walk_queries),
+            })
+        print(Product.objects.filter(subtree_q(root.path, prefix="category__")).explain())
+
+        client = Client()
+
+        def cold():
+            bump_tree_version()
+            return client.get("/api/categories/tree/")
+
+        response = client.get("/api/categories/tree/")
+        etag = response["ETag"]
+        tree_rows = [
+            ("tree endpoint, cache miss (build + render)", cold),
+            ("tree endpoint, cache hit", lambda: client.get("/api/categories/tree/")),
+            ("tree endpoint, 304", lambda: client.get("/api/categories/tree/", HTTP_IF_NONE_MATCH=etag)),
+            ("get_tree() cache hit", get_tree),
+            ("/api/categories/all/ (one page of 10)", lambda: client.get("/api/categories/all/")),
+        ]
+        for label, func in tree_rows:
+            rows.append({"case": label, "path_range_ms": round(timed(func, args.repeat) * 1000, 3)})
+        rows.append({"case": f"tree payload: {len(response.content)} bytes, "
+                             f"/api/categories/all/ needs {args.categories // 10} pages for the same data"})
+        cache.clear()
+
+    print_table(rows, ["case", "path_range_ms", "recursive_ms", "recursive_queries"])
+
+
+if __name__ == "__main__":
+    main()
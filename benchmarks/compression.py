@@ -0,0 +1,78 @@
+"""
+Bytes on the wire and latency of the largest read endpoints, without the
+compression middleware (as before), and with it for clients that accept no
+coding, gzip and brotli; ``at_10mbit_ms`` is the time the body takes on a
+10 Mbit/s link. Also prints the caching headers each endpoint now
+sends and how many surrogate keys it carries.
+
+    python -m benchmarks.compression --products 5000 --requests 200
+"""
+import argparse
+import io
+import time
+
+from .common import print_table, setup_django, summarize, test_database
+
+MODES = {
+    "off (before)": None,
+    "identity": "identity",
+    "gzip": "gzip, deflate",
+    "br": "br, gzip",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db.models import Count
+    from django.test import Client, override_settings
+    from reviews.models import Review
+
+    middleware = [name for name in settings.MIDDLEWARE if name != "ecommerce.compression.CompressionMiddleware"]
+    rows, headers = [], []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        product_id = (Review.objects.filter(is_approved=True).values("product_id").annotate(reviews=Count("pk"))
+                      .order_by("-reviews").values_list("product_id", flat=True).first())
+        endpoints = {
+            "products, 100 per page": "/api/products/?limit=100",
+            "product reviews": f"/api/reviews/product/{product_id}/",
+            "category tree": "/api/categories/tree/",
+            "categories": "/api/categories/all/",
+            "orders": "/api/orders/",
+        }
+        for name, path in endpoints.items():
+            for mode, accept in MODES.items():
+                extra = {"HTTP_ACCEPT_ENCODING": accept} if accept else {}
+                with override_settings(MIDDLEWARE=settings.MIDDLEWARE if accept else middleware):
+                    # a client loads the middleware on its first request
+                    client = Client()
+                    response = client.get(path, **extra)
+                    assert response.status_code == 200, (path, response.status_code)
+                    latencies = []
+                    began = time.perf_counter()
+                    for _ in range(args.requests):
+                        started = time.perf_counter()
+                        client.get(path, **extra)
+                        latencies.append(time.perf_counter() - started)
+                    stats = summarize(latencies, time.perf_counter() - began)
+                rows.append({"endpoint": name, "mode": mode, "bytes": len(response.content),
+                             "at_10mbit_ms": round(len(response.content) * 8 / 10_000, 2),
+                             "p50_ms": stats["p50_ms"], "p95_ms": stats["p95_ms"]})
+            headers.append({"endpoint": name, "cache_control": response.get("Cache-Control", ""),
+                            "vary": response.get("Vary", ""),
+                            "surrogate_keys": len(response.get(settings.SURROGATE_KEY_HEADER, "").split())})
+
+    print_table(rows, ["endpoint", "mode", "bytes", "at_10mbit_ms", "p50_ms", "p95_ms"])
+    print()
+    print_table(headers, ["endpoint", "cache_control", "vary", "surrogate_keys"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Endpoints driven by ``manage.py run_benchmarks``.
+
+Paths are formatted with the fixture ids picked by ``load_fixtures()``;
+``data`` is a dict or a callable ``(fixtures, iteration) -> dict`` for
+requests that need a fresh payload every time. Write endpoints run inside a
+transaction that is rolled back, so a run leaves the database untouched.
+New endpoints only need an entry in ``ENDPOINTS``.
+"""
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+
+
+class Endpoint:
+    def __init__(self, name, path, method='get', data=None, auth=False, write=False):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.data = data
+        self.auth = auth
+        self.write = write
+
+    def url(self, fixtures):
+        return self.path.format(**fixtures)
+
+    def payload(self, fixtures, iteration):
+        return self.data(fixtures, iteration) if callable(self.data) else self.data
+
+
+ENDPOINTS = [
+    # catalog
+    Endpoint('products-list', '/api/products/'),
+    Endpoint('products-list-filtered', '/api/products/?min_price=10&max_price=200&ordering=-price&limit=50'),
+    Endpoint('products-list-search', '/api/products/?search=Walnut'),
+    Endpoint('products-list-deep-page', '/api/products/?page=50'),
+    Endpoint('products-list-sparse', '/api/products/?fields=id,name,price'),
+    Endpoint('products-list-category-subtree', '/api/products/?category={root_category_id}'),
+    Endpoint('products-list-facets', '/api/products/?category={root_category_id}&facets=all'),
+    Endpoint('products-suggest', '/api/products/suggest/?q=smart wa'),
+    Endpoint('products-list-async', '/api/products/async/'),
+    Endpoint('products-detail', '/api/products/{product_id}/'),
+    Endpoint('products-detail-async', '/api/products/async/{product_id}/'),
+    Endpoint('products-recommendations', '/api/products/{product_id}/recommendations/'),
+    Endpoint('products-batch', '/api/products/batch/?ids={product_ids}'),
+    Endpoint('categories-list', '/api/categories/all/'),
+    Endpoint('categories-list-async', '/api/categories/all/async/'),
+    Endpoint('categories-detail', '/api/categories/{category_id}/'),
+    Endpoint('categories-tree', '/api/categories/tree/'),
+    Endpoint('reviews-list', '/api/reviews/product/{product_id}/'),
+    Endpoint('reviews-list-expanded', '/api/reviews/product/{product_id}/?expand=product'),
+    Endpoint('reviews-list-async', '/api/reviews/product/{product_id}/async/'),
+    Endpoint('schema', '/api/schema/'),
+
+    # account
+    Endpoint('auth-login', '/api/auth/login/', 'post', lambda f, i: {'username': f['username'], 'password': f['password']}, write=True),
+    Endpoint('auth-profile', '/api/auth/profile/', auth=True),
+
+    # cart, wishlist, orders
+    Endpoint('cart-my-cart', '/api/cart/my_cart/', auth=True),
+    Endpoint('cart-my-cart-async', '/api/cart/async/my_cart/', auth=True),
+    Endpoint('cart-my-cart-anonymous', '/api/cart/my_cart/'),
+    Endpoint('cart-add', '/api/cart/', 'post', lambda f, i: {'product': f['product_id'], 'quantity': 1}, auth=True, write=True),
+    Endpoint('wishlist-list', '/api/wishlist/'),
+    Endpoint('wishlist-list-expanded', '/api/wishlist/?expand=product'),
+    Endpoint('wishlist-move-to-cart', '/api/wishlist/move-to-cart/', 'post', {}, auth=True, write=True),
+    Endpoint('orders-list', '/api/orders/', auth=True),
+    Endpoint('orders-detail', '/api/orders/{order_id}/', auth=True),
+    Endpoint('orders-batch', '/api/orders/batch/?ids={order_ids}'),
+    Endpoint('orders-create', '/api/orders/', 'post', lambda f, i: {'items': [{'product': f['product_id'], 'quantity': 1}]},
+             auth=True, write=True),
+    Endpoint('payments-list', '/api/payments/'),
+    Endpoint('payments-list-expanded', '/api/payments/?expand=order'),
+    Endpoint('payments-detail', '/api/payments/{payment_id}/'),
+    Endpoint('payments-batch', '/api/payments/batch/?ids={payment_ids}'),
+    Endpoint('reviews-create', '/api/reviews/', 'post',
+             lambda f, i: {'product': f['product_id'], 'rating': 4, 'comment': f"Benchmark review {i}"}, write=True),
+    Endpoint('reviews-helpful', '/api/reviews/{review_id}/helpful/', 'put', {}, write=True),
+]
+
+
+def load_fixtures():
+    """Ids used to fill the endpoint paths, taken from the seeded data."""
+    from benchmarks.management.commands.seed_data import PASSWORD, USERNAME_PREFIX
+    from categories.models import Category
+    from orders.models import Order
+    from payments.models import Payment
+    from products.models import Product
+    from reviews.models import Review
+
+    user = (
+        get_user_model().objects.filter(username__startswith=USERNAME_PREFIX, orders__isnull=False)
+        .order_by('pk').first()
+    )
+    if user is None:
+        raise LookupError("No benchmark data found, run `manage.py seed_data` first.")
+    token, _ = Token.objects.get_or_create(user=user)
+    # seed_data skews reviews towards the first products: the expensive end of the review list
+    product_id = Review.objects.order_by('product_id').values_list('product_id', flat=True).first()
+    return {
+        'username': user.username,
+        'password': PASSWORD,
+        'token': token.key,
+        'product_id': product_id or Product.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'category_id': Category.objects.order_by('-depth', 'pk').values_list('pk', flat=True).first(),
+        'root_category_id': Category.objects.filter(parent=None).order_by('pk').values_list('pk', flat=True).first(),
+        'order_id': Order.objects.filter(user=user).order_by('pk').values_list('pk', flat=True).first(),
+        'payment_id': Payment.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'review_id': Review.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'product_ids': ','.join(map(str, Product.objects.order_by('pk').values_list('pk', flat=True)[:100])),
+        'order_ids': ','.join(map(str, Order.objects.order_by('pk').values_list('pk', flat=True)[:100])),
+        'payment_ids': ','.join(map(str, Payment.objects.order_by('pk').values_list('pk', flat=True)[:100])),
+    }
@@ -0,0 +1,93 @@
+"""
+Query plans of recorded queries, reduced to what the index advisor
+(``manage.py advise_indexes``) reports:
+
+* ``full scan``: a table read row by row (SQLite ``SCAN <table>`` without
+  an index, Postgres ``Seq Scan``);
+* ``sort``: rows sorted after the fact instead of read in index order
+  (SQLite ``USE TEMP B-TREE FOR ORDER BY``, Postgres ``Sort``).
+
+SQLite and Postgres only; other backends report nothing.
+"""
+import json
+import re
+from dataclasses import dataclass
+
+# ``FROM "reviews_review" U0``: the aliases Django gives subquery tables
+ALIAS_RE = re.compile(r'"(\w+)"\s+([A-Z]\d+)\b')
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS (\w+))?$')
+SQLITE_SEARCH_RE = re.compile(r'^(?:SEARCH|SCAN) (\w+)')
+
+
+@dataclass(frozen=True)
+class Finding:
+    issue: str
+    table: str
+    detail: str
+
+
+def normalize(sql):
+    """Collapse ``IN (%s, %s, ...)`` lists so the same query with other ids groups together."""
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+def explainable(sql):
+    return sql.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+
+def explain(connection, sql, params):
+    """``[Finding]`` for the plan of ``sql``."""
+    if connection.vendor == 'sqlite':
+        return explain_sqlite(connection, sql, params)
+    if connection.vendor == 'postgresql':
+        return explain_postgresql(connection, sql, params)
+    return []
+
+
+def explain_sqlite(connection, sql, params):
+    aliases = {alias: table for table, alias in ALIAS_RE.findall(sql)}
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        details = [row[3] for row in cursor.fetchall()]
+
+    findings, last_table = [], None
+    for detail in details:
+        scan = SQLITE_SCAN_RE.match(detail)
+        if scan:
+            # "SCAN t USING INDEX ..." walks an index (in order), that is not a full scan
+            name = scan.group(1)
+            findings.append(Finding('full scan', aliases.get(name, name), detail))
+        if detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            findings.append(Finding('sort', last_table or '?', detail))
+        table = SQLITE_SEARCH_RE.match(detail)
+        if table:
+            last_table = aliases.get(table.group(1), table.group(1))
+    return findings
+
+
+def explain_postgresql(connection, sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    findings = []
+
+    def walk(node):
+        relations = []
+        for child in node.get('Plans', []):
+            relations += walk(child)
+        if 'Relation Name' in node:
+            relations.append(node['Relation Name'])
+        if node['Node Type'] == 'Seq Scan':
+            findings.append(Finding('full scan', node['Relation Name'],
+                                    f"Seq Scan on {node['Relation Name']} (~{node.get('Plan Rows')} rows)"))
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            findings.append(Finding('sort', relations[0] if relations else '?',
+                                    f"{node['Node Type']} by {', '.join(node.get('Sort Key', []))}"))
+        return relations
+
+    walk(plan[0]['Plan'])
+    return findings
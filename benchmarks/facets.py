@@ -0,0 +1,106 @@
+"""
+Facet counts: one COUNT query per facet value vs the grouped queries of
+``products.facets`` (cold and cached), with query counts.
+
+    python -m benchmarks.facets --products 100000 --categories 2000
+"""
+import argparse
+import io
+
+from .common import print_table, setup_django, test_database, timed
+
+QUERIES = [
+    "",
+    "?category=Electronics",
+    "?category=Electronics&min_price=50&max_price=500",
+    "?min_rating=4",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--categories", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection
+    from django.db.models import Q
+    from django.test import RequestFactory, override_settings
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.request import Request
+    from categories.models import Category, subtree_q
+    from categories.tree import resolve_category
+    from products.facets import PriceFacet, RatingFacet, product_facets
+    from products.views import ProductListCreateView
+
+    factory = RequestFactory()
+
+    def make_view(query):
+        view = ProductListCreateView()
+        view.request = Request(factory.get(f"/api/products/{query}&facets=all" if query else "/api/products/?facets=all"))
+        view.format_kwarg = None
+        return view
+
+    def naive(view):
+        # what a per-value implementation costs: one COUNT per bucket, child and threshold
+        params = product_facets.filter_params(view)
+        queryset = product_facets.queryset(view, params)
+        result = {}
+        buckets = PriceFacet.buckets
+        result["price"] = [
+            queryset.filter(Q(price__gte=low) & (Q(price__lt=high) if high else Q())).count()
+            for low, high in zip(buckets, buckets[1:])
+        ]
+        selected = resolve_category(params["category"]) if "category" in params else None
+        children = (
+            Category.objects.filter(parent__path=selected[0]) if selected else Category.objects.filter(parent=None)
+        )
+        result["category"] = [
+            queryset.filter(subtree_q(path, prefix="category__")).count()
+            for path in children.values_list("path", flat=True)
+        ]
+        result["rating"] = [
+            queryset.with_rating().filter(rating__gte=value).count() for value in RatingFacet.thresholds
+        ]
+        return result
+
+    def engine(view):
+        return product_facets.counts(view, tuple(product_facets.facets))
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False):
+        call_command("seed_data", scale=args.products, categories=args.categories, stdout=io.StringIO())
+        for query in QUERIES:
+            view = make_view(query)
+            with CaptureQueriesContext(connection) as naive_queries:
+                naive(view)
+            cache.clear()
+            with CaptureQueriesContext(connection) as cold_queries:
+                engine(view)
+            with CaptureQueriesContext(connection) as warm_queries:
+                engine(view)
+
+            def cold():
+                cache.clear()
+                engine(view)
+
+            rows.append({
+                "filters": query or "(none)",
+                "naive_ms": round(timed(lambda: naive(view), args.repeat) * 1000, 1),
+                "naive_queries": len(naive_queries),
+                "engine_cold_ms": round(timed(cold, args.repeat) * 1000, 1),
+                "engine_queries": len(cold_queries),
+                "cached_ms": round(timed(lambda: engine(view), args.repeat) * 1000, 3),
+                "cached_queries": len(warm_queries),
+            })
+
+    print_table(rows, ["filters", "naive_ms", "naive_queries", "engine_cold_ms", "engine_queries",
+                       "cached_ms", "cached_queries"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Latency of the queries behind the list endpoints, the admin status filters
+and the archival job, without and with the indexes added for
+``manage.py advise_indexes`` (product price/name, order and payment status,
+the partial review indexes). "without" drops them and restores the former
+review indexes; "with" is the current schema.
+
+    python -m benchmarks.indexes --scale 1000000
+"""
+import argparse
+import io
+import time
+from datetime import timedelta
+
+from .common import print_table, setup_django, test_database
+
+# the review indexes the partial ones replaced (reviews/migrations/0004)
+OLD_REVIEW_INDEXES = [
+    (['product', 'is_approved', '-created_at'], 'review_product_recent_idx'),
+    (['product', 'is_approved', '-helpful_votes', '-created_at'], 'review_product_helpful_idx'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.db import connection, models
+    from django.utils import timezone
+    from orders.models import Order
+    from payments.models import Payment
+    from products.models import Product
+    from reviews.models import Review
+
+    new_indexes = [
+        (model, index)
+        for model in (Product, Order, Payment, Review)
+        for index in model._meta.indexes
+        if index.name in ('product_price_idx', 'product_name_idx', 'order_status_idx', 'payment_status_idx',
+                          'review_approved_recent_idx', 'review_approved_helpful_idx', 'review_pending_idx')
+    ]
+    old_indexes = [(Review, models.Index(fields=fields, name=name)) for fields, name in OLD_REVIEW_INDEXES]
+
+    def swap(drop, create):
+        with connection.schema_editor() as editor:
+            for model, index in drop:
+                editor.remove_index(model, index)
+            for model, index in create:
+                editor.add_index(model, index)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    with test_database():
+        start = time.perf_counter()
+        call_command("seed_data", scale=args.scale, stdout=io.StringIO())
+        seed_seconds = time.perf_counter() - start
+        product = Review.objects.order_by('product_id').values_list('product_id', flat=True).first()
+        before = timezone.now() - timedelta(days=90)
+        # orders/archive.py ordered its batches by pk before order_status_idx
+        archive_ordering = ['pk']
+        queries = {
+            "products by price, page 1": lambda: list(Product.objects.order_by('price')[:10]),
+            "products by price, page 500": lambda: list(Product.objects.order_by('price')[4990:5000]),
+            "products by name, page 1": lambda: list(Product.objects.order_by('name')[:10]),
+            "approved reviews, newest": lambda: list(
+                Review.objects.filter(product_id=product, is_approved=True).order_by('-created_at')[:10]),
+            "approved reviews, most helpful": lambda: list(
+                Review.objects.filter(product_id=product, is_approved=True)
+                .order_by('-helpful_votes', '-created_at')[:10]),
+            "pending reviews (admin)": lambda: list(Review.objects.filter(is_approved=False).order_by('-pk')[:100]),
+            "pending orders (admin)": lambda: (
+                Order.objects.filter(status='PENDING').count(),
+                list(Order.objects.filter(status='PENDING').order_by('-pk')[:100])),
+            "pending payments (admin)": lambda: (
+                Payment.objects.filter(status='PENDING').count(),
+                list(Payment.objects.filter(status='PENDING').order_by('-pk')[:100])),
+            "archive batch candidates": lambda: list(
+                Order.objects.filter(status__in=('COMPLETED', 'CANCELLED'), created_at__lt=before)
+                .order_by(*archive_ordering).values_list('pk', flat=True)[:1000]),
+        }
+
+        def measure():
+            results = {}
+            for name, query in queries.items():
+                query()
+                best = float("inf")
+                for _ in range(args.repeat):
+                    began = time.perf_counter()
+                    query()
+                    best = min(best, time.perf_counter() - began)
+                results[name] = best * 1000
+            return results
+
+        swap(new_indexes, old_indexes)
+        without = measure()
+        swap(old_indexes, new_indexes)
+        archive_ordering[:] = ['status', 'pk']
+        with_indexes = measure()
+
+    print(f"{args.scale} products, {2 * args.scale} reviews, {args.scale} orders seeded in {seed_seconds:.0f}s")
+    print_table(
+        [{"query": name, "without_ms": round(without[name], 2), "with_ms": round(with_indexes[name], 2)}
+         for name in queries],
+        ["query", "without_ms", "with_ms"],
+    )
+
+
+if __name__ == "__main__":
+    main()
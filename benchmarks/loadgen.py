@@ -0,0 +1,143 @@
+"""
+Minimal asyncio HTTP/1.1 load generator and gunicorn launcher.
+
+Only the standard library is used so the benchmarks run anywhere the project
+runs. Each simulated client keeps its own connection (re-opened when the
+server closes it, as gunicorn's sync workers do) and its own cookies.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from .common import BASE_DIR, summarize
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    cookies = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        name = name.strip().lower()
+        value = value.strip()
+        if name == "set-cookie":
+            cookies.append(value.split(";", 1)[0])
+        headers[name] = value
+
+    if "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            body += chunk[:-2]
+    else:
+        body = await reader.read()
+
+    keep_alive = headers.get("connection", "").lower() != "close"
+    return status, keep_alive, cookies, body
+
+
+async def _client(host, port, host_header, paths, offset, deadline, timeout, results, headers):
+    reader = writer = None
+    cookies = {}
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+            cookie_header = "; ".join(f"{k}={v}" for k, v in cookies.items())
+            request = f"GET {path} HTTP/1.1\r\nHost: {host_header}\r\nAccept: application/json\r\n"
+            request += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            if cookie_header:
+                request += f"Cookie: {cookie_header}\r\n"
+            writer.write((request + "\r\n").encode("latin-1"))
+            status, keep_alive, set_cookies, body = await asyncio.wait_for(_read_response(reader), timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            results["errors"] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+
+        results["latencies"].append(time.perf_counter() - start)
+        results["bytes"] += len(body)
+        if status >= 400:
+            results["errors"] += 1
+        for cookie in set_cookies:
+            name, _, value = cookie.partition("=")
+            cookies[name] = value
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+async def _run(host, port, host_header, paths, connections, duration, timeout, headers):
+    results = {"latencies": [], "errors": 0, "bytes": 0}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, host_header, paths, n, deadline, timeout, results, headers)
+        for n in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+    summary = summarize(results["latencies"], elapsed, results["errors"])
+    summary["bytes"] = results["bytes"]
+    return summary
+
+
+def run_load(host, port, paths, connections=500, duration=30.0, timeout=30.0, host_header=None, headers=None):
+    """Drive ``paths`` round-robin from ``connections`` concurrent clients, sending ``headers`` with each request."""
+    return asyncio.run(_run(host, port, host_header or host, paths, connections, duration, timeout, headers or {}))
+
+
+def wait_for_port(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex((host, port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Server on {host}:{port} did not start within {timeout}s")
+
+
+@contextmanager
+def gunicorn_server(mode, port, workers=4, env=None):
+    """Run ``gunicorn.conf.py`` in ``mode`` ('wsgi' or 'asgi') on 127.0.0.1:port."""
+    server_env = {
+        **os.environ,
+        "SERVER_MODE": mode,
+        "DJANGO_DEBUG": "False",
+        "DJANGO_ALLOWED_HOSTS": "127.0.0.1",
+        "GUNICORN_ACCESS_LOG": "",
+        **(env or {}),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{port}", "--workers", str(workers)],
+        cwd=BASE_DIR, env=server_env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port("127.0.0.1", port)
+        yield proc
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
@@ -0,0 +1,175 @@
+"""
+Replay the endpoint suite (``benchmarks.endpoints``) and the background
+jobs and admin pages that filter on status columns, record every query,
+``EXPLAIN`` it (see ``benchmarks.explain``) and report full scans and sorts
+on tables of at least ``--min-rows`` rows, grouped by table and query.
+
+    manage.py advise_indexes --scale 100000
+    manage.py advise_indexes --only products orders --sql
+    manage.py advise_indexes --fail-on-findings          # in CI, after seed_data
+
+Writes are rolled back, so a run leaves the database untouched. Plans
+depend on the data: run it on a realistically sized database (``--scale``
+seeds a throw-away one).
+"""
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from benchmarks.common import print_table, test_database
+from benchmarks.endpoints import ENDPOINTS, load_fixtures
+from benchmarks.explain import explain, explainable, normalize
+
+# admin change lists with the filters and searches staff use every day
+ADMIN_PAGES = {
+    'admin-orders-pending': '/admin/orders/order/?status__exact=PENDING',
+    'admin-payments-pending': '/admin/payments/payment/?status__exact=PENDING',
+    'admin-reviews-pending': '/admin/reviews/review/?is_approved__exact=0',
+    'admin-products-search': '/admin/products/product/?q=Smart',
+    'admin-orders-search': '/admin/orders/order/?q=bench-user-00001',
+    'admin-reviews-search': '/admin/reviews/review/?q=Smart',
+    'admin-cart-search': '/admin/cart/cartitem/?q=bench-user-00001',
+}
+
+
+def archive_orders():
+    from orders.archive import archive_batch
+
+    archive_batch(timezone.now() - timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS), batch_size=100)
+
+
+def refresh_reports():
+    from reporting.rollups import refresh
+
+    refresh()
+
+
+JOBS = {
+    'job-archive-orders': archive_orders,
+    'job-refresh-reports': refresh_reports,
+}
+
+
+def bounded(sql):
+    """A plain ``SELECT ... LIMIT n`` reads n rows, whatever the plan calls it."""
+    return ' WHERE ' not in sql and ' ORDER BY ' not in sql and ' LIMIT ' in sql
+
+
+class Recorder:
+    def __init__(self):
+        self.source = None
+        self.queries = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.source and not many and explainable(sql):
+            key = normalize(sql)
+            if key not in self.queries:
+                self.queries[key] = (sql, params, set())
+            self.queries[key][2].add(self.source)
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Replay the endpoint suite, EXPLAIN every query and report full scans and unindexed sorts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='*', default=[], help="Endpoint/job name substrings to run.")
+        parser.add_argument('--scale', type=int, help="Seed a throw-away test database with this many products.")
+        parser.add_argument('--min-rows', type=int, default=1000,
+                            help="Ignore tables with fewer rows (default: %(default)s).")
+        parser.add_argument('--sql', action='store_true', help="Print the offending queries.")
+        parser.add_argument('--fail-on-findings', action='store_true')
+
+    def handle(self, *args, **options):
+        database = test_database() if options['scale'] else nullcontext()
+        with database, override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver']):
+            if options['scale']:
+                call_command('seed_data', scale=options['scale'], stdout=self.stdout)
+            try:
+                fixtures = load_fixtures()
+            except LookupError as exc:
+                raise CommandError(str(exc))
+            recorder = self.replay(fixtures, options['only'])
+            rows = self.findings(recorder, options['min_rows'])
+
+        self.stdout.write(f"{len(recorder.queries)} distinct queries explained, {len(rows)} finding(s):")
+        print_table(rows, ['issue', 'table', 'rows', 'detail', 'sources'])
+        if options['sql']:
+            for number, row in enumerate(rows, 1):
+                self.stdout.write(f"\n[{number}] {row['issue']} on {row['table']}:\n{row['sql']}")
+        if rows and options['fail_on_findings']:
+            raise CommandError(f"{len(rows)} query plan(s) scan or sort a large table.")
+
+    def replay(self, fixtures, only):
+        def wanted(name):
+            return not only or any(part in name for part in only)
+
+        recorder = Recorder()
+        with transaction.atomic(), connection.execute_wrapper(recorder):
+            client = Client(raise_request_exception=False)
+            for endpoint in ENDPOINTS:
+                if not wanted(endpoint.name):
+                    continue
+                recorder.source = endpoint.name
+                kwargs = {}
+                if endpoint.auth:
+                    kwargs['headers'] = {'Authorization': f"Token {fixtures['token']}"}
+                payload = endpoint.payload(fixtures, 0)
+                if endpoint.method != 'get' and payload is not None:
+                    kwargs.update(data=payload, content_type='application/json')
+                getattr(client, endpoint.method)(endpoint.url(fixtures), **kwargs)
+
+            recorder.source = None
+            admin = get_user_model().objects.create_superuser('index-advisor', 'index-advisor@example.com', None)
+            client.force_login(admin)
+            for name, path in ADMIN_PAGES.items():
+                if wanted(name):
+                    recorder.source = name
+                    client.get(path)
+            for name, job in JOBS.items():
+                if wanted(name):
+                    recorder.source = name
+                    job()
+            transaction.set_rollback(True)
+        return recorder
+
+    def findings(self, recorder, min_rows):
+        counts = {}
+
+        def row_count(table):
+            if table not in counts:
+                if table not in connection.introspection.table_names():
+                    counts[table] = None
+                else:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                        counts[table] = cursor.fetchone()[0]
+            return counts[table]
+
+        grouped = {}
+        for key, (sql, params, sources) in recorder.queries.items():
+            for finding in explain(connection, sql, params):
+                rows = row_count(finding.table)
+                # a sort whose table the plan does not name is still worth a look, a scan of a subquery is not
+                if rows is None and finding.issue == 'full scan' or rows is not None and rows < min_rows:
+                    continue
+                if finding.issue == 'full scan' and bounded(sql):
+                    continue
+                entry = grouped.setdefault((finding.table, key), {
+                    'table': finding.table, 'rows': rows, 'issues': [], 'details': [], 'sources': sources, 'sql': sql,
+                })
+                entry['issues'].append(finding.issue)
+                entry['details'].append(finding.detail)
+        rows = sorted(grouped.values(), key=lambda entry: (-(entry['rows'] or 0), entry['table'], entry['issues']))
+        for entry in rows:
+            entry['issue'] = ' + '.join(entry.pop('issues'))
+            entry['detail'] = '; '.join(entry.pop('details'))
+            entry['sources'] = ', '.join(sorted(entry['sources']))
+        return rows
@@ -0,0 +1,56 @@
+"""
+Where the startup time of a worker goes: boots a fresh interpreter with
+``python -X importtime``, imports ``ecommerce.wsgi`` (or ``asgi``, or just
+``django.setup()``), serves one request and reports the import time per
+top-level package and the slowest modules.
+
+    manage.py profile_startup
+    manage.py profile_startup --profile lean --target asgi --top 30
+    manage.py profile_startup --path ''          # imports only, no request
+
+The request goes to the configured database; point ``DATABASE_URL`` at a
+migrated one for a realistic first response.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.common import print_table
+from benchmarks.startup import TARGETS, boot, by_package, parse_importtime
+
+
+class Command(BaseCommand):
+    help = "Report import time per package/module from process start to the first response."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=TARGETS, default='wsgi')
+        parser.add_argument('--profile', choices=['full', 'lean'],
+                            help="DJANGO_PROFILE of the profiled process (default: inherited).")
+        parser.add_argument('--path', default='/api/products/', help="First request ('' for none).")
+        parser.add_argument('--top', type=int, default=20)
+
+    def handle(self, *args, **options):
+        path = options['path'] if options['target'] != 'settings' else ''
+        try:
+            timings, lines = boot(options['target'], path, options['profile'], importtime=True)
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        modules = parse_importtime(lines)
+        top = options['top']
+
+        self.stdout.write(
+            f"{options['target']} ({options['profile'] or 'inherited'} profile): "
+            f"{len(modules)} modules, imports {timings['import_ms']:.0f} ms, "
+            f"first response {timings['first_response_ms']:.0f} ms (status {timings['status']}), "
+            f"process start to first response {timings['process_ms']:.0f} ms\n"
+        )
+        print_table(
+            [{'package': package, 'self_ms': round(us / 1000, 1), 'modules': count}
+             for package, us, count in by_package(modules)[:top]],
+            ['package', 'self_ms', 'modules'],
+        )
+        self.stdout.write('')
+        slowest = sorted(modules, key=lambda module: -module[1])[:top]
+        print_table(
+            [{'module': name, 'self_ms': round(self_us / 1000, 1), 'cumulative_ms': round(cumulative_us / 1000, 1)}
+             for name, self_us, cumulative_us, _ in slowest],
+            ['module', 'self_ms', 'cumulative_ms'],
+        )
@@ -0,0 +1,222 @@
+"""
+Drive every endpoint in ``benchmarks.endpoints.ENDPOINTS`` in-process through
+Django's full request handler (middleware included) and record throughput,
+p50/p95/p99 latency, queries per request and peak memory per request.
+
+    manage.py run_benchmarks --scale 10000 --output before.json
+    manage.py run_benchmarks --scale 10000 --output after.json --compare before.json
+
+``--scale`` seeds a throw-away test database first; without it the configured
+database is used as-is and must have been filled with ``seed_data``.
+"""
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+import django
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import AsyncClient, Client, override_settings
+from django.utils import timezone
+
+from benchmarks.common import BASE_DIR, print_table, summarize, test_database
+from benchmarks.endpoints import ENDPOINTS, load_fixtures
+
+HANDLERS = ('wsgi', 'asgi')
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Benchmark every /api/ endpoint in-process and write the results to a JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests per endpoint.")
+        parser.add_argument('--memory-samples', type=int, default=5,
+                            help="Requests replayed under tracemalloc for the peak memory figure.")
+        parser.add_argument('--handler', choices=HANDLERS + ('both',), default='both')
+        parser.add_argument('--only', nargs='*', default=[], help="Endpoint name substrings to run.")
+        parser.add_argument('--scale', type=int, help="Seed a throw-away test database with this many products.")
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument('--compare', help="Previous results file to diff against.")
+        parser.add_argument('--threshold', type=float, default=0.10,
+                            help="Relative change reported as a regression (default: 0.10).")
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not options['only'] or any(part in endpoint.name for part in options['only'])
+        ]
+        if not endpoints:
+            raise CommandError("No endpoint matches --only.")
+        handlers = HANDLERS if options['handler'] == 'both' else (options['handler'],)
+
+        database = test_database() if options['scale'] else nullcontext()
+        with database, override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver']):
+            if options['scale']:
+                call_command('seed_data', scale=options['scale'], stdout=self.stdout)
+            try:
+                fixtures = load_fixtures()
+            except LookupError as exc:
+                raise CommandError(str(exc))
+            report = {'meta': self.metadata(options), 'results': {}}
+            for handler in handlers:
+                for endpoint in endpoints:
+                    result = self.run_endpoint(handler, endpoint, fixtures, options)
+                    report['results'][f"{handler}:{endpoint.name}"] = result
+                    self.stdout.write(
+                        f"{handler}:{endpoint.name}: {result['p50_ms']} ms p50, "
+                        f"{result['queries_per_request']} queries, {result['peak_kib']} KiB"
+                    )
+
+        with open(options['output'], 'w') as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+
+        if options['compare']:
+            self.compare(options['compare'], report, options)
+
+    def metadata(self, options):
+        from django.apps import apps
+
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True,
+            ).stdout.strip() or None
+        except OSError:
+            commit = None
+        models = ['products.Product', 'categories.Category', 'orders.Order', 'reviews.Review', 'cart.CartItem']
+        return {
+            'commit': commit,
+            'timestamp': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'rows': {label: apps.get_model(label).objects.count() for label in models},
+        }
+
+    def run_endpoint(self, handler, endpoint, fixtures, options):
+        # writes are rolled back so every run starts from the same data
+        atomic = transaction.atomic() if endpoint.write else nullcontext()
+        with atomic:
+            if handler == 'wsgi':
+                run = self.run_wsgi
+            else:
+                run = async_to_sync(self.run_asgi)
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                run(endpoint, fixtures, range(options['warmup']))
+                counter.count = 0
+                start = time.perf_counter()
+                latencies, errors = run(endpoint, fixtures, range(options['requests']))
+                elapsed = time.perf_counter() - start
+                queries = counter.count
+
+            peak = 0
+            tracemalloc.start()
+            try:
+                for iteration in range(options['memory_samples']):
+                    tracemalloc.reset_peak()
+                    baseline = tracemalloc.get_traced_memory()[0]
+                    run(endpoint, fixtures, [options['requests'] + iteration])
+                    peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+            finally:
+                tracemalloc.stop()
+            if endpoint.write:
+                transaction.set_rollback(True)
+
+        result = summarize(latencies, elapsed, errors)
+        result['queries_per_request'] = round(queries / max(1, len(latencies)), 2)
+        result['peak_kib'] = round(peak / 1024, 1)
+        return result
+
+    def request_kwargs(self, endpoint, fixtures, iteration):
+        kwargs = {}
+        if endpoint.auth:
+            kwargs['headers'] = {'Authorization': f"Token {fixtures['token']}"}
+        payload = endpoint.payload(fixtures, iteration)
+        if endpoint.method != 'get' and payload is not None:
+            kwargs['data'] = payload
+            kwargs['content_type'] = 'application/json'
+        return kwargs
+
+    def run_wsgi(self, endpoint, fixtures, iterations):
+        client = Client(raise_request_exception=False)
+        send = getattr(client, endpoint.method)
+        url = endpoint.url(fixtures)
+        latencies, errors = [], 0
+        for iteration in iterations:
+            kwargs = self.request_kwargs(endpoint, fixtures, iteration)
+            start = time.perf_counter()
+            response = send(url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+        return latencies, errors
+
+    async def run_asgi(self, endpoint, fixtures, iterations):
+        client = AsyncClient(raise_request_exception=False)
+        send = getattr(client, endpoint.method)
+        url = endpoint.url(fixtures)
+        latencies, errors = [], 0
+        for iteration in iterations:
+            kwargs = self.request_kwargs(endpoint, fixtures, iteration)
+            start = time.perf_counter()
+            response = await send(url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+        return latencies, errors
+
+    def compare(self, path, report, options):
+        with open(path) as fp:
+            baseline = json.load(fp)
+        threshold = options['threshold']
+        rows, regressions = [], 0
+        for key, current in report['results'].items():
+            previous = baseline['results'].get(key)
+            if previous is None:
+                continue
+            p95 = relative(previous['p95_ms'], current['p95_ms'])
+            rps = relative(previous['throughput_rps'], current['throughput_rps'])
+            memory = relative(previous['peak_kib'], current['peak_kib'])
+            queries = current['queries_per_request'] - previous['queries_per_request']
+            flags = [
+                name for name, regressed in (
+                    ('p95', p95 > threshold), ('rps', rps < -threshold),
+                    ('queries', queries > 0), ('memory', memory > threshold),
+                ) if regressed
+            ]
+            regressions += bool(flags)
+            rows.append({
+                'endpoint': key,
+                'p95_ms': f"{previous['p95_ms']} -> {current['p95_ms']} ({p95:+.0%})",
+                'rps': f"{previous['throughput_rps']} -> {current['throughput_rps']} ({rps:+.0%})",
+                'queries': f"{previous['queries_per_request']} -> {current['queries_per_request']}",
+                'peak_kib': f"{previous['peak_kib']} -> {current['peak_kib']} ({memory:+.0%})",
+                'regression': ','.join(flags),
+            })
+
+        self.stdout.write(f"\nCompared with {path} (commit {baseline['meta'].get('commit')}):")
+        print_table(rows, ['endpoint', 'p95_ms', 'rps', 'queries', 'peak_kib', 'regression'])
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f"{regressions} endpoint(s) regressed by more than {threshold:.0%}.")
+
+
+def relative(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before
@@ -0,0 +1,309 @@
+"""
+Bulk-generate a deterministic data set for benchmarks.
+
+``--scale`` is the number of products; every other table is sized from it
+(see ``ROWS``), so ``--scale 1000`` gives roughly 7k rows and ``--scale
+1000000`` roughly 7M. The same ``--seed`` always produces the same rows.
+Meant for a scratch database (``DATABASE_URL=... manage.py seed_data``).
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from cart.models import CartItem
+from categories.models import Category, path_segment
+from categories.tree import bump_tree_version
+from orders.models import Order, OrderItem
+from payments.models import Payment
+from products.models import Product
+from reviews.models import Review
+from wishlist.models import Wishlist
+
+USERNAME_PREFIX = 'bench-user-'
+PASSWORD = 'bench-password-1'
+
+# rows per product for every seeded table
+ROWS = {
+    'users': 0.1,
+    'categories': 0.01,
+    'orders': 1,
+    'reviews': 2,
+    'cart_items': 0.3,
+    'wishlist_items': 0.2,
+}
+
+ADJECTIVES = ['Classic', 'Compact', 'Deluxe', 'Eco', 'Ergonomic', 'Portable', 'Premium', 'Smart', 'Ultra', 'Vintage']
+MATERIALS = ['Bamboo', 'Carbon', 'Ceramic', 'Cotton', 'Glass', 'Leather', 'Linen', 'Steel', 'Walnut', 'Wool']
+NOUNS = ['Backpack', 'Blender', 'Chair', 'Headphones', 'Jacket', 'Kettle', 'Lamp', 'Monitor', 'Sneakers', 'Watch']
+DEPARTMENTS = ['Electronics', 'Home', 'Fashion', 'Sports', 'Garden', 'Toys', 'Books', 'Beauty', 'Kitchen', 'Office']
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt '
+         'ut labore et dolore magna aliqua').split()
+
+
+def scaled(scale, name, minimum=1):
+    return max(minimum, int(scale * ROWS[name]))
+
+
+def skewed(rng, values):
+    """Pick from ``values`` with a long-tail bias towards the first entries."""
+    return values[int(len(values) * rng.random() ** 3)]
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the ``auto_now``/``auto_now_add`` values we set."""
+    fields = [field for model in models for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate a deterministic catalog with users, carts, orders and reviews for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1000, help="Number of products (default: 1000).")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed (default: 1).")
+        parser.add_argument('--categories', type=int, help="Number of categories (default: scale / 100).")
+        parser.add_argument('--max-depth', type=int, default=8, help="Levels of the category tree (default: 8).")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--flush', action='store_true', help="Delete previously seeded data first.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now().replace(microsecond=0)
+        scale = options['scale']
+        User = get_user_model()
+
+        if options['flush']:
+            self.flush()
+        elif User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError("Benchmark data already exists, use --flush to replace it.")
+
+        start = time.perf_counter()
+        with explicit_timestamps(Category, Product, CartItem, Order, Payment, Review, Wishlist):
+            self.seed_users(scaled(scale, 'users', minimum=10))
+            self.seed_categories(
+                options['categories'] or scaled(scale, 'categories', minimum=len(DEPARTMENTS)),
+                options['max_depth'],
+            )
+            self.seed_products(scale)
+            self.seed_orders(scaled(scale, 'orders'))
+            self.seed_reviews(scaled(scale, 'reviews'))
+            self.seed_cart_items(scaled(scale, 'cart_items'))
+            self.seed_wishlist_items(scaled(scale, 'wishlist_items'))
+        bump_tree_version()
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {time.perf_counter() - start:.1f}s."))
+
+    def flush(self):
+        with transaction.atomic():
+            for model in (Wishlist, CartItem, Review, Payment, OrderItem, Order, Product, Category):
+                model.objects.all().delete()
+            get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def insert(self, model, objects):
+        total = 0
+        objects = iter(objects)
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(batch)
+        self.stdout.write(f"{model._meta.label}: {total} rows")
+
+    def timestamp(self, days=365):
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def ids(self, model, **filters):
+        return list(model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True))
+
+    def seed_users(self, count):
+        User = get_user_model()
+        password = make_password(PASSWORD)
+        self.insert(User, (
+            User(username=f"{USERNAME_PREFIX}{i:07d}", email=f"{USERNAME_PREFIX}{i:07d}@example.com",
+                 first_name=self.rng.choice(ADJECTIVES), last_name=self.rng.choice(NOUNS),
+                 password=password, date_joined=self.timestamp(730))
+            for i in range(count)
+        ))
+        self.user_ids = self.ids(User, username__startswith=USERNAME_PREFIX)
+
+    def seed_categories(self, count, max_depth):
+        """A random tree: the departments are the roots, every other category
+        hangs under a random earlier one that is less than ``max_depth`` deep."""
+        rng = self.rng
+        parents, depths, eligible = [], [], []
+        for i in range(count):
+            parent = None if i < len(DEPARTMENTS) else rng.choice(eligible)
+            depth = 0 if parent is None else depths[parent] + 1
+            parents.append(parent)
+            depths.append(depth)
+            if depth < max_depth - 1:
+                eligible.append(i)
+
+        # insert level by level so parents have ids (and paths) before their children
+        ids, paths = [None] * count, [''] * count
+        for level in range(max_depth):
+            members = [i for i in range(count) if depths[i] == level]
+            for start in range(0, len(members), self.batch_size):
+                batch = members[start:start + self.batch_size]
+                categories = [
+                    Category(
+                        name=DEPARTMENTS[i] if parents[i] is None else f"{rng.choice(DEPARTMENTS)} {i:06d}",
+                        description=sentence(rng, 8),
+                        parent_id=None if parents[i] is None else ids[parents[i]],
+                        depth=level,
+                        created_at=self.timestamp(730),
+                    )
+                    for i in batch
+                ]
+                with transaction.atomic():
+                    Category.objects.bulk_create(categories)
+                    for i, category in zip(batch, categories):
+                        parent_path = '' if parents[i] is None else paths[parents[i]]
+                        ids[i] = category.pk
+                        paths[i] = category.path = parent_path + path_segment(category.pk)
+                    Category.objects.bulk_update(categories, ['path'])
+        self.stdout.write(f"categories.Category: {count} rows, {max(depths) + 1} levels")
+        self.category_ids = ids
+
+    def seed_products(self, count):
+        rng = self.rng
+
+        def products():
+            for i in range(count):
+                created_at = self.timestamp()
+                yield Product(
+                    name=f"{rng.choice(ADJECTIVES)} {rng.choice(MATERIALS)} {rng.choice(NOUNS)} {i:07d}",
+                    description=sentence(rng, 30),
+                    price=Decimal(rng.randrange(99, 99999)) / 100,
+                    stock=rng.choice((0, rng.randrange(1, 500))),
+                    image=f"products/{i:07d}.jpg" if rng.random() < 0.7 else None,
+                    category_id=rng.choice(self.category_ids),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        self.insert(Product, products())
+        self.product_ids = self.ids(Product)
+
+    def seed_orders(self, count):
+        rng = self.rng
+        statuses = ['PENDING', 'PROCESSING', 'COMPLETED', 'COMPLETED', 'COMPLETED', 'CANCELLED']
+
+        def orders():
+            for _ in range(count):
+                created_at = self.timestamp()
+                yield Order(
+                    user_id=skewed(rng, self.user_ids) if rng.random() < 0.9 else None,
+                    status=rng.choice(statuses),
+                    total_amount=Decimal(rng.randrange(500, 500000)) / 100,
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(hours=rng.randrange(72)),
+                )
+
+        self.insert(Order, orders())
+        self.seed_order_items()
+        rows = Order.objects.exclude(status='PENDING').order_by('pk').values_list('pk', 'status', 'total_amount', 'created_at')
+        methods = [choice for choice, _ in Payment.PAYMENT_METHOD_CHOICES]
+        self.insert(Payment, (
+            Payment(order_id=pk, payment_method=rng.choice(methods), transaction_id=f"bench-{pk}",
+                    amount=amount, status='FAILED' if status == 'CANCELLED' else 'COMPLETED',
+                    created_at=created_at, updated_at=created_at)
+            for pk, status, amount, created_at in rows.iterator(chunk_size=self.batch_size)
+        ))
+
+    def seed_order_items(self):
+        """1-5 lines per order, mostly products listed right after the first one (bundles)."""
+        rng = self.rng
+        product_ids = self.product_ids
+        count = len(product_ids)
+
+        def order_items():
+            for order_id in self.ids(Order):
+                first = int(count * rng.random() ** 3)
+                chosen = {product_ids[first]}
+                for _ in range(min(int(rng.expovariate(0.8)), 4)):
+                    if rng.random() < 0.7:
+                        chosen.add(product_ids[(first + rng.randint(1, 5)) % count])
+                    else:
+                        chosen.add(skewed(rng, product_ids))
+                for product_id in chosen:
+                    yield OrderItem(order_id=order_id, product_id=product_id, quantity=rng.randint(1, 3),
+                                    unit_price=Decimal(rng.randrange(99, 99999)) / 100)
+
+        self.insert(OrderItem, order_items())
+
+    def seed_reviews(self, count):
+        rng = self.rng
+
+        def reviews():
+            for _ in range(count):
+                created_at = self.timestamp()
+                yield Review(
+                    product_id=skewed(rng, self.product_ids),
+                    user_id=rng.choice(self.user_ids),
+                    rating=rng.choice((1, 2, 3, 4, 4, 5, 5, 5)),
+                    comment=sentence(rng, 15),
+                    helpful_votes=int(rng.expovariate(0.3)),
+                    is_approved=rng.random() < 0.8,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        self.insert(Review, reviews())
+
+    def seed_cart_items(self, count):
+        rng = self.rng
+
+        def cart_items():
+            seen = set()
+            for _ in range(count):
+                created_at = self.timestamp(30)
+                product_id = skewed(rng, self.product_ids)
+                if rng.random() < 0.6:
+                    owner = {'user_id': rng.choice(self.user_ids)}
+                else:
+                    owner = {'session_key': f"{rng.getrandbits(128):032x}"}
+                # one row per (owner, product)
+                key = (*owner.values(), product_id)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield CartItem(product_id=product_id, quantity=rng.randint(1, 4),
+                               created_at=created_at, updated_at=created_at, **owner)
+
+        self.insert(CartItem, cart_items())
+
+    def seed_wishlist_items(self, count):
+        rng = self.rng
+        per_user = max(1, count // len(self.user_ids))
+
+        def wishlist_items():
+            for user_id in self.user_ids:
+                for product_id in rng.sample(self.product_ids, min(per_user, len(self.product_ids))):
+                    yield Wishlist(user_id=user_id, product_id=product_id, added_at=self.timestamp(90))
+
+        self.insert(Wishlist, wishlist_items())
@@ -0,0 +1,110 @@
+"""
+File serving under gunicorn (sync workers over WSGI, uvicorn workers over
+ASGI): product images and a stylesheet served by ``ecommerce.files.serve``
+under their hashed names, against Django's ``static.serve`` on the same files
+under their old names, the only way to serve them from the app before. Also
+times ``hash_product_images`` on the seeded images and ``collectstatic``.
+
+    python -m benchmarks.media --images 200 --connections 50 --duration 10
+
+Throughput is requests and megabytes per second; ``bytes`` is the body size
+of one response. With ``immutable`` a reloading browser sends no request at
+all for the hashed files, where before every file cost a conditional request.
+"""
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+
+from .common import print_table, setup_django
+from .loadgen import gunicorn_server, run_load
+
+STYLESHEET = "admin/css/base.css"
+
+
+def seed_images(count, size):
+    from PIL import Image
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import FileSystemStorage
+    from django.conf import settings
+    from products.models import Product
+
+    # written under plain names, as uploads were before HashedMediaStorage
+    plain = FileSystemStorage(location=settings.MEDIA_ROOT)
+    rng = random.Random(48)
+    products = []
+    for i in range(count):
+        image = Image.frombytes("RGB", (size, size), rng.randbytes(size * size * 3))
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85)
+        name = plain.save(f"products/image-{i}.jpg", ContentFile(buffer.getvalue()))
+        products.append(Product(name=f"Product {i}", description="", price="9.99", stock=1, image=name))
+    Product.objects.bulk_create(products)
+    return [product.image.name for product in products]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--size", type=int, default=300, help="Image width and height in pixels.")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    env = {
+        "DATABASE_URL": f"sqlite:///{root}/bench.sqlite3",
+        "MEDIA_ROOT": f"{root}/media",
+        "STATIC_ROOT": f"{root}/static",
+        "DJANGO_SETTINGS_MODULE": "benchmarks.media_settings",
+    }
+    os.environ.update(env)
+    setup_django()
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.core.management import call_command
+    from products.models import Product
+
+    call_command("migrate", verbosity=0)
+    old_names = seed_images(args.images, args.size)
+    started = time.perf_counter()
+    call_command("hash_product_images", keep_old=True, stdout=io.StringIO())
+    backfill_seconds = time.perf_counter() - started
+    new_names = list(Product.objects.order_by("pk").values_list("image", flat=True))
+    started = time.perf_counter()
+    call_command("collectstatic", interactive=False, verbosity=0)
+    collect_seconds = time.perf_counter() - started
+    stylesheet = staticfiles_storage.stored_name(STYLESHEET)
+
+    scenarios = [
+        ("images, static.serve (before)", [f"/plain-media/{name}" for name in old_names], {}),
+        ("images, hashed", [f"/media/{name}" for name in new_names], {}),
+        ("images, hashed, 16 KiB ranges", [f"/media/{name}" for name in new_names], {"Range": "bytes=0-16383"}),
+        ("stylesheet, static.serve (before)", [f"/plain-static/{STYLESHEET}"], {"Accept-Encoding": "br, gzip"}),
+        ("stylesheet, hashed", [f"/static/{stylesheet}"], {"Accept-Encoding": "br, gzip"}),
+    ]
+    rows = []
+    for mode in ("wsgi", "asgi"):
+        with gunicorn_server(mode, args.port, args.workers, env=env):
+            for name, paths, headers in scenarios:
+                result = run_load("127.0.0.1", args.port, paths, connections=args.connections,
+                                  duration=args.duration, headers=headers)
+                rows.append({
+                    "files": name, "server": mode, "requests": result["requests"], "errors": result["errors"],
+                    "throughput_rps": result["throughput_rps"],
+                    "mb_per_s": round(result["bytes"] / args.duration / 1e6, 1),
+                    "bytes": result["bytes"] // max(result["requests"], 1),
+                    "p50_ms": result["p50_ms"], "p99_ms": result["p99_ms"],
+                })
+
+    print(f"{args.images} images renamed by hash_product_images in {backfill_seconds:.2f}s, "
+          f"collectstatic (with .br/.gz variants) in {collect_seconds:.2f}s")
+    print_table(rows, ["files", "server", "requests", "errors", "throughput_rps", "mb_per_s", "bytes",
+                       "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Settings of the servers started by ``benchmarks.media``: the project's, with ``media_urls``."""
+from ecommerce.settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = "benchmarks.media_urls"
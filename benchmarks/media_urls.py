@@ -0,0 +1,10 @@
+"""The project's URLs plus Django's ``static.serve`` on the same files, as the baseline of ``benchmarks.media``."""
+from django.conf import settings
+from django.urls import include, re_path
+from django.views.static import serve
+
+urlpatterns = [
+    re_path(r"^plain-media/(?P<path>.+)$", serve, {"document_root": settings.MEDIA_ROOT}),
+    re_path(r"^plain-static/(?P<path>.+)$", serve, {"document_root": settings.STATIC_ROOT}),
+    re_path(r"", include("ecommerce.urls")),
+]
@@ -0,0 +1,204 @@
+"""
+Back-in-stock fan-out for a product with a very large wishlist, with a
+concurrent writer, and the email throughput of the notification sender.
+
+    python -m benchmarks.notifications --wishlisters 500000 --emails 20000
+
+One product at stock 0 is wishlisted by ``--wishlisters`` users, then
+restocked through ``Product.save()`` (the latency of that write includes
+recording the stock event). The event is fanned out twice while a writer
+thread keeps changing stock and wishlists and records its latencies:
+
+* ``naive``: every notification in one transaction;
+* ``chunked``: ``notifications.fanout.fan_out``, one transaction per chunk
+  of each of ``--chunk-sizes``.
+
+``--emails`` pending notifications are then mailed to a local SMTP sink
+(``benchmarks/smtp_sink.py``) with ``send_pending`` (batched, one
+connection) and with one ``send_mail`` per message. Runs on a throw-away
+SQLite file so that the writer thread has its own connection.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from functools import partial
+
+from .common import print_table, setup_django, summarize
+from .smtp_sink import smtp_sink
+
+
+def seed(wishlisters):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from products.models import Product
+    from wishlist.models import Wishlist
+
+    call_command("migrate", verbosity=0)
+    User = get_user_model()
+    product = Product.objects.create(name="Restocked product", description="", price="10.00", stock=0)
+    others = Product.objects.bulk_create(
+        Product(name=f"Product {i}", description="", price="5.00", stock=100) for i in range(100)
+    )
+    User.objects.bulk_create(
+        (User(username=f"fan{i}", email=f"fan{i}@example.com", password="!") for i in range(wishlisters)),
+        batch_size=10_000,
+    )
+    user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+    Wishlist.objects.bulk_create(
+        (Wishlist(user_id=user_id, product=product) for user_id in user_ids), batch_size=10_000,
+    )
+    return product, others, user_ids
+
+
+class Writer(threading.Thread):
+    """Stock and wishlist writes, one short transaction each, timed until stopped."""
+
+    def __init__(self, products, user_ids):
+        super().__init__(daemon=True)
+        self.products, self.user_ids = products, user_ids
+        self.latencies, self.errors = [], 0
+        self.stop = threading.Event()
+
+    def run(self):
+        from django.db import OperationalError, connection, transaction
+        from products.models import Product
+        from wishlist.models import Wishlist
+
+        i = 0
+        while not self.stop.is_set():
+            product = self.products[i % len(self.products)]
+            start = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    Product.objects.filter(pk=product.pk).update(stock=50 + i % 50)
+                    Wishlist.objects.get_or_create(user_id=self.user_ids[i % len(self.user_ids)], product=product)
+                self.latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                # database is locked: waited out the whole busy timeout
+                self.errors += 1
+            i += 1
+            time.sleep(0.002)
+        connection.close()
+
+
+def fan_out_naive(event):
+    from django.db import transaction
+    from notifications.fanout import recipients
+    from notifications.models import Notification
+
+    rows = list(recipients(event))
+    with transaction.atomic():
+        Notification.objects.bulk_create(
+            (Notification(user_id=user_id, product_id=event.product_id, kind=event.kind) for _, user_id in rows),
+            batch_size=5000,
+        )
+    return len(rows)
+
+
+def run_fan_out(name, fan_out, event, others, user_ids):
+    from notifications.models import Notification, StockEvent
+
+    Notification.objects.all().delete()
+    StockEvent.objects.filter(pk=event.pk).update(cursor=0, notified=0, processed_at=None)
+    event.refresh_from_db()
+    writer = Writer(others, user_ids)
+    writer.start()
+    time.sleep(0.2)
+    start = time.perf_counter()
+    created = fan_out(event)
+    elapsed = time.perf_counter() - start
+    time.sleep(0.2)
+    writer.stop.set()
+    writer.join()
+    writes = summarize(writer.latencies, 1)
+    return {
+        "fan_out": name,
+        "notifications": created,
+        "seconds": round(elapsed, 2),
+        "rows_per_s": round(created / elapsed),
+        "writes": len(writer.latencies),
+        "write_errors": writer.errors,
+        "write_p50_ms": writes["p50_ms"],
+        "write_p99_ms": writes["p99_ms"],
+        "write_max_ms": round(max(writer.latencies, default=0) * 1000, 1),
+    }
+
+
+def run_emails(emails, naive_emails):
+    from django.conf import settings
+    from django.core.mail import get_connection, send_mail
+    from django.utils import timezone
+    from notifications.fanout import send_pending
+    from notifications.models import Notification
+
+    rows = []
+    with smtp_sink() as sink:
+        def connection():
+            return get_connection("django.core.mail.backends.smtp.EmailBackend",
+                                  host=sink.host, port=sink.port, use_tls=False, username="", password="")
+
+        start = time.perf_counter()
+        sent = send_pending(limit=emails, connection=connection())
+        elapsed = time.perf_counter() - start
+        rows.append({"sender": "send_pending", "messages": sent, "smtp_connections": sink.connections,
+                     "seconds": round(elapsed, 2), "msgs_per_s": round(sent / elapsed)})
+
+        before = sink.connections
+        pending = list(
+            Notification.objects.filter(sent_at__isnull=True).order_by("pk")
+            .values_list("pk", "user__email", "user__username", "product__name")[:naive_emails]
+        )
+        start = time.perf_counter()
+        for pk, email, username, product in pending:
+            send_mail(f"{product} is back in stock", f"Hi {username},\n\n{product} is back in stock.\n",
+                      settings.DEFAULT_FROM_EMAIL, [email], connection=connection())
+            Notification.objects.filter(pk=pk).update(sent_at=timezone.now())
+        elapsed = time.perf_counter() - start
+        rows.append({"sender": "send_mail per message", "messages": len(pending),
+                     "smtp_connections": sink.connections - before,
+                     "seconds": round(elapsed, 2), "msgs_per_s": round(len(pending) / elapsed)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wishlisters", type=int, default=500_000)
+    parser.add_argument("--chunk-sizes", default="5000,1000")
+    parser.add_argument("--emails", type=int, default=20_000, help="messages sent by send_pending")
+    parser.add_argument("--naive-emails", type=int, default=2_000, help="messages sent one send_mail at a time")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.sqlite3"
+    setup_django()
+    from notifications.fanout import fan_out
+    from notifications.models import StockEvent
+    from products.models import Product
+
+    start = time.perf_counter()
+    product, others, user_ids = seed(args.wishlisters)
+    print(f"seeded {len(user_ids)} wishlisters in {time.perf_counter() - start:.1f}s")
+
+    product = Product.objects.get(pk=product.pk)
+    product.stock = 25
+    start = time.perf_counter()
+    product.save()
+    print(f"restock (Product.save with the stock event): {(time.perf_counter() - start) * 1000:.2f} ms")
+    event = StockEvent.objects.get(product=product)
+
+    print_table(
+        [run_fan_out(name, func, event, others, user_ids)
+         for name, func in [("naive", fan_out_naive)] + [
+             (f"chunked {size}", partial(fan_out, chunk_size=int(size))) for size in args.chunk_sizes.split(",")
+         ]],
+        ["fan_out", "notifications", "seconds", "rows_per_s", "writes", "write_errors",
+         "write_p50_ms", "write_p99_ms", "write_max_ms"],
+    )
+    print()
+    print_table(run_emails(args.emails, args.naive_emails),
+                ["sender", "messages", "smtp_connections", "seconds", "msgs_per_s"])
+
+
+if __name__ == "__main__":
+    main()
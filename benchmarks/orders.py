@@ -0,0 +1,58 @@
+"""
+Bulk order transitions: moving ``--orders`` pending orders to PROCESSING
+with per-row ``save()`` vs one ``orders.transitions`` conditional UPDATE.
+
+    python -m benchmarks.orders --products 20000 --orders 5000
+"""
+import argparse
+import io
+
+from .common import print_table, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.db import connection, transaction
+    from orders.models import Order
+    from orders.transitions import TRANSITIONS
+
+    rows = []
+    with test_database():
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        Order.objects.filter(pk__in=Order.objects.values("pk")[:args.orders]).update(status="PENDING")
+        pending = list(Order.objects.filter(status="PENDING").values_list("pk", flat=True)[:args.orders])
+
+        def measure(name, func, repeat):
+            queries = []
+            with connection.execute_wrapper(lambda execute, *params: queries.append(1) or execute(*params)):
+                func()
+            rows.append({"case": name, "ms": round(timed(func, repeat) * 1000, 1), "queries": len(queries)})
+
+        def per_row():
+            with transaction.atomic():
+                for order in Order.objects.filter(pk__in=pending):
+                    order.status = "PROCESSING"
+                    order.save()
+                transaction.set_rollback(True)
+
+        def bulk():
+            with transaction.atomic():
+                moved, rejected = TRANSITIONS["process"].apply(pending)
+                assert len(moved) == len(pending) and not rejected
+                transaction.set_rollback(True)
+
+        measure(f"process {len(pending)}, per-row save", per_row, 1)
+        measure(f"process {len(pending)}, transition", bulk, args.repeat)
+
+    print_table(rows, ["case", "ms", "queries"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Password-reset requests and transactional email throughput, against a
+local SMTP sink (``benchmarks/smtp_sink.py``).
+
+    python -m benchmarks.outbox --users 2000 --messages 20000
+
+* request latency of ``POST /api/auth/reset-password/``, queuing in the
+  outbox, vs sending with ``send_mail`` in the request as it used to;
+* repeated requests: rows queued for ``--users`` users asking 5 times each;
+* sender throughput: ``mailer.outbox.send_pending`` (one connection for
+  the run, ``--batch-size`` rows per query) vs one ``send_mail`` connection
+  per message.
+
+The sink answers on localhost without TLS or authentication: against a real
+relay every connection the per-message path opens costs a TLS handshake and
+a login on top.
+"""
+import argparse
+import time
+
+from .common import print_table, setup_django, summarize, test_database
+from .smtp_sink import smtp_sink
+
+
+def seed(users):
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+
+    User = get_user_model()
+    User.objects.bulk_create(User(username=f"user{i}", email=f"user{i}@example.com", password="!")
+                             for i in range(users))
+    users = list(User.objects.order_by("pk"))
+    Token.objects.bulk_create(Token(user=user, key=Token.generate_key()) for user in users)
+    return [(user.email, user.auth_token.key) for user in users]
+
+
+def send_mail_in_request(request):
+    """The reset view before the outbox: one SMTP connection per request."""
+    from django.contrib.auth.tokens import default_token_generator
+    from django.core.mail import send_mail
+    from rest_framework.response import Response
+
+    from authentication.models import CustomUser
+
+    user = CustomUser.objects.get(email=request.data["email"])
+    token = default_token_generator.make_token(user)
+    reset_link = f"http://yourdomain.com/reset-password/{user.pk}/{token}/"
+    send_mail(subject="Password Reset", message=f"Reset your password using the following link: {reset_link}",
+              from_email="noreply@yourdomain.com", recipient_list=[user.email])
+    return Response({"message": "Password reset link sent"})
+
+
+def requests(accounts, path="/api/auth/reset-password/"):
+    from rest_framework.test import APIClient
+
+    client, latencies = APIClient(), []
+    start = time.perf_counter()
+    for email, key in accounts:
+        client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        began = time.perf_counter()
+        response = client.post(path, {"email": email}, format="json")
+        latencies.append(time.perf_counter() - began)
+        assert response.status_code == 200, response.status_code
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20000, help="messages sent by send_pending")
+    parser.add_argument("--naive-messages", type=int, default=2000, help="messages sent one send_mail at a time")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from unittest import mock
+
+    from django.core.mail import send_mail
+    from django.test.utils import override_settings
+
+    from authentication.views import ResetPasswordView
+    from mailer import outbox
+    from mailer.models import Message
+
+    # over the locmem backend test_database() installs
+    with test_database(), smtp_sink() as sink, override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend", EMAIL_HOST=sink.host, EMAIL_PORT=sink.port,
+        EMAIL_USE_TLS=False, EMAIL_HOST_USER="", EMAIL_HOST_PASSWORD="",
+    ):
+        accounts = seed(args.users)
+
+        rows = []
+        with mock.patch.object(ResetPasswordView, "post", lambda self, request: send_mail_in_request(request)):
+            rows.append({"reset_request": "send_mail in the request", **requests(accounts)})
+        rows.append({"reset_request": "outbox", **requests(accounts)})
+        print_table(rows, ["reset_request", "requests", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+
+        Message.objects.all().delete()
+        requests(accounts * 5)
+        print(f"\n{len(accounts) * 5} reset requests from {len(accounts)} users: "
+              f"{Message.objects.count()} message(s) queued")
+
+        Message.objects.all().delete()
+        for i in range(max(args.messages, args.naive_messages)):
+            outbox.enqueue("password_reset", f"user{i}@example.com", {"reset_link": f"http://yourdomain.com/{i}/"})
+
+        rows = []
+        connections = sink.connections
+        start = time.perf_counter()
+        sent = outbox.send_pending(batch_size=args.batch_size, limit=args.messages)
+        elapsed = time.perf_counter() - start
+        rows.append({"sender": "send_pending", "messages": sent,
+                     "smtp_connections": sink.connections - connections,
+                     "seconds": round(elapsed, 2), "msgs_per_s": round(sent / elapsed)})
+
+        connections = sink.connections
+        start = time.perf_counter()
+        for i in range(args.naive_messages):
+            subject, body = outbox.render("password_reset", {"reset_link": f"http://yourdomain.com/{i}/"})
+            send_mail(subject, body, "noreply@yourdomain.com", [f"user{i}@example.com"])
+        elapsed = time.perf_counter() - start
+        rows.append({"sender": "send_mail per message", "messages": args.naive_messages,
+                     "smtp_connections": sink.connections - connections,
+                     "seconds": round(elapsed, 2), "msgs_per_s": round(args.naive_messages / elapsed)})
+        print()
+        print_table(rows, ["sender", "messages", "smtp_connections", "seconds", "msgs_per_s"])
+
+
+if __name__ == "__main__":
+    main()
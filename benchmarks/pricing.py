@@ -0,0 +1,148 @@
+"""
+Pricing 10k carts against 5k active promotions (product, category subtree,
+catalog-wide and cart-threshold rules, plus some not yet started or
+already ended) with the compiled ``pricing.rules.RuleSet``, against a
+naive evaluator that checks every promotion for every line. The naive
+totals of the first ``--naive`` carts are compared with the compiled ones.
+
+    python -m benchmarks.pricing --carts 10000 --rules 5000
+"""
+import argparse
+import io
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from .common import print_table, setup_django, test_database
+
+
+def naive_quote(promotions, paths, lines, now):
+    from pricing.models import Promotion
+    from pricing.rules import Rule, ZERO
+
+    def best(price, candidates):
+        discount, promotion_id = ZERO, None
+        for promotion in candidates:
+            amount = Rule(promotion.pk, promotion.kind, promotion.value).discount(price)
+            if amount > discount or amount == discount and amount and promotion.pk < promotion_id:
+                discount, promotion_id = amount, promotion.pk
+        return discount
+
+    def current(promotion):
+        return ((promotion.starts_at is None or promotion.starts_at <= now)
+                and (promotion.ends_at is None or promotion.ends_at > now))
+
+    subtotal = ZERO
+    for product_id, category_id, price, quantity in lines:
+        path = paths.get(category_id, '')
+        candidates = [
+            promotion for promotion in promotions
+            if promotion.scope == Promotion.LINE and current(promotion) and (
+                promotion.product_id == product_id
+                or promotion.category_id is not None and path.startswith(paths[promotion.category_id])
+                or promotion.product_id is None and promotion.category_id is None)
+        ]
+        subtotal += (price - best(price, candidates)) * quantity
+    reached = [promotion for promotion in promotions
+               if promotion.scope == Promotion.ORDER and current(promotion) and promotion.min_subtotal <= subtotal]
+    return subtotal - best(subtotal, reached)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--carts", type=int, default=10000)
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--naive", type=int, default=200, help="Carts priced by the naive evaluator.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.utils import timezone
+    from categories.models import Category
+    from ecommerce.cache import bump_version
+    from pricing.mixins import add_effective_prices
+    from pricing.models import Promotion
+    from pricing.rules import PRICING_NAMESPACE, compile_rules, pricer
+    from products.models import Product
+
+    rng = random.Random(46)
+    with test_database():
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        products = list(Product.objects.values_list("pk", "category_id", "price"))
+        categories = list(Category.objects.values_list("pk", flat=True))
+        now = timezone.now()
+
+        def promotion(i):
+            kind = rng.choice([Promotion.PERCENT, Promotion.FIXED])
+            if kind == Promotion.PERCENT:
+                value = Decimal(rng.randrange(5, 50))
+            else:
+                value = Decimal(rng.randrange(100, 2000)) / 100
+            fields = {"name": f"bench-{i}", "kind": kind, "value": value}
+            target = rng.random()
+            if target < 0.5:
+                fields["product_id"] = rng.choice(products)[0]
+            elif target < 0.8:
+                fields["category_id"] = rng.choice(categories)
+            elif target < 0.81:
+                pass
+            else:
+                fields.update(scope=Promotion.ORDER, min_subtotal=Decimal(rng.randrange(0, 2000)))
+            # a tenth outside their time window, the rest ending within a month
+            window = rng.random()
+            if window < 0.05:
+                fields["starts_at"] = now + timedelta(days=rng.randrange(1, 30))
+            elif window < 0.1:
+                fields["ends_at"] = now - timedelta(days=rng.randrange(1, 30))
+            else:
+                fields["ends_at"] = now + timedelta(days=rng.randrange(1, 30))
+            return Promotion(**fields)
+
+        Promotion.objects.bulk_create([promotion(i) for i in range(args.rules)], batch_size=1000)
+        bump_version(PRICING_NAMESPACE)
+        carts = [
+            [(pk, category_id, price, rng.randint(1, 3))
+             for pk, category_id, price in rng.sample(products, rng.randint(1, 8))]
+            for _ in range(args.carts)
+        ]
+
+        began = time.perf_counter()
+        compile_rules()
+        compile_seconds = time.perf_counter() - began
+        ruleset = pricer.rules()
+
+        began = time.perf_counter()
+        totals = [ruleset.quote(cart).total for cart in carts]
+        compiled_seconds = time.perf_counter() - began
+
+        promotions = list(Promotion.objects.all())
+        paths = dict(Category.objects.values_list("pk", "path"))
+        sample = carts[:args.naive]
+        began = time.perf_counter()
+        naive_totals = [naive_quote(promotions, paths, cart, timezone.now()) for cart in sample]
+        naive_seconds = time.perf_counter() - began
+        mismatches = sum(1 for naive, compiled in zip(naive_totals, totals) if naive != compiled)
+
+        page = {"results": [{"id": pk, "category": category_id, "price": price}
+                            for pk, category_id, price in products[:100]]}
+        began = time.perf_counter()
+        for _ in range(100):
+            add_effective_prices(page)
+        page_seconds = (time.perf_counter() - began) / 100
+
+    lines = sum(len(cart) for cart in carts)
+    print(f"{args.rules} promotions, {args.carts} carts, {lines} lines; compiled in {compile_seconds * 1000:.0f} ms")
+    print_table([
+        {"evaluator": "compiled", "carts": args.carts, "total_s": round(compiled_seconds, 3),
+         "us_per_cart": round(compiled_seconds / args.carts * 1e6, 1)},
+        {"evaluator": "naive (every rule per line)", "carts": len(sample), "total_s": round(naive_seconds, 3),
+         "us_per_cart": round(naive_seconds / len(sample) * 1e6, 1)},
+    ], ["evaluator", "carts", "total_s", "us_per_cart"])
+    print(f"naive vs compiled totals: {mismatches} mismatch(es) in {len(sample)} carts")
+    print(f"effective prices for a 100-product list page: {page_seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Overhead of the profiling middleware: the same requests with profiling off
+(middleware removed), with only the slow-request capture armed (every
+request stack-sampled and its SQL recorded, nothing slow enough to store),
+and with every request sampled under cProfile.
+
+    python -m benchmarks.profiling --products 20000 --requests 500
+"""
+import argparse
+import io
+import time
+
+from .common import print_table, setup_django, summarize, test_database
+
+PATHS = ["/api/products/", "/api/products/?page=5", "/api/orders/", "/api/categories/tree/"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+    from profiling import store
+
+    cases = [
+        ("off", {"PROFILING_SLOW_MS": 0, "PROFILING_SAMPLE_RATE": 0}),
+        ("slow capture armed", {"PROFILING_SLOW_MS": 10_000, "PROFILING_SAMPLE_RATE": 0}),
+        ("every request sampled", {"PROFILING_SLOW_MS": 0, "PROFILING_SAMPLE_RATE": 1.0}),
+    ]
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        results = {}
+        # interleaved rounds, so drift on the machine hits every case alike
+        for _ in range(5):
+            for case, overrides in cases:
+                with override_settings(**overrides):
+                    client = Client()
+                    for path in PATHS:
+                        assert client.get(path).status_code == 200, path
+                        for _ in range(args.requests // 5):
+                            began = time.perf_counter()
+                            client.get(path)
+                            results.setdefault((path, case), []).append(time.perf_counter() - began)
+                store.clear()
+        for (path, case), latencies in results.items():
+            summary = summarize(latencies, sum(latencies))
+            rows.append({"path": path, "case": case, "p50_ms": summary["p50_ms"], "p99_ms": summary["p99_ms"]})
+
+    rows.sort(key=lambda row: PATHS.index(row["path"]))
+    print_table(rows, ["path", "case", "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
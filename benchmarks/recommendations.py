@@ -0,0 +1,54 @@
+"""
+Runtime and peak memory of the "frequently bought together" job
+(``products.recommendations``) against data size and shard count.
+
+    python -m benchmarks.recommendations --scales 10000 50000 200000 --shards 1 4
+"""
+import argparse
+import io
+import time
+import tracemalloc
+
+from .common import print_table, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10000, 50000, 200000],
+                        help="Products seeded per run (orders = products).")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from orders.models import OrderItem
+    from products import recommendations
+    from products.models import ProductRecommendation
+
+    kind = ProductRecommendation.BOUGHT_TOGETHER
+    rows = []
+    with test_database():
+        for scale in args.scales:
+            call_command("seed_data", scale=scale, flush=True, stdout=io.StringIO())
+            items = OrderItem.objects.count()
+            for shards in args.shards:
+                start = time.perf_counter()
+                pairs, written = recommendations.build(kind, shards=shards)
+                elapsed = time.perf_counter() - start
+
+                tracemalloc.start()
+                recommendations.build(kind, shards=shards)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                rows.append({
+                    "products": scale, "order_items": items, "shards": shards, "pairs": pairs,
+                    "rows": written, "seconds": round(elapsed, 2),
+                    "items_per_s": round(items / elapsed), "peak_mb": round(peak / 2 ** 20, 1),
+                })
+
+    print_table(rows, ["products", "order_items", "shards", "pairs", "rows", "seconds", "items_per_s", "peak_mb"])
+
+
+if __name__ == "__main__":
+    main()
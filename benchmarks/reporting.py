@@ -0,0 +1,84 @@
+"""
+Dashboard queries straight on orders/payments vs the rollups of
+``reporting.rollups``, plus the cost of a full backfill and of an
+incremental refresh after a handful of order updates.
+
+    python -m benchmarks.reporting --products 100000
+"""
+import argparse
+import io
+import time
+from datetime import timedelta
+
+from .common import print_table, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100000, help="Seed scale (orders = products).")
+    parser.add_argument("--updates", type=int, default=100, help="Orders changed before the incremental refresh.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.db.models import Count, Q, Sum
+    from django.db.models.functions import TruncDay
+    from django.utils import timezone
+    from orders.models import Order, OrderItem
+    from payments.models import Payment
+    from reporting import rollups
+    from reporting.models import PaymentRollup, ProductSalesRollup, SalesRollup
+
+    since = timezone.now() - timedelta(days=30)
+
+    def direct():
+        sales = list(Order.objects.filter(created_at__gte=since).annotate(day=TruncDay("created_at"))
+                     .order_by().values("day", "status").annotate(orders=Count("pk"), revenue=Sum("total_amount")))
+        payments = list(Payment.objects.filter(created_at__gte=since).annotate(day=TruncDay("created_at"))
+                        .order_by().values("day", "payment_method")
+                        .annotate(payments=Count("pk"), completed=Count("pk", filter=Q(status="COMPLETED"))))
+        products = list(OrderItem.objects.filter(order__created_at__gte=since).exclude(order__status="CANCELLED")
+                        .order_by().values("product").annotate(units=Sum("quantity"))
+                        .order_by("-units")[:20])
+        return sales, payments, products
+
+    def rolled_up():
+        sales = list(SalesRollup.objects.filter(period="day", start__gte=since).values())
+        payments = list(PaymentRollup.objects.filter(period="day", start__gte=since).values())
+        products = list(ProductSalesRollup.objects.filter(day__gte=since.date()).values("product")
+                        .annotate(units=Sum("units")).order_by("-units")[:20])
+        return sales, payments, products
+
+    with test_database():
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        orders = Order.objects.count()
+
+        start = time.perf_counter()
+        call_command("backfill_reports", stdout=io.StringIO())
+        backfill_seconds = time.perf_counter() - start
+
+        # totals must match the source tables
+        assert SalesRollup.objects.filter(period="day").aggregate(n=Sum("orders"))["n"] == orders
+        assert SalesRollup.objects.filter(period="hour").aggregate(n=Sum("orders"))["n"] == orders
+
+        pks = list(Order.objects.filter(status="PENDING").values_list("pk", flat=True)[:args.updates])
+        later = timezone.now() + timedelta(minutes=5)
+        Order.objects.filter(pk__in=pks).update(status="COMPLETED", updated_at=later)
+        start = time.perf_counter()
+        days = rollups.refresh(now=later + rollups.LAG)
+        refresh_seconds = time.perf_counter() - start
+        completed = Order.objects.filter(status="COMPLETED").count()
+        assert SalesRollup.objects.filter(period="day", status="COMPLETED").aggregate(n=Sum("orders"))["n"] == completed
+
+        rows = [
+            {"query": "30-day dashboard, direct", "ms": round(timed(direct, args.repeat) * 1000, 1)},
+            {"query": "30-day dashboard, rollups", "ms": round(timed(rolled_up, args.repeat) * 1000, 1)},
+            {"query": f"backfill ({orders} orders)", "ms": round(backfill_seconds * 1000)},
+            {"query": f"refresh after {len(pks)} updates ({len(days)} days)", "ms": round(refresh_seconds * 1000)},
+        ]
+    print_table(rows, ["query", "ms"])
+
+
+if __name__ == "__main__":
+    main()
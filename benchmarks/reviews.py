@@ -0,0 +1,70 @@
+"""
+Review read path and moderation: the first page of a popular product's
+reviews from the database vs the per-product page cache, and approving
+``--pending`` reviews with per-row saves vs ``ReviewQuerySet.moderate``.
+
+    python -m benchmarks.reviews --products 20000 --pending 5000
+"""
+import argparse
+import io
+
+from .common import print_table, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--pending", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection, transaction
+    from django.test import Client, override_settings
+    from reviews.models import Review
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        client = Client()
+        # seed_data skews reviews towards the first products
+        url = "/api/reviews/product/1/?ordering=-helpful_votes"
+
+        def measure(name, func, repeat=args.repeat):
+            queries = []
+            # (CaptureQueriesContext loses queries run inside a request: request_started resets the log)
+            with connection.execute_wrapper(lambda execute, *params: queries.append(1) or execute(*params)):
+                func()
+            rows.append({"case": name, "ms": round(timed(func, repeat) * 1000, 2), "queries": len(queries)})
+
+        def uncached():
+            cache.clear()
+            assert client.get(url).status_code == 200
+
+        measure("first page, database", uncached)
+        measure("first page, cached", lambda: client.get(url))
+
+        pending = list(Review.objects.filter(is_approved=False).values_list("pk", flat=True)[:args.pending])
+
+        def per_row():
+            with transaction.atomic():
+                for review in Review.objects.filter(pk__in=pending):
+                    review.is_approved = True
+                    review.save()
+                transaction.set_rollback(True)
+
+        def bulk():
+            with transaction.atomic():
+                Review.objects.filter(pk__in=pending).moderate(approve=True)
+                transaction.set_rollback(True)
+
+        measure(f"approve {len(pending)}, per-row save", per_row, 1)
+        measure(f"approve {len(pending)}, moderate()", bulk, 3)
+
+    print_table(rows, ["case", "ms", "queries"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+OpenAPI schema: live drf-spectacular generation vs the precomputed artifact.
+
+Reports the one-off cost paid per process (artifact load vs first live
+generation), per-request latency for identity/gzip/br and 304 revalidation,
+the bytes on the wire, and whether the artifact matches the live schema.
+
+    python -m benchmarks.schema --repeat 20
+"""
+import argparse
+import gzip
+import tempfile
+import time
+
+from .common import print_table, setup_django, timed
+
+HOST = "testserver"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    import logging
+    from django.test import RequestFactory, override_settings
+    from drf_spectacular.views import SpectacularAPIView
+    from apidocs import artifact
+    from apidocs.views import SchemaView
+
+    logging.disable(logging.WARNING)
+    factory = RequestFactory()
+    live_view = SpectacularAPIView.as_view()
+    precomputed_view = SchemaView.as_view()
+
+    def request(view, fmt="yaml", encoding="", etag=None):
+        headers = {"HTTP_HOST": HOST, "HTTP_ACCEPT_ENCODING": encoding}
+        if etag:
+            headers["HTTP_IF_NONE_MATCH"] = etag
+        response = view(factory.get(f"/api/schema/?format={fmt}", **headers))
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory, override_settings(
+            DEBUG=False, ALLOWED_HOSTS=[HOST], OPENAPI_SCHEMA_DIR=directory):
+        start = time.perf_counter()
+        live_first = request(live_view)
+        rows.append({"case": "live: first request", "ms": round((time.perf_counter() - start) * 1000, 2),
+                     "bytes": len(live_first.content)})
+
+        start = time.perf_counter()
+        artifact.build(directory)
+        rows.append({"case": "build_schema (build time)", "ms": round((time.perf_counter() - start) * 1000, 2)})
+
+        artifact.get_artifact.cache_clear()
+        start = time.perf_counter()
+        artifact.get_artifact()
+        rows.append({"case": "artifact: load at startup", "ms": round((time.perf_counter() - start) * 1000, 2)})
+
+        for fmt in ("yaml", "json"):
+            live = request(live_view, fmt)
+            rows.append({"case": f"live {fmt}", "ms": round(timed(lambda: request(live_view, fmt), args.repeat) * 1000, 2),
+                         "bytes": len(live.content)})
+            for encoding in ("", "gzip", "br"):
+                response = request(precomputed_view, fmt, encoding)
+                body = response.content
+                if encoding == "gzip":
+                    identical = gzip.decompress(body) == live.content
+                elif encoding == "br" and artifact.brotli is not None:
+                    identical = artifact.brotli.decompress(body) == live.content
+                else:
+                    identical = body == live.content
+                rows.append({
+                    "case": f"precomputed {fmt} {encoding or 'identity'}",
+                    "ms": round(timed(lambda: request(precomputed_view, fmt, encoding), args.repeat) * 1000, 3),
+                    "bytes": len(body),
+                    "identical": identical,
+                })
+            etag = request(precomputed_view, fmt, "br")["ETag"]
+            not_modified = request(precomputed_view, fmt, "br", etag)
+            rows.append({
+                "case": f"precomputed {fmt} 304",
+                "ms": round(timed(lambda: request(precomputed_view, fmt, "br", etag), args.repeat) * 1000, 3),
+                "bytes": len(not_modified.content),
+                "identical": not_modified.status_code == 304,
+            })
+
+    print_table(rows, ["case", "ms", "bytes", "identical"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Serialization microbenchmark: ModelSerializer + JSONRenderer vs
+ValuesSerializer + ORJSONRenderer for every list endpoint, in objects/second
+(fetch + serialize + render of one page), and a check that both produce the
+same bytes.
+
+    python -m benchmarks.serialization --objects 100
+"""
+import argparse
+import random
+from decimal import Decimal
+
+from .common import print_table, setup_django, test_database, timed
+
+
+def seed(count):
+    from django.contrib.auth import get_user_model
+    from categories.models import Category
+    from orders.models import Order
+    from payments.models import Payment
+    from products.models import Product
+    from reviews.models import Review
+
+    rng = random.Random(1)
+    user = get_user_model().objects.create(username="bench", email="bench@example.com")
+    Category.objects.bulk_create(
+        Category(name=f"Category {i}", description="Everything for the home ünïcode") for i in range(count)
+    )
+    products = Product.objects.bulk_create(
+        Product(name=f"Product {i}", description="Lorem ipsum dolor sit amet " * 10,
+                price=Decimal(f"{rng.uniform(1, 900):.2f}"), stock=rng.randint(0, 50),
+                image=f"products/{i}.jpg" if i % 2 else None)
+        for i in range(count)
+    )
+    orders = Order.objects.bulk_create(
+        Order(user=user, status=rng.choice(["PENDING", "COMPLETED"]),
+              total_amount=Decimal(f"{rng.uniform(5, 900):.2f}"))
+        for _ in range(count)
+    )
+    Payment.objects.bulk_create(
+        Payment(order=order, payment_method="PAYPAL", transaction_id=f"tx-{order.pk}", amount=order.total_amount)
+        for order in orders
+    )
+    Review.objects.bulk_create(
+        Review(product=products[0], user=user, rating=rng.randint(1, 5), comment="Solid   product")
+        for _ in range(count)
+    )
+
+
+def endpoints():
+    from categories.models import Category
+    from categories.serializers import CategorySerializer, CategoryValuesSerializer
+    from orders.models import Order
+    from orders.serializers import OrderSerializer, OrderValuesSerializer
+    from payments.models import Payment
+    from payments.serializers import PaymentSerializer, PaymentValuesSerializer
+    from products.models import Product
+    from products.serializers import ProductSerializer, ProductValuesSerializer
+    from reviews.models import Review
+    from reviews.serializers import ReviewSerializer, ReviewValuesSerializer
+
+    return [
+        ("products", Product.objects.order_by("price"), ProductSerializer, ProductValuesSerializer),
+        ("categories", Category.objects.order_by("-created_at"), CategorySerializer, CategoryValuesSerializer),
+        ("orders", Order.objects.order_by("pk"), OrderSerializer, OrderValuesSerializer),
+        ("payments", Payment.objects.order_by("pk"), PaymentSerializer, PaymentValuesSerializer),
+        ("reviews", Review.objects.order_by("pk"), ReviewSerializer, ReviewValuesSerializer),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=100, help="objects per page")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import RequestFactory
+    from rest_framework.renderers import JSONRenderer
+    from ecommerce.renderers import ORJSONRenderer
+
+    request = RequestFactory().get("/", HTTP_HOST="testserver")
+    context = {"request": request}
+    rows = []
+    with test_database():
+        seed(args.objects)
+        for name, queryset, model_serializer, values_serializer in endpoints():
+            def stock():
+                data = model_serializer(list(queryset.all()), many=True, context=context).data
+                return JSONRenderer().render(data)
+
+            def fast():
+                data = values_serializer(list(values_serializer.values(queryset.all())), context=context).data
+                return ORJSONRenderer().render(data)
+
+            stock_time = timed(stock, args.repeat)
+            fast_time = timed(fast, args.repeat)
+            rows.append({
+                "endpoint": name,
+                "objects": args.objects,
+                "stock_obj_per_s": int(args.objects / stock_time),
+                "fast_obj_per_s": int(args.objects / fast_time),
+                "speedup": f"{stock_time / fast_time:.1f}x",
+                "identical_bytes": stock() == fast(),
+            })
+
+    print_table(rows, ["endpoint", "objects", "stock_obj_per_s", "fast_obj_per_s", "speedup", "identical_bytes"])
+
+
+if __name__ == "__main__":
+    main()
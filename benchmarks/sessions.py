@@ -0,0 +1,92 @@
+"""
+Database writes caused by anonymous browsing: 1k GET requests over the
+catalogue endpoints and the anonymous cart, by clients that drop the session
+cookie (crawlers, API consumers), by clients that keep it, by one that also
+adds to its cart every 100 requests, then a token login and a few
+token-authenticated requests. Counts every INSERT,
+UPDATE and DELETE per table, for each ``SESSION_BACKEND``.
+
+    python -m benchmarks.sessions --requests 1000
+"""
+import argparse
+import io
+import re
+from collections import Counter
+
+from .common import print_table, setup_django, test_database
+
+ENGINES = ["db", "cached_db", "signed_cookies"]
+WRITE_RE = re.compile(r'^\s*(INSERT INTO|UPDATE|DELETE FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client, override_settings
+    from products.models import Product
+
+    writes = Counter()
+
+    def record(execute, sql, params, many, context):
+        match = WRITE_RE.match(sql)
+        if match:
+            writes[match.group(2)] += 1
+        return execute(sql, params, many, context)
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        product = Product.objects.order_by("pk").first()
+        paths = [
+            "/api/products/", "/api/products/?page=2", f"/api/products/{product.pk}/",
+            "/api/categories/tree/", f"/api/reviews/?product={product.pk}",
+            "/api/cart/my_cart/", "/api/cart/async/my_cart/",
+        ]
+        get_user_model().objects.create_user("session-bench", "session-bench@example.com", "bench-pass-123")
+
+        def browse(client, add_every=0):
+            for i in range(args.requests):
+                client.get(paths[i % len(paths)])
+                if add_every and i % add_every == add_every - 1:
+                    response = client.post("/api/cart/", {"product": product.pk}, content_type="application/json")
+                    assert response.status_code == 201, response.content
+
+        def token_requests(client):
+            token = client.post("/api/auth/login/", {"username": "session-bench", "password": "bench-pass-123"},
+                                content_type="application/json").json()["token"]
+            for i in range(10):
+                client.get(paths[i % len(paths)], headers={"Authorization": f"Token {token}"})
+
+        for engine in ENGINES:
+            with override_settings(SESSION_ENGINE=f"django.contrib.sessions.backends.{engine}"):
+                cases = {
+                    "browse, no cookie": lambda: [
+                        Client().get(paths[i % len(paths)]) for i in range(args.requests)],
+                    "browse, keeps cookie": lambda: browse(Client()),
+                    "browse, keeps cookie, adds to cart": lambda: browse(Client(), add_every=100),
+                    "token login + 10 requests": lambda: token_requests(Client()),
+                }
+                for case, run in cases.items():
+                    cache.clear()
+                    writes.clear()
+                    with connection.execute_wrapper(record):
+                        run()
+                    rows.append({
+                        "engine": engine, "case": case, "writes": sum(writes.values()),
+                        "tables": ", ".join(f"{table}={count}" for table, count in sorted(writes.items())),
+                    })
+
+    print(f"{args.requests} requests per browse case")
+    print_table(rows, ["engine", "case", "writes", "tables"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+A local SMTP server that accepts and counts messages, standing in for the
+mail relay in the email benchmarks.
+
+    with smtp_sink() as sink:
+        connection = get_connection("django.core.mail.backends.smtp.EmailBackend",
+                                    host=sink.host, port=sink.port, use_tls=False)
+        ...
+        sink.messages, sink.connections
+
+It speaks just enough SMTP for ``smtplib`` (EHLO/HELO, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT) and answers every connection in its own thread.
+Recipients containing one of ``refuse`` are rejected with a 550.
+"""
+import socketserver
+import threading
+from contextlib import contextmanager
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        sink = self.server
+        with sink.lock:
+            sink.connections += 1
+        self.reply("220 localhost sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif command == b"DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                for data in iter(self.rfile.readline, b""):
+                    if data == b".\r\n":
+                        break
+                with sink.lock:
+                    sink.messages += 1
+                self.reply("250 queued")
+            elif command == b"RCPT" and any(address.encode() in line for address in sink.refuse):
+                self.reply("550 no such user")
+            elif command == b"QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                self.reply("250 ok")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=("127.0.0.1", 0), refuse=()):
+        super().__init__(address, SMTPHandler)
+        self.refuse = refuse
+        self.lock = threading.Lock()
+        self.messages = self.connections = 0
+
+    @property
+    def host(self):
+        return self.server_address[0]
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+@contextmanager
+def smtp_sink(refuse=()):
+    server = SMTPSink(refuse=refuse)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
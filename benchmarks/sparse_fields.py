@@ -0,0 +1,60 @@
+"""
+Payload size and latency of /api/products/ with and without ``?fields=``.
+
+    python -m benchmarks.sparse_fields --products 1000 --limit 100
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from .common import print_table, setup_django, summarize, test_database
+
+VARIANTS = [
+    ("full", ""),
+    ("name,price", "&fields=id,name,price"),
+    ("name,price,image", "&fields=id,name,price,image"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from products.models import Product
+
+    rows = []
+    with test_database():
+        rng = random.Random(3)
+        Product.objects.bulk_create(
+            Product(name=f"Product {i}", description="Lorem ipsum dolor sit amet, consectetur " * 25,
+                    price=Decimal(f"{rng.uniform(1, 900):.2f}"), stock=rng.randint(0, 50),
+                    image=f"products/{i}.jpg")
+            for i in range(args.products)
+        )
+        client = Client(HTTP_HOST="testserver")
+        for label, query in VARIANTS:
+            url = f"/api/products/?limit={args.limit}{query}"
+            size = len(client.get(url).content)
+            latencies = []
+            started = time.perf_counter()
+            for n in range(args.requests):
+                start = time.perf_counter()
+                client.get(f"{url}&page={n % (args.products // args.limit) + 1}")
+                latencies.append(time.perf_counter() - start)
+            result = summarize(latencies, time.perf_counter() - started)
+            rows.append({"variant": label, "bytes_per_page": size, **result})
+
+    full = rows[0]
+    for row in rows:
+        row["bytes_saved"] = f"{100 - 100 * row['bytes_per_page'] / full['bytes_per_page']:.0f}%"
+    print_table(rows, ["variant", "bytes_per_page", "bytes_saved", "throughput_rps", "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
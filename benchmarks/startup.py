@@ -0,0 +1,217 @@
+"""
+Process startup: time from interpreter start to the first response, for a
+fresh interpreter booting ``ecommerce.wsgi``/``ecommerce.asgi`` with the full
+and the lean (``DJANGO_PROFILE=lean``) app profile, and for a worker forked
+from a master that already imported the application (gunicorn
+``preload_app``).
+
+    python -m benchmarks.startup --runs 10 --path /api/products/
+
+``manage.py profile_startup`` uses the same child process to report where
+the import time goes.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from .common import BASE_DIR, print_table
+
+TARGETS = ('wsgi', 'asgi', 'settings')
+
+# Runs in a fresh interpreter: import the target, then serve one request
+# through the raw WSGI/ASGI callable (django.test would add its own imports).
+CHILD = r'''
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {base!r})
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ecommerce.settings")
+target, path = {target!r}, {path!r}
+status = None
+if target == "settings":
+    import django
+    django.setup()
+    imported = time.perf_counter()
+elif target == "wsgi":
+    from ecommerce.wsgi import application
+    imported = time.perf_counter()
+    if path:
+        from wsgiref.util import setup_testing_defaults
+        environ = {{"PATH_INFO": path, "HTTP_HOST": "localhost"}}
+        setup_testing_defaults(environ)
+        response = application(environ, lambda code, headers, exc_info=None: None)
+        b"".join(response)
+        response.close()
+        status = response.status_code
+else:
+    from ecommerce.asgi import application
+    imported = time.perf_counter()
+    if path:
+        import asyncio
+        messages = []
+
+        requests = [{{"type": "http.request", "body": b"", "more_body": False}}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await asyncio.Event().wait()  # the client never disconnects
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {{"type": "http", "asgi": {{"version": "3.0"}}, "http_version": "1.1", "method": "GET",
+                  "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+                  "root_path": "", "headers": [(b"host", b"localhost")], "server": ("localhost", 80),
+                  "client": ("127.0.0.1", 1234)}}
+        asyncio.run(application(scope, receive, send))
+        status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+done = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - started) * 1000, "first_response_ms": (done - imported) * 1000,
+                  "total_ms": (done - started) * 1000, "status": status}}))
+'''
+
+
+def child_env(profile=None):
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "ecommerce.settings")
+    env.setdefault("DJANGO_ALLOWED_HOSTS", "localhost")
+    env.setdefault("DJANGO_DEBUG", "False")
+    if profile is not None:
+        env["DJANGO_PROFILE"] = profile
+    return env
+
+
+def boot(target="wsgi", path="/api/products/", profile=None, importtime=False):
+    """
+    Boot a fresh interpreter; returns ``(timings, importtime lines)``. The wall
+    time includes interpreter startup (``process_ms``).
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CHILD.format(base=str(BASE_DIR), target=target, path=path)]
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env=child_env(profile), cwd=BASE_DIR)
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        raise RuntimeError(f"startup child failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = elapsed * 1000
+    lines = [line for line in result.stderr.splitlines() if line.startswith("import time:")]
+    return timings, lines
+
+
+@contextmanager
+def migrated_database():
+    """Point ``DATABASE_URL`` (inherited by the child processes) at a freshly migrated SQLite file."""
+    previous = os.environ.get("DATABASE_URL")
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{directory}/startup.sqlite3"
+        try:
+            subprocess.run([sys.executable, "manage.py", "migrate", "--noinput"], check=True, cwd=BASE_DIR,
+                           env=child_env(), stdout=subprocess.DEVNULL)
+            yield
+        finally:
+            if previous is None:
+                del os.environ["DATABASE_URL"]
+            else:
+                os.environ["DATABASE_URL"] = previous
+
+
+def parse_importtime(lines):
+    """``[(module, self_us, cumulative_us, depth)]`` from ``-X importtime`` output."""
+    modules = []
+    for line in lines:
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip())) // 2
+            modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue  # the header line
+    return modules
+
+
+def by_package(modules):
+    """Self import time (µs) and module count per top-level package."""
+    totals = defaultdict(lambda: [0, 0])
+    for name, self_us, _, _ in modules:
+        total = totals[name.partition(".")[0]]
+        total[0] += self_us
+        total[1] += 1
+    return sorted(((package, us, count) for package, (us, count) in totals.items()), key=lambda row: -row[1])
+
+
+def forked_first_response(target="wsgi", path="/api/products/", profile=None, runs=5):
+    """First-response time (ms) of workers forked from a master that imported the app."""
+    script = CHILD.format(base=str(BASE_DIR), target=target, path="")
+    script += rf'''
+from django.db import connections
+from ecommerce.preload import warm_up
+warm_up()  # gunicorn.conf.py when_ready
+from wsgiref.util import setup_testing_defaults
+results = []
+for _ in range({runs}):
+    read, write = os.pipe()
+    forked = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        connections.close_all()  # gunicorn.conf.py post_fork
+        environ = {{"PATH_INFO": {path!r}, "HTTP_HOST": "localhost"}}
+        setup_testing_defaults(environ)
+        response = application(environ, lambda code, headers, exc_info=None: None)
+        b"".join(response)
+        os.write(write, str(time.perf_counter() - forked).encode())
+        os._exit(0)
+    os.close(write)
+    results.append(float(os.read(read, 64)) * 1000)
+    os.waitpid(pid, 0)
+print(json.dumps(results))
+'''
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            env=child_env(profile), cwd=BASE_DIR)
+    if result.returncode:
+        raise RuntimeError(f"startup child failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/api/products/")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS[:2], default=["wsgi", "asgi"])
+    args = parser.parse_args()
+
+    rows = []
+    with migrated_database():
+        for target in args.targets:
+            # interleaved, so drift on the machine hits both profiles alike
+            boots = {"full": [], "lean": []}
+            for _ in range(args.runs):
+                for profile, runs in boots.items():
+                    runs.append(boot(target, args.path, profile)[0])
+            for profile, runs in boots.items():
+                assert all(run["status"] == 200 for run in runs), runs[0]
+                rows.append({
+                    "target": target, "profile": profile, "mode": "cold boot",
+                    "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+                    "first_response_ms": round(statistics.median(run["first_response_ms"] for run in runs), 1),
+                    "to_first_response_ms": round(statistics.median(run["process_ms"] for run in runs), 1),
+                })
+            if target == "wsgi":
+                for profile in ("full", "lean"):
+                    forked = forked_first_response(target, args.path, profile, args.runs)
+                    rows.append({"target": target, "profile": profile, "mode": "forked (preload_app)",
+                                 "first_response_ms": round(statistics.median(forked), 1),
+                                 "to_first_response_ms": round(statistics.median(forked), 1)})
+    print_table(rows, ["target", "profile", "mode", "import_ms", "first_response_ms", "to_first_response_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Autocomplete: the in-process prefix index of ``products.suggest`` vs an
+``icontains`` query.
+
+The first table builds a ``PrefixIndex`` over ``--entries`` synthetic
+product names (same generator as ``seed_data``) and reports build time,
+traced memory and lookup percentiles. The second seeds ``--products`` rows
+and times ``/api/products/suggest/`` against the equivalent
+``name__icontains`` lookup.
+
+    python -m benchmarks.suggest --entries 1000000 --products 50000
+"""
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+from .common import print_table, setup_django, summarize, test_database
+
+QUERIES = ["c", "cl", "class", "s", "sm", "smart wa", "walnut ch", "eco b", "deluxe glass k", "00012", "zz"]
+
+
+def synthetic_entries(count, seed=1):
+    from benchmarks.management.commands.seed_data import ADJECTIVES, MATERIALS, NOUNS
+
+    rng = random.Random(seed)
+    return [
+        (i, f"{rng.choice(ADJECTIVES)} {rng.choice(MATERIALS)} {rng.choice(NOUNS)} {i:07d}")
+        for i in range(1, count + 1)
+    ]
+
+
+def run(func, queries, rounds):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            began = time.perf_counter()
+            func(query)
+            latencies.append(time.perf_counter() - began)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000000)
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+    from products.models import Product
+    from products.suggest import PrefixIndex, suggester, tokenize
+
+    entries = synthetic_entries(args.entries)
+    tracemalloc.start()
+    began = time.perf_counter()
+    index = PrefixIndex(entries)
+    build_seconds = time.perf_counter() - began
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entries
+
+    row = run(lambda query: index.search(tokenize(query), 8), QUERIES, args.rounds)
+    row.update({
+        "entries": args.entries, "terms": len(index.terms), "heavy_prefixes": len(index.heavy),
+        "build_s": round(build_seconds, 1), "memory_mb": round(index_bytes / 2 ** 20, 1),
+    })
+    print_table([row], ["entries", "terms", "heavy_prefixes", "build_s", "memory_mb", "p50_ms", "p99_ms"])
+    print()
+    del index
+
+    rows = []
+    with test_database(), override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+        call_command("seed_data", scale=args.products, stdout=io.StringIO())
+        suggester.build()
+        client = Client()
+        rounds = max(args.rounds // 10, 1)
+
+        def endpoint(query):
+            assert client.get("/api/products/suggest/", {"q": query}).status_code == 200
+
+        def icontains(query):
+            list(Product.objects.filter(name__icontains=query).values_list("id", "name")[:8])
+
+        for name, func in (("suggest endpoint", endpoint), ("name__icontains query", icontains)):
+            row = run(func, QUERIES, rounds)
+            row["lookup"] = name
+            rows.append(row)
+
+    print_table(rows, ["lookup", "requests", "p50_ms", "p95_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 from django.contrib import admin
+
+from ecommerce.admin_tools import FastAdmin
 from .models import Product, CartItem
 @admin.register(CartItem)
-class CartItemAdmin(admin.ModelAdmin):
+class CartItemAdmin(FastAdmin):
     list_display = ('user', 'product', 'quantity', 'created_at', 'updated_at')
-    search_fields = ('user__username', 'product__name')  # Allow search by username and product name
+    list_select_related = ('user', 'product')
+    raw_id_fields = ('user', 'product')
+    # Allow search by username and product name prefix
+    indexed_search_fields = {'user__username': 'prefix', 'product__name': 'prefix'}
     list_filter = ('created_at', 'updated_at')
-    ordering = ('-created_at',)
+    ordering = ('-pk',)
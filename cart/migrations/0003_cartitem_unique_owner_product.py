@@ -0,0 +1,41 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:39
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicates(apps, schema_editor):
+    """One row per (owner, product): user rows drop their session key, duplicates are summed into the oldest row."""
+    CartItem = apps.get_model('cart', 'CartItem')
+    CartItem.objects.filter(user__isnull=False, session_key__isnull=False).update(session_key=None)
+    for owner in ('user', 'session_key'):
+        duplicates = (
+            CartItem.objects.filter(**{f'{owner}__isnull': False}).order_by()
+            .values(owner, 'product').annotate(count=Count('pk'), keep=Min('pk'), total=Sum('quantity'))
+            .filter(count__gt=1)
+        )
+        for row in duplicates.iterator():
+            CartItem.objects.filter(pk=row['keep']).update(quantity=row['total'])
+            CartItem.objects.filter(**{owner: row[owner], 'product': row['product']}).exclude(pk=row['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_cartitem_session_key_alter_cartitem_user'),
+        ('products', '0003_productrecommendation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('user', 'product'), name='unique_cart_user_product'),
+        ),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('session_key', 'product'), name='unique_cart_session_product'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_cartitem_unique_owner_product'),
+        ('products', '0004_product_price_name_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cartitem',
+            index=models.Index(condition=models.Q(('user__isnull', True)), fields=['updated_at'], name='cart_anonymous_updated_idx'),
+        ),
+    ]
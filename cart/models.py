@@ -1,7 +1,49 @@
-from django.db import models
+from django.db import NotSupportedError, connections, models
 from django.conf import settings  # Import settings for dynamic user model reference
+from django.utils import timezone
 from products.models import Product
 
+
+class CartItemQuerySet(models.QuerySet):
+
+    def add_from(self, queryset, user=None, session_key=None, quantity=1):
+        """
+        Put ``quantity`` of every ``product_id`` selected by ``queryset`` in
+        the cart of ``user`` (or of ``session_key``) with a single
+        ``INSERT ... SELECT ... ON CONFLICT`` statement, adding to the
+        quantity of products already there. Returns the affected row count.
+        """
+        connection = connections[self.db]
+        if not connection.features.supports_update_conflicts_with_target:
+            raise NotSupportedError(f"{connection.vendor} cannot merge cart items in one statement.")
+        owner_column = 'user_id' if user is not None else 'session_key'
+        now = timezone.now()
+        names = ('cart_owner', 'product_id', 'cart_quantity', 'cart_created_at', 'cart_updated_at')
+        source = queryset.order_by().annotate(
+            cart_owner=models.Value(user.pk if user is not None else session_key),
+            cart_quantity=models.Value(quantity),
+            cart_created_at=models.Value(now, output_field=models.DateTimeField()),
+            cart_updated_at=models.Value(now, output_field=models.DateTimeField()),
+        ).values(*names)
+        sql, params = source.query.sql_with_params()
+
+        qn = connection.ops.quote_name
+        table = qn(self.model._meta.db_table)
+        columns = ', '.join(qn(column) for column in (owner_column, 'product_id', 'quantity', 'created_at', 'updated_at'))
+        # select by name, the ORM decides the column order of ``sql``; ``WHERE true``
+        # keeps SQLite from parsing ON CONFLICT as part of the SELECT
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {', '.join(qn(name) for name in names)} FROM ({sql}) source WHERE true "
+                f"ON CONFLICT ({qn(owner_column)}, {qn('product_id')}) DO UPDATE SET "
+                f"{qn('quantity')} = {table}.{qn('quantity')} + EXCLUDED.{qn('quantity')}, "
+                f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')}",
+                params,
+            )
+            return cursor.rowcount
+
+
 class CartItem(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,  # Dynamically reference the custom user model
@@ -10,11 +52,26 @@ class CartItem(models.Model):
         null=True, 
         blank=True
     )
+    # cart id of an anonymous session (cart.views.session_cart), not necessarily its session key
     session_key = models.CharField(max_length=40, null=True, blank=True)
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartItemQuerySet.as_manager()
+
+    class Meta:
+        # a cart belongs to a user, or to an anonymous session (user and session_key never both set)
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product'], name='unique_cart_user_product'),
+            models.UniqueConstraint(fields=['session_key', 'product'], name='unique_cart_session_product'),
+        ]
+        # stale anonymous carts, see `manage.py purge_sessions --carts`
+        indexes = [
+            models.Index(fields=['updated_at'], condition=models.Q(user__isnull=True),
+                         name='cart_anonymous_updated_idx'),
+        ]
+
     def __str__(self):
         return f"{self.product.name} x {self.quantity}"
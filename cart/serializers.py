@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from .models import CartItem
+from ecommerce.serializers import SparseFieldsMixin
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CartItem
         fields = ['id', 'user', 'product', 'quantity', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        # the owner is the requesting user or session (CartItemViewSet.cart_owner)
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        expandable_fields = {'product': 'products.serializers.ProductSerializer'}
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CartItemViewSet
+from .views import CartItemViewSet, AsyncMyCartView
 
 router = DefaultRouter()
 router.register(r'', CartItemViewSet, basename='cart')
 
 urlpatterns = [
+    path('async/my_cart/', AsyncMyCartView.as_view(), name='cart-my-cart-async'),
     path('', include(router.urls)),
 ]
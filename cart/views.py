@@ -1,42 +1,92 @@
+import secrets
+
 from rest_framework import viewsets, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from .models import CartItem
 from .serializers import CartItemSerializer
+from ecommerce.async_views import AsyncGenericAPIView
+from ecommerce.http_cache import PRIVATE
+from ecommerce.mixins import SparseFieldsViewMixin
+
+CART_SESSION_KEY = 'cart'
+
+
+def session_cart(session, create=False):
+    """
+    Cart id of an anonymous session (stored in ``CartItem.session_key``), or
+    ``None`` before the first item is added unless ``create``. It is a random
+    token kept in the session, so browsing never creates a session and any
+    ``SESSION_BACKEND`` works (a signed cookie has no short key); sessions
+    from before keep using their session key.
+    """
+    cart_id = session.get(CART_SESSION_KEY)
+    if cart_id is None and session.session_key and len(session.session_key) <= 40:
+        cart_id = session.session_key
+    if cart_id is None and create:
+        cart_id = session[CART_SESSION_KEY] = secrets.token_hex(16)
+    return cart_id
+
 
-class CartItemViewSet(viewsets.ModelViewSet):
+class CartItemViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = CartItemSerializer
     permission_classes = [permissions.AllowAny]
+    cache_policy = PRIVATE
 
     def get_queryset(self):
-        user = self.request.user
-        session_key = self.request.session.session_key
+        owner = self.cart_owner()
+        if owner is None:
+            return CartItem.objects.none()
+        return CartItem.objects.filter(**owner)
 
-        if not session_key:
-            # Create a session key if it doesn't exist
-            self.request.session.create()
-            session_key = self.request.session.session_key
-
-        if user.is_authenticated:
-            return CartItem.objects.filter(user=user)
-        else:
-            # Return cart items for the current session
-            return CartItem.objects.filter(session_key=session_key)
+    def cart_owner(self, create=False):
+        """
+        ``{'user': ...}`` for authenticated requests, ``{'session_key': <cart id>}``
+        otherwise; ``None`` for an anonymous visitor without a cart unless ``create``.
+        """
+        if self.request.user.is_authenticated:
+            return {'user': self.request.user}
+        cart_id = session_cart(self.request.session, create)
+        return None if cart_id is None else {'session_key': cart_id}
 
     def perform_create(self, serializer):
-        user = self.request.user if self.request.user.is_authenticated else None
-        session_key = self.request.session.session_key
-
-        if not session_key:
-            # Create a session key if it doesn't exist
-            self.request.session.create()
-            session_key = self.request.session.session_key
-
-        serializer.save(user=user, session_key=session_key)
+        # one row per (owner, product): adding a product already in the cart adds to its quantity
+        owner = self.cart_owner(create=True)
+        product = serializer.validated_data['product']
+        quantity = serializer.validated_data.get('quantity', 1)
+        with transaction.atomic():
+            item, created = CartItem.objects.get_or_create(**owner, product=product, defaults={'quantity': quantity})
+            if not created:
+                CartItem.objects.filter(pk=item.pk).update(quantity=F('quantity') + quantity, updated_at=timezone.now())
+                item.refresh_from_db()
+        serializer.instance = item
 
     @action(detail=False, methods=['get'])
     def my_cart(self, request):
-        queryset = self.get_queryset()
+        queryset = self.filter_queryset(self.get_queryset())
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class AsyncMyCartView(AsyncGenericAPIView):
+    """Async counterpart of ``CartItemViewSet.my_cart``."""
+    serializer_class = CartItemSerializer
+    permission_classes = [permissions.AllowAny]
+    cache_policy = PRIVATE
+
+    async def get(self, request, *args, **kwargs):
+        user = request.user
+        if user.is_authenticated:
+            queryset = CartItem.objects.filter(user=user)
+        else:
+            # loads the session in a thread (see session_cart)
+            cart_id = await sync_to_async(session_cart)(request.session)
+            queryset = CartItem.objects.filter(session_key=cart_id) if cart_id else CartItem.objects.none()
+
+        serializer = self.get_serializer([item async for item in queryset.aiterator()], many=True)
+        return Response(serializer.data)
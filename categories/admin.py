@@ -3,6 +3,8 @@ from .models import Category
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'created_at')
+    list_display = ('name', 'parent', 'depth', 'created_at')
+    list_select_related = ('parent',)
+    raw_id_fields = ('parent',)
     search_fields = ('name',)
     ordering = ('-created_at',)
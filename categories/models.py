@@ -1,9 +1,87 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
+
+# Width of one materialized path segment (the zero-padded id of each ancestor)
+PATH_STEP = 8
+
+
+def path_segment(pk):
+    segment = str(pk).zfill(PATH_STEP)
+    if len(segment) > PATH_STEP:
+        raise ValueError(f"Category id {pk} does not fit in a {PATH_STEP} digit path segment.")
+    return segment
+
+
+def subtree_q(path, prefix=''):
+    """
+    ``Q`` matching the category with ``path`` and all its descendants as a
+    range on the indexed path column (``path <= x < path + 1``), which works
+    on every backend regardless of ``LIKE`` collation rules.
+    """
+    upper = path[:-1] + chr(ord(path[-1]) + 1)
+    return Q(**{f'{prefix}path__gte': path, f'{prefix}path__lt': upper})
+
+
+class CategoryQuerySet(models.QuerySet):
+
+    def subtree(self, category, include_self=True):
+        queryset = self.filter(subtree_q(category.path))
+        if not include_self:
+            queryset = queryset.exclude(pk=category.pk)
+        return queryset
+
+    def ancestors(self, category, include_self=False):
+        paths = [category.path[:end] for end in range(PATH_STEP, len(category.path) + 1, PATH_STEP)]
+        if not include_self:
+            paths = paths[:-1]
+        return self.filter(path__in=paths).order_by('path')
+
 
 class Category(models.Model):
     name = models.CharField(max_length=255, unique=True)
     description = models.TextField(blank=True, null=True)
+    parent = models.ForeignKey(
+        'self', on_delete=models.CASCADE, related_name='children', null=True, blank=True
+    )
+    # ids of the ancestors and of the category itself, PATH_STEP digits each
+    path = models.CharField(max_length=255, db_index=True, editable=False, default='')
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CategoryQuerySet.as_manager()
+
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_path()
+
+    def update_path(self):
+        """Recompute ``path``/``depth`` after a save and move the subtree along with it."""
+        # read both rows back: the instance may hold a path that moved since it was loaded
+        rows = {
+            pk: (path, depth) for pk, path, depth in
+            Category.objects.filter(pk__in=[self.pk, self.parent_id]).values_list('pk', 'path', 'depth')
+        }
+        current_path, current_depth = rows[self.pk]
+        parent_path, parent_depth = rows[self.parent_id] if self.parent_id else ('', -1)
+        path = parent_path + path_segment(self.pk)
+        depth = parent_depth + 1
+
+        if path != current_path:
+            if current_path:
+                if parent_path.startswith(current_path):
+                    raise ValueError(f"{self} cannot be moved under its own descendant.")
+                Category.objects.filter(subtree_q(current_path)).update(
+                    path=Concat(Value(path), Substr('path', len(current_path) + 1)),
+                    depth=F('depth') + (depth - current_depth),
+                )
+            else:
+                Category.objects.filter(pk=self.pk).update(path=path, depth=depth)
+        self.path, self.depth = path, depth
+
+    def is_descendant_of(self, other):
+        return bool(other.path) and self.path.startswith(other.path) and self.pk != other.pk
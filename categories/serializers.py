@@ -1,7 +1,20 @@
 from rest_framework import serializers
 from .models import Category
+from ecommerce.serializers import ValuesSerializer
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
-        fields = ["id", "name", "description", "created_at"]
+        fields = ["id", "name", "description", "parent", "depth", "created_at"]
+        read_only_fields = ["depth"]
+
+    def validate_parent(self, parent):
+        instance = self.instance
+        if parent is not None and instance is not None and (
+                parent.pk == instance.pk or parent.is_descendant_of(instance)):
+            raise serializers.ValidationError("A category cannot be moved under itself or its descendants.")
+        return parent
+
+class CategoryValuesSerializer(ValuesSerializer):
+    class Meta:
+        serializer = CategorySerializer
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category
+from .tree import bump_tree_version
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree(sender, **kwargs):
+    # after the commit (and the subtree's path update), so a concurrent read cannot cache
+    # the old tree under the new version
+    transaction.on_commit(bump_tree_version)
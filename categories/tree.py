@@ -0,0 +1,64 @@
+"""
+Cached category tree for navigation menus.
+
+The whole tree is built from one query ordered by materialized path (a
+pre-order walk, so every parent comes before its children), rendered once
+and stored as bytes under a versioned cache key. Any category change bumps
+the version (see ``signals.py``), so stale trees are never served and old
+entries simply expire.
+"""
+import hashlib
+
+from django.core.cache import cache
+
+from ecommerce.cache import bump_version, get_version
+from ecommerce.renderers import ORJSONRenderer
+
+from .models import Category
+
+NAMESPACE = 'categories:tree'
+TREE_TIMEOUT = 60 * 60 * 24
+
+
+def tree_version():
+    return get_version(NAMESPACE)
+
+
+def bump_tree_version():
+    bump_version(NAMESPACE)
+
+
+def build_tree():
+    roots, nodes = [], {}
+    rows = Category.objects.order_by('path').values_list('pk', 'name', 'parent_id', 'depth')
+    for pk, name, parent_id, depth in rows.iterator(chunk_size=2000):
+        node = nodes[pk] = {'id': pk, 'name': name, 'depth': depth, 'children': []}
+        parent = nodes.get(parent_id)
+        (parent['children'] if parent is not None else roots).append(node)
+    return roots
+
+
+def get_tree(version=None):
+    """``(version, rendered JSON bytes)`` of the full category tree."""
+    version = tree_version() if version is None else version
+    key = f'{NAMESPACE}:{version}'
+    body = cache.get(key)
+    if body is None:
+        body = ORJSONRenderer().render(build_tree())
+        cache.set(key, body, TREE_TIMEOUT)
+    return version, body
+
+
+def resolve_category(value):
+    """
+    ``(path, depth)`` of the category with id or name ``value`` (case
+    insensitive), ``None`` if there is none. Cached per tree version, so
+    filters and facets do not repeat the lookup on every request.
+    """
+    key = f'{NAMESPACE}:{tree_version()}:lookup:{hashlib.sha1(value.lower().encode()).hexdigest()}'
+    found = cache.get(key)
+    if found is None:
+        lookup = {'pk': value} if value.isascii() and value.isdigit() else {'name__iexact': value}
+        found = Category.objects.filter(**lookup).values_list('path', 'depth').first() or ()
+        cache.set(key, found, TREE_TIMEOUT)
+    return tuple(found) or None
@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import CategoryListCreateView, CategoryDetailView
+from .views import CategoryListCreateView, CategoryDetailView, AsyncCategoryListView, CategoryTreeView
 
 urlpatterns = [
     path("all/", CategoryListCreateView.as_view(), name="category-list-create"),
+    path("all/async/", AsyncCategoryListView.as_view(), name="category-list-async"),
+    path("tree/", CategoryTreeView.as_view(), name="category-tree"),
     path("<int:pk>/", CategoryDetailView.as_view(), name="category-detail"),
 ]
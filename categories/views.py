@@ -1,19 +1,61 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from .models import Category
-from .serializers import CategorySerializer
+from .serializers import CategorySerializer, CategoryValuesSerializer
 from .permissions import IsAdminUserOrReadOnly
+from .tree import get_tree, tree_version
 from rest_framework import generics, permissions, filters, viewsets
 from django_filters.rest_framework import DjangoFilterBackend
+from ecommerce.async_views import AsyncListAPIView
+from ecommerce.http_cache import CachePolicy
+from ecommerce.mixins import ValuesListMixin
 
+CATEGORY_CACHE = CachePolicy(public=True, kind='category', related={'parent': 'category'}, collection='categories')
 
-class CategoryListCreateView(generics.ListCreateAPIView):
+
+class CategoryListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     queryset = Category.objects.all().order_by("-created_at")
     serializer_class = CategorySerializer
+    values_serializer_class = CategoryValuesSerializer
     permission_classes = [permissions.AllowAny]  
+    cache_policy = CATEGORY_CACHE
 
 
 class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]  
+    cache_policy = CATEGORY_CACHE
+
+
+class AsyncCategoryListView(AsyncListAPIView):
+    queryset = Category.objects.all().order_by("-created_at")
+    serializer_class = CategorySerializer
+    values_serializer_class = CategoryValuesSerializer
+    permission_classes = [permissions.AllowAny]
+    cache_policy = CATEGORY_CACHE
+
+
+class CategoryTreeView(APIView):
+    """
+    Full category tree for navigation menus, served from the versioned cache
+    in ``categories.tree``; clients revalidate with the version ETag.
+    """
+    permission_classes = [permissions.AllowAny]
+    cache_policy = CachePolicy(public=True, keys=('categories',))
+    authentication_classes = []
+
+    def get(self, request, *args, **kwargs):
+        version = tree_version()
+        etag = f'"categories-tree-{version}"'
+        # compressed responses carry the tag weakened (ecommerce.compression)
+        if {etag, f'W/{etag}'} & set(parse_etags(request.headers.get('If-None-Match', ''))):
+            response = HttpResponseNotModified()
+        else:
+            version, body = get_tree(version)
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        return response
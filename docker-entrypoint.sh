@@ -13,13 +13,14 @@ if [ "$POSTGRES_HOST" = "db" ]; then
     echo "PostgreSQL started"
 fi
 
+# System checks run once when the image is built (Dockerfile.prod), not on every start
 # Apply database migrations
 echo "Applying database migrations..."
-python manage.py migrate --noinput
+python manage.py migrate --noinput --skip-checks
 
 # Collect static files (important for production)
 echo "Collecting static files..."
-python manage.py collectstatic --noinput
+python manage.py collectstatic --noinput --skip-checks
 
 # Create superuser if environment variable is set (optional)
 if [ "$CREATE_SUPERUSER" = "true" ]; then
@@ -27,6 +28,6 @@ if [ "$CREATE_SUPERUSER" = "true" ]; then
     python manage.py createsuperuser --noinput --email admin@example.com || true
 fi
 
-# Start Gunicorn server with dynamic port
-echo "Starting Gunicorn on port ${PORT:-8000}..."
-exec gunicorn nexus_commerce.wsgi:application --bind "0.0.0.0:${PORT:-8000}" --workers 2 --access-logfile -
+# Start Gunicorn server with dynamic port (SERVER_MODE=wsgi|asgi, see gunicorn.conf.py)
+echo "Starting Gunicorn (${SERVER_MODE:-wsgi}) on port ${PORT:-8000}..."
+exec gunicorn --config gunicorn.conf.py --workers "${WEB_CONCURRENCY:-2}"
@@ -0,0 +1,11 @@
+"""
+Admin URLs, included lazily by ``ecommerce/urls.py``: Django imports this
+module the first time a URL under ``admin/`` is resolved, or any URL is
+reversed. With ``DJANGO_PROFILE=lean`` the admin app does not autodiscover
+at startup, so the ``admin.py`` modules are registered here instead.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
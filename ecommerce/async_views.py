@@ -0,0 +1,147 @@
+"""
+Async counterparts of the DRF generic views used on the hot read paths.
+
+DRF's ``APIView.dispatch`` is synchronous, so an ``async def get()`` on a stock
+view is never awaited. ``AsyncAPIView`` runs the DRF request lifecycle inside
+an async ``dispatch``: authentication, permission and throttle checks (which
+may hit the database) are pushed to a worker thread with ``sync_to_async``,
+while the handler itself runs on the event loop and talks to the database
+through Django's async ORM (``acount``, ``aget``, async iteration).
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from rest_framework import generics, status
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .mixins import ValuesListMixin
+
+
+class AsyncAPIView(APIView):
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(),
+                                  self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, '__await__'):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        # Django requires every handler of an async view to be async.
+        if self.metadata_class is None:
+            return self.http_method_not_allowed(request, *args, **kwargs)
+        data = self.metadata_class().determine_metadata(request, self)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView):
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Async version of ``PageNumberPagination.paginate_queryset``: the total
+        comes from ``acount()`` and the page rows from async iteration, so the
+        Django paginator never touches the database itself.
+        """
+        paginator = self.paginator
+        if paginator is None:
+            return None
+        if not isinstance(paginator, PageNumberPagination):
+            return await sync_to_async(self.paginate_queryset)(queryset)
+
+        request = self.request
+        paginator.request = request
+        page_size = paginator.get_page_size(request)
+        if not page_size:
+            return None
+
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            paginator.page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = paginator.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        paginator.page.object_list = [
+            obj async for obj in paginator.page.object_list.aiterator()
+        ]
+        if django_paginator.num_pages > 1 and paginator.template is not None:
+            paginator.display_page_controls = True
+        return list(paginator.page)
+
+
+class AsyncListModelMixin(ValuesListMixin):
+    """Async ``list()``; goes through ``values_serializer_class`` when one is set."""
+
+    async def list(self, request, *args, **kwargs):
+        # filters may query while building the queryset (e.g. resolving ?category= on a cache miss)
+        if self.values_serializer_class is not None:
+            queryset = await sync_to_async(self.get_values_queryset)()
+            serialize = lambda rows: self.get_values_serializer(rows).data
+        else:
+            queryset = await sync_to_async(lambda: self.filter_queryset(self.get_queryset()))()
+            serialize = lambda objects: self.get_serializer(objects, many=True).data
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize(page))
+
+        return Response(serialize([obj async for obj in queryset.aiterator()]))
+
+
+class AsyncRetrieveModelMixin:
+
+    async def retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class AsyncListAPIView(AsyncListModelMixin, AsyncGenericAPIView):
+
+    async def get(self, request, *args, **kwargs):
+        return await self.list(request, *args, **kwargs)
+
+
+class AsyncRetrieveAPIView(AsyncRetrieveModelMixin, AsyncGenericAPIView):
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
@@ -0,0 +1,86 @@
+"""
+Versioned cache namespaces.
+
+Derived data (the category tree, facet counts, ...) is cached under keys
+that embed a namespace version. Writers bump the version instead of
+deleting keys, so readers never see stale entries and old ones simply
+expire. With LocMem the versions are per process; set ``REDIS_URL`` to share
+them between workers.
+
+Single rows are cached cache-aside by ``get_many_cached`` under per-object
+keys (``<app_label.model>:<pk>``, optionally including the version of a
+namespace); writers either rely on that version or delete the keys with
+``invalidate_objects``.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def version_key(namespace):
+    return f'{namespace}:version'
+
+
+def get_version(namespace):
+    key = version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # start from the clock so a lost counter never reuses an old version
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    try:
+        cache.incr(version_key(namespace))
+    except ValueError:
+        get_version(namespace)
+
+
+def bump_versions(namespaces):
+    """``bump_version`` for many namespaces with one ``get_many`` and one ``set_many``."""
+    keys = [version_key(namespace) for namespace in namespaces]
+    if not keys:
+        return
+    current = cache.get_many(keys)
+    now = int(time.time() * 1000)
+    # unset versions start from the clock, like get_version
+    cache.set_many({key: current[key] + 1 if key in current else now for key in keys}, None)
+
+
+OBJECT_TIMEOUT = 60 * 5
+
+
+def object_keys(model, ids, version=None):
+    """``{cache key: pk}`` of the objects ``ids`` of ``model``."""
+    prefix = model._meta.label_lower
+    if version is not None:
+        prefix = f'{prefix}:{get_version(version)}'
+    return {f'{prefix}:{pk}': pk for pk in ids}
+
+
+def get_many_cached(model, ids, load, version=None, timeout=OBJECT_TIMEOUT):
+    """
+    Cache-aside multi-get: ``{pk: value}`` for the ``ids`` found in the cache
+    or returned by ``load(missing ids)``, which is only called with the misses
+    and must return a ``{pk: value}`` dict (ids it does not return are not
+    cached). ``version`` names a namespace whose version is part of the keys.
+    """
+    keys = object_keys(model, ids, version)
+    found = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    missing = [pk for pk in ids if pk not in found]
+    if missing:
+        loaded = load(missing)
+        if loaded:
+            by_pk = {pk: key for key, pk in keys.items()}
+            cache.set_many({by_pk[pk]: value for pk, value in loaded.items()}, timeout)
+            found.update(loaded)
+    return found
+
+
+def invalidate_objects(model, ids):
+    """Drop the unversioned ``get_many_cached`` entries of ``ids``."""
+    keys = list(object_keys(model, ids))
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,136 @@
+"""
+Response compression, brotli where the client accepts it and the package is
+installed, gzip otherwise.
+
+Only text-like bodies (JSON, text, JavaScript, XML, YAML, SVG) of at least
+``COMPRESSION_MIN_BYTES`` are compressed, and only when the result is
+smaller; responses that already carry a ``Content-Encoding`` (the
+precompressed OpenAPI schema and files) and byte ranges are left alone.
+Streaming responses are compressed chunk by chunk with a flush after each,
+so a client still gets every chunk as it is produced; async iterators (ASGI)
+stay async.
+
+Strong ETags are weakened, as the compressed bytes are not those the tag was
+computed for, and ``Vary: Accept-Encoding`` is added to every response that
+could have been compressed so shared caches keep the variants apart.
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is in requirements.txt, gzip still works without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/javascript', 'application/xml', 'application/yaml',
+    'application/vnd.oai.openapi', 'image/svg+xml',
+)
+
+
+def accepted_encodings(header):
+    """Content-codings the client accepts (``q`` > 0), from an Accept-Encoding header."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding)
+    return accepted
+
+
+def compressible(content_type):
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type.startswith('text/') or media_type in COMPRESSIBLE_TYPES or media_type.endswith('+json')
+
+
+def choose_encoding(accept_encoding):
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+class StreamCompressor:
+    """Incremental ``encoding`` compressor; ``chunk`` flushes so nothing is held back."""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self.chunk = lambda data: self.compressor.process(data) + self.compressor.flush()
+            self.finish = self.compressor.finish
+        else:
+            self.compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self.chunk = lambda data: self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = self.compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    async for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not compressible(response.get('Content-Type', '')):
+            return response
+        if response.has_header('Content-Range'):
+            # a byte range of the uncompressed file (ecommerce.files)
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            body = compress(response.content, encoding)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,136 @@
+"""
+Media and static files served by the application, for deployments without a
+CDN or a front web server (``SERVE_FILES``, see ``urls.py``).
+
+``serve`` answers from the files on disk through ``FileResponse``: under
+gunicorn's sync workers the body goes out with ``sendfile`` (zero copy).
+ASGI servers have no such path; files up to ``BUFFERED_MAX`` are read into
+the response in one call, larger ones streamed in ``BLOCK_SIZE`` chunks.
+On top of Django's ``django.views.static.serve`` it adds:
+
+* ``Cache-Control: immutable`` for a year on content-hashed names
+  (``storage.HASHED_NAME``), which browsers do not even revalidate; other
+  names are revalidated on every use (ETag / Last-Modified, 304);
+* single byte ranges (``Range: bytes=...``, 206 and 416, ``If-Range``);
+* the precompressed ``.br``/``.gz`` variant written by the storages, when the
+  client accepts it.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from pathlib import Path
+
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from .compression import accepted_encodings
+from .storage import HASHED_NAME, VARIANTS
+
+BLOCK_SIZE = 64 * 1024
+# files up to this size are read into the response where the server cannot send them from disk
+BUFFERED_MAX = 1024 * 1024
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """``length`` bytes of ``file`` from its current position; ``fileno`` keeps ``sendfile`` possible."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def byte_range(header, size):
+    """``(start, end)`` (inclusive) of a single-range ``Range`` header, ``None`` to send it all."""
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        # malformed or several ranges: the whole file is a valid answer
+        return None
+    first, last = match.groups()
+    if not first:
+        return max(size - int(last), 0), size - 1
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+def if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return etag in parse_etags(if_range)
+    return parse_http_date_safe(if_range) == int(last_modified)
+
+
+def serve(request, path, document_root):
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(document_root, path))
+    if not fullpath.is_file() or fullpath.suffix in ('.br', '.gz') and fullpath.with_suffix('').is_file():
+        raise Http404('"%(path)s" does not exist' % {'path': path})
+
+    content_type = mimetypes.guess_type(fullpath.name)[0] or 'application/octet-stream'
+    range_header = request.META.get('HTTP_RANGE')
+    encoding = None
+    variants = [coding for coding, extension in VARIANTS.items() if os.path.exists(f'{fullpath}{extension}')]
+    if variants and not range_header:
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding = next((coding for coding in variants if coding in accepted), None)
+    served = Path(f'{fullpath}{VARIANTS[encoding]}') if encoding else fullpath
+
+    stat = served.stat()
+    etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+
+    def headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = IMMUTABLE if HASHED_NAME.search(fullpath.name) else REVALIDATE
+        response['Accept-Ranges'] = 'bytes'
+        if variants:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        return headers(not_modified)
+
+    size = stat.st_size
+    span = byte_range(range_header, size) if range_header and if_range_matches(request, etag, stat.st_mtime) else None
+    if span is not None and (span[0] > span[1] or span[0] >= size):
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return headers(response)
+
+    start, end = span or (0, size - 1)
+    length = end - start + 1
+    file = served.open('rb')
+    file.seek(start)
+    if 'wsgi.file_wrapper' not in request.META and length <= BUFFERED_MAX:
+        # no sendfile under ASGI, and Django would read a file iterator to the end in a thread anyway
+        with file:
+            response = HttpResponse(file.read(length), content_type=content_type, status=206 if span else 200)
+    else:
+        response = FileResponse(FileRange(file, length), content_type=content_type, status=206 if span else 200)
+        response['Content-Length'] = str(length)
+        response.block_size = BLOCK_SIZE
+    if span is not None:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return headers(response)
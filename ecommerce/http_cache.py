@@ -0,0 +1,133 @@
+"""
+HTTP caching declared per view.
+
+A view class sets ``cache_policy``; ``CachePolicyMiddleware`` applies it to
+the response. API views without one get ``PRIVATE`` (``private, no-store``):
+nothing a user sees of their cart, orders or payments ends up in a shared
+cache unless a view opts in.
+
+``CachePolicy(public=True, ...)`` is for the anonymous catalog: successful
+``GET``/``HEAD`` responses are ``public`` for ``CATALOG_CACHE_MAX_AGE``
+seconds and may be served stale for ``CATALOG_CACHE_STALE_WHILE_REVALIDATE``
+more while the edge refetches. They carry surrogate keys (header
+``SURROGATE_KEY_HEADER``) naming the objects served, so an edge cache can
+purge by object when it changes:
+
+* ``<kind>-<id>`` for every row of the response (``product-42``), and for
+  the ``related`` fields of the row (``category-7`` for a product);
+* ``<kind>-<value>`` for the ``url_keys`` of the view's URL kwargs (the
+  product of a review page, even when the page is empty);
+* the ``collection`` key (``products``) on list responses, to purge every
+  list when a row is added or removed, plus any static ``keys``.
+
+Requests that carry credentials, responses that set a cookie and errors are
+not shared: they get ``private`` instead. A ``Cache-Control`` set by the view
+itself (the category tree, with its ETag) is kept.
+"""
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.views import APIView
+
+SHARED_STATUSES = (200, 203, 304)
+
+
+def response_rows(data):
+    """``(rows, is_list)`` of a response's data: a list, a page (``results``) or one object."""
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return data['results'], True
+    if isinstance(data, list):
+        return data, True
+    if isinstance(data, dict):
+        return [data], False
+    return [], False
+
+
+def key_value(value):
+    # an expanded relation is keyed by its id
+    if isinstance(value, dict):
+        value = value.get('id')
+    return value
+
+
+class CachePolicy:
+
+    def __init__(self, public=False, kind=None, related=None, url_keys=None, collection=None, keys=()):
+        self.public = public
+        self.kind = kind
+        self.related = related or {}
+        self.url_keys = url_keys or {}
+        self.collection = collection
+        self.keys = tuple(keys)
+
+    def cache_control(self, request, response):
+        """``(Cache-Control, shared)`` for a response of the view."""
+        if not self.public or request.method not in ('GET', 'HEAD') or response.status_code not in SHARED_STATUSES:
+            return 'private, no-store', False
+        if self.personal(request, response):
+            return f'private, max-age={settings.CATALOG_CACHE_MAX_AGE}', False
+        return (f'public, max-age={settings.CATALOG_CACHE_MAX_AGE}, '
+                f'stale-while-revalidate={settings.CATALOG_CACHE_STALE_WHILE_REVALIDATE}'), True
+
+    def surrogate_keys(self, data, view_kwargs):
+        keys = dict.fromkeys(self.keys)
+        for name, kind in self.url_keys.items():
+            if view_kwargs.get(name) is not None:
+                keys[f'{kind}-{view_kwargs[name]}'] = None
+        rows, is_list = response_rows(data)
+        if is_list and self.collection:
+            keys[self.collection] = None
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            if self.kind and row.get('id') is not None:
+                keys[f'{self.kind}-{row["id"]}'] = None
+            for field, kind in self.related.items():
+                value = key_value(row.get(field))
+                if value is not None:
+                    keys[f'{kind}-{value}'] = None
+        return list(keys)
+
+    def personal(self, request, response):
+        return (
+            'HTTP_AUTHORIZATION' in request.META
+            or bool(response.cookies)
+            or (hasattr(request, 'user') and request.user.is_authenticated)
+        )
+
+    def apply(self, request, response, view_kwargs):
+        cache_control, shared = self.cache_control(request, response)
+        if not response.has_header('Cache-Control'):
+            response['Cache-Control'] = cache_control
+        if not shared:
+            return response
+        # DRF picks the renderer from Accept (and ?format=, part of the URL)
+        patch_vary_headers(response, ('Accept',))
+        keys = self.surrogate_keys(getattr(response, 'data', None), view_kwargs)
+        if keys:
+            response[settings.SURROGATE_KEY_HEADER] = ' '.join(keys)
+        return response
+
+
+PRIVATE = CachePolicy()
+
+
+def view_cache_policy(view_func):
+    """The ``cache_policy`` of a view's class, ``PRIVATE`` for API views without one."""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    policy = getattr(view_class, 'cache_policy', None)
+    if policy is None and isinstance(view_class, type) and issubclass(view_class, APIView):
+        return PRIVATE
+    return policy
+
+
+class CachePolicyMiddleware(MiddlewareMixin):
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.cache_policy = view_cache_policy(view_func), view_kwargs
+
+    def process_response(self, request, response):
+        policy, view_kwargs = getattr(request, 'cache_policy', (None, None))
+        if policy is None:
+            return response
+        return policy.apply(request, response, view_kwargs)
@@ -0,0 +1,151 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .cache import get_many_cached
+
+
+def split_param(value):
+    if not value:
+        return ()
+    return tuple(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+
+
+def parse_sparse_fieldset(request, field_names, expandable):
+    """
+    Read ``?fields=a,b`` and ``?expand=c`` from a safe request and validate
+    them against the serializer. Returns ``(fields or None, expand)``.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, ()
+
+    fields = split_param(request.query_params.get('fields'))
+    expand = split_param(request.query_params.get('expand'))
+    errors = {}
+    unknown = [name for name in fields if name not in field_names]
+    if unknown:
+        errors['fields'] = [f"Unknown field: {name}" for name in unknown]
+    unknown = [name for name in expand if name not in expandable]
+    if unknown:
+        errors['expand'] = [f"Field cannot be expanded: {name}" for name in unknown]
+    if errors:
+        raise ValidationError(errors)
+
+    if fields:
+        expand = tuple(name for name in expand if name in fields)
+    return fields or None, expand
+
+
+class ValuesListMixin:
+    """
+    Serve ``list()`` through ``values_serializer_class`` (a ``ValuesSerializer``)
+    so list pages are built from ``.values()`` rows instead of model instances.
+    ``?fields=`` narrows the selected columns and ``?expand=`` joins in the
+    related objects declared by the serializer. Other actions keep using
+    ``serializer_class``.
+    """
+    values_serializer_class = None
+
+    def get_sparse_fieldset(self):
+        if not hasattr(self, '_sparse_fieldset'):
+            serializer_class = self.values_serializer_class
+            self._sparse_fieldset = parse_sparse_fieldset(
+                self.request, serializer_class.field_names(), serializer_class.expandable_fields()
+            )
+        return self._sparse_fieldset
+
+    def get_values_queryset(self):
+        fields, expand = self.get_sparse_fieldset()
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.values_serializer_class.values(queryset, fields, expand)
+
+    def get_values_serializer(self, rows):
+        fields, expand = self.get_sparse_fieldset()
+        return self.values_serializer_class(
+            rows, context=self.get_serializer_context(), fields=fields, expand=expand
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_values_queryset()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_values_serializer(page).data)
+
+        return Response(self.get_values_serializer(queryset).data)
+
+
+class SparseFieldsViewMixin:
+    """
+    ``?fields=`` / ``?expand=`` for views whose serializer uses
+    ``SparseFieldsMixin``: the parsed lists go into the serializer context and
+    the queryset is narrowed with ``only()`` plus ``select_related()`` for the
+    expanded relations, so expansions never cost a query per row.
+    """
+
+    def get_sparse_fieldset(self):
+        if not hasattr(self, '_sparse_fieldset'):
+            serializer_class = self.get_serializer_class()
+            field_names = [name for name, field in serializer_class().fields.items() if not field.write_only]
+            self._sparse_fieldset = parse_sparse_fieldset(
+                self.request, field_names, serializer_class.expandable_fields()
+            )
+        return self._sparse_fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.get_sparse_fieldset()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, expand = self.get_sparse_fieldset()
+        if expand:
+            queryset = queryset.select_related(*expand)
+        if fields:
+            opts = queryset.model._meta
+            concrete = {field.name for field in opts.concrete_fields}
+            queryset = queryset.only(opts.pk.name, *(name for name in fields if name in concrete))
+        return queryset
+
+
+class BatchRetrieveMixin:
+    """
+    ``GET ?ids=3,1,2`` (at most ``max_batch_size`` ids): the objects of
+    ``get_queryset()`` with those primary keys, in the requested order, as
+    ``{"results": [...], "missing": [...]}``.
+
+    The ``.values()`` rows of ``values_serializer_class`` go through the
+    per-object cache of ``ecommerce.cache.get_many_cached`` (keys include the
+    version of ``cache_version`` when set), so only the misses are fetched,
+    with one ``IN`` query. Cached rows are shared by every caller:
+    ``get_queryset()`` must not depend on the request.
+    """
+    values_serializer_class = None
+    max_batch_size = 100
+    cache_version = None
+
+    def get_ids(self):
+        ids = split_param(self.request.query_params.get('ids'))
+        if not ids:
+            raise ValidationError({'ids': ["This query parameter is required."]})
+        if len(ids) > self.max_batch_size:
+            raise ValidationError({'ids': [f"At most {self.max_batch_size} ids per request."]})
+        try:
+            return list(dict.fromkeys(int(pk) for pk in ids))
+        except ValueError:
+            raise ValidationError({'ids': ["Ids must be integers."]})
+
+    def load_rows(self, ids):
+        serializer_class = self.values_serializer_class
+        pk_name = serializer_class.get_plan().pk_name
+        rows = serializer_class.values(self.get_queryset().filter(pk__in=ids))
+        return {row[pk_name]: row for row in rows}
+
+    def get(self, request, *args, **kwargs):
+        ids = self.get_ids()
+        found = get_many_cached(self.get_queryset().model, ids, self.load_rows, self.cache_version)
+        serializer = self.values_serializer_class(
+            [found[pk] for pk in ids if pk in found], context=self.get_serializer_context()
+        )
+        return Response({'results': serializer.data, 'missing': [pk for pk in ids if pk not in found]})
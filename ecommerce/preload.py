@@ -0,0 +1,11 @@
+"""Work done once in the gunicorn master when ``preload_app`` is on (gunicorn.conf.py)."""
+from django.urls import get_resolver
+
+
+def warm_up():
+    """Import the URLconf and every included one, so forked workers start with all views imported."""
+    resolvers = [get_resolver()]
+    while resolvers:
+        for pattern in resolvers.pop().url_patterns:
+            if hasattr(pattern, 'url_patterns'):
+                resolvers.append(pattern)
@@ -0,0 +1,42 @@
+import decimal
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` on top of orjson.
+
+    Output is byte-compatible with DRF's renderer for its default settings
+    (compact, unicode, U+2028/U+2029 escaped, UTC datetimes ending in ``Z``).
+    ``datetime``/``date``/``time``/``UUID`` are encoded natively by orjson and
+    raw ``Decimal`` values follow ``COERCE_DECIMAL_TO_STRING``, so read-only
+    serializers can hand database values over untouched. Anything orjson
+    cannot encode falls back to the stock renderer.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    encoder = JSONEncoder()
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return format(obj, "f") if api_settings.COERCE_DECIMAL_TO_STRING else float(obj)
+        return self.encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, see the comment there.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
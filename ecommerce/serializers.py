@@ -0,0 +1,226 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils.module_loading import import_string
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+# Fields whose representation of a database value is the value itself
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesSerializer:
+    """
+    Read-only list serializer that works on ``.values()`` rows.
+
+    ``Meta.serializer`` names the ``ModelSerializer`` whose output is
+    reproduced; its readable fields are inspected once per class and turned
+    into a list of ``.values()`` columns plus the few per-field conversions
+    that are actually needed. Rows are then emitted without instantiating
+    models or walking serializer fields per object. Decimals and datetimes are
+    left as-is for ``ORJSONRenderer`` to encode.
+
+    ``fields`` restricts the output (and the selected columns) to a subset,
+    ``expand`` replaces foreign key ids listed in ``Meta.expandable`` by the
+    related object, fetched through a join in the same query.
+
+        class PaymentValuesSerializer(ValuesSerializer):
+            class Meta:
+                serializer = PaymentSerializer
+                expandable = {'order': OrderValuesSerializer}
+    """
+
+    class Meta:
+        serializer = None
+        expandable = {}
+
+    def __init__(self, instance=None, context=None, fields=None, expand=None):
+        self.instance = instance
+        self._context = context or {}
+        self.plan = self.get_plan(fields, expand)
+
+    @property
+    def context(self):
+        return self._context
+
+    @classmethod
+    def get_plan(cls, fields=None, expand=None):
+        return _values_plan(cls, tuple(fields) if fields else None, tuple(expand) if expand else ())
+
+    @classmethod
+    def field_names(cls):
+        return list(cls.get_plan().names)
+
+    @classmethod
+    def expandable_fields(cls):
+        return getattr(cls.Meta, 'expandable', {})
+
+    @classmethod
+    def build_converters(cls):
+        serializer_class = cls.Meta.serializer
+        if serializer_class is None:
+            raise ImproperlyConfigured(f"{cls.__name__}.Meta.serializer is not set.")
+        model = serializer_class.Meta.model
+        native_datetimes = settings.USE_TZ and settings.TIME_ZONE == 'UTC'
+
+        converters = {}
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if field.source != name or '.' in field.source:
+                raise ImproperlyConfigured(
+                    f"{cls.__name__} cannot serve field {name!r} (source {field.source!r})."
+                )
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(f"{cls.__name__}: {name!r} is not a model field.")
+
+            if isinstance(field, serializers.FileField):
+                converters[name] = cls.file_url(model._meta.get_field(name).storage, field)
+            elif (isinstance(field, serializers.DecimalField) and not field.localize
+                  and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+                  and not getattr(field, 'normalize_output', False)):
+                converters[name] = None
+            elif (isinstance(field, serializers.DateTimeField) and native_datetimes
+                  and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+                  and 'timezone' not in field.__dict__):
+                converters[name] = None
+            elif isinstance(field, IDENTITY_FIELDS) and not getattr(field, 'pk_field', None):
+                converters[name] = None
+            else:
+                converters[name] = lambda value, context, field=field: field.to_representation(value)
+
+        return converters
+
+    @staticmethod
+    def file_url(storage, field):
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+        def convert(name, context):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            request = context.get('request')
+            return request.build_absolute_uri(url) if request is not None else url
+        return convert
+
+    @classmethod
+    def values(cls, queryset, fields=None, expand=None):
+        return queryset.values(*cls.get_plan(fields, expand).columns)
+
+    def convert(self, row, converters):
+        context = self._context
+        for name, convert in converters:
+            value = row[name]
+            if value is not None:
+                row[name] = convert(value, context)
+        return row
+
+    def to_representation(self, row):
+        plan = self.plan
+        row = self.convert(row, plan.converters)
+        if not plan.expansions:
+            return row
+
+        ret = {}
+        for name in plan.names:
+            expansion = plan.expansions.get(name)
+            if expansion is None:
+                ret[name] = row[name]
+                continue
+            prefix, nested = expansion
+            if row[prefix + nested.pk_name] is None:
+                ret[name] = None
+            else:
+                ret[name] = self.convert(
+                    {column: row[prefix + column] for column in nested.names}, nested.converters
+                )
+        return ret
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.instance]
+
+
+class ValuesPlan:
+    def __init__(self, names, columns, converters, expansions, pk_name):
+        self.names = names
+        self.columns = columns
+        self.converters = converters
+        self.expansions = expansions
+        self.pk_name = pk_name
+
+
+@lru_cache(maxsize=256)
+def _values_plan(serializer_class, fields, expand):
+    if fields is None and not expand:
+        converters = serializer_class.build_converters()
+        model = serializer_class.Meta.serializer.Meta.model
+        names = tuple(converters)
+        return ValuesPlan(
+            names=names,
+            columns=names,
+            converters=tuple((name, fn) for name, fn in converters.items() if fn is not None),
+            expansions={},
+            pk_name=model._meta.pk.name,
+        )
+
+    base = serializer_class.get_plan()
+    names = tuple(name for name in base.names if fields is None or name in fields)
+    columns = []
+    expansions = {}
+    for name in names:
+        if name not in expand:
+            columns.append(name)
+            continue
+        nested = serializer_class.expandable_fields()[name].get_plan()
+        prefix = f"{name}__"
+        columns.extend(prefix + column for column in nested.columns)
+        expansions[name] = (prefix, nested)
+    return ValuesPlan(
+        names=names,
+        columns=tuple(columns),
+        converters=tuple(
+            (name, fn) for name, fn in base.converters if name in names and name not in expansions
+        ),
+        expansions=expansions,
+        pk_name=base.pk_name,
+    )
+
+
+class SparseFieldsMixin:
+    """
+    ``ModelSerializer`` counterpart of the ``fields``/``expand`` support of
+    ``ValuesSerializer``. The view puts the parsed lists in the serializer
+    context; ``Meta.expandable_fields`` maps a foreign key to the dotted path
+    of the serializer used for the expanded object. Only the top-level
+    serializer is narrowed, nested ones render in full.
+    """
+
+    @classmethod
+    def expandable_fields(cls):
+        return getattr(cls.Meta, 'expandable_fields', {})
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if parent is not None and not (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return fields
+
+        for name in self.context.get('expand') or ():
+            fields[name] = import_string(self.expandable_fields()[name])(read_only=True)
+        requested = self.context.get('fields')
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields
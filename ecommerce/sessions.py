@@ -0,0 +1,16 @@
+"""
+Sessions back the admin and the carts of anonymous visitors; the API itself
+authenticates with tokens (``REST_FRAMEWORK``). ``SESSION_BACKEND`` picks the
+engine per deployment (``settings.py``), and this middleware replaces
+Django's so that a request carrying an ``Authorization`` header never writes
+a session or sets its cookie, whatever a view did with ``request.session``.
+"""
+from django.contrib.sessions.middleware import SessionMiddleware as DjangoSessionMiddleware
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+
+    def process_response(self, request, response):
+        if 'HTTP_AUTHORIZATION' in request.META:
+            return response
+        return super().process_response(request, response)
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,27 +26,35 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-%h126-4*m9_x954&s@bue(i@&*u1azyf@dk2%9aj6yaz)4+neg'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DJANGO_DEBUG", "True") == "True"
 
 # AUTH_USER_MODEL = 'authentication.User'
 
 AUTH_USER_MODEL = 'authentication.CustomUser'
 
 # Email Settings for Reset Password
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'kimurgorbrian20@gmail.com'
 EMAIL_HOST_PASSWORD = 'your_email_password'
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "noreply@yourdomain.com")
 
 
 
 
 # Application definition
 
+# DJANGO_PROFILE=lean (production workers) keeps startup short: the admin is
+# autodiscovered on the first /admin/ request (ecommerce/admin_urls.py)
+# instead of at boot, drf-spectacular skips importing its system checks and
+# the benchmark tooling is left out. Measure with `manage.py profile_startup`.
+DJANGO_PROFILE = os.environ.get("DJANGO_PROFILE", "full")
+LEAN = DJANGO_PROFILE == "lean"
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig' if LEAN else 'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -63,14 +72,29 @@ INSTALLED_APPS = [
     "payments",
     "reviews",
     "wishlist",
+    "pricing",
+    "notifications",
+    "mailer",
+    "reporting",
+    "profiling",
     'rest_framework_simplejwt.token_blacklist',
-    'drf_spectacular',
+    'apidocs.apps.LeanSpectacularConfig' if LEAN else 'drf_spectacular',
     'drf_spectacular_sidecar',
+    'apidocs',
 ]
+if not LEAN:
+    INSTALLED_APPS.append('benchmarks')
 
 MIDDLEWARE = [
+    # first, so the captured duration covers the other middleware too
+    'profiling.middleware.ProfilingMiddleware',
+    # outside everything that produces or changes the body
+    'ecommerce.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    # outside the session middleware, so it sees the cookies a response sets
+    'ecommerce.http_cache.CachePolicyMiddleware',
+    # no session writes for token-authenticated requests
+    'ecommerce.sessions.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -87,11 +111,10 @@ CORS_ALLOWED_ORIGINS = [
 # Allow all methods (GET, POST, PUT, DELETE)
 CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "DELETE"]
 
-ALLOWED_HOSTS = [
-    "alx-project-nexus-89gl.onrender.com",
-    # "127.0.0.1",
-    # "localhost",
-]
+ALLOWED_HOSTS = os.environ.get(
+    "DJANGO_ALLOWED_HOSTS", "alx-project-nexus-89gl.onrender.com"
+).split(",")
+# e.g. DJANGO_ALLOWED_HOSTS="127.0.0.1,localhost" for local runs and benchmarks
 
 
 
@@ -110,7 +133,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'ecommerce.renderers.ORJSONRenderer',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -146,19 +169,42 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'ecommerce.wsgi.application'
+ASGI_APPLICATION = 'ecommerce.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# DATABASE_URL overrides the local SQLite file (e.g. postgres://... in production)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': dj_database_url.config(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 }
 
 
+# Cache: Redis when REDIS_URL is set (shared by all workers), per-process memory otherwise
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            # room for the per-object entries of ecommerce.cache.get_many_cached (default: 300)
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+
+# Sessions only back the admin and anonymous carts (created on the first cart write):
+# db, cached_db (reads from the cache, default), cache (lost with the cache) or
+# signed_cookies (no server-side storage at all)
+SESSION_ENGINE = f"django.contrib.sessions.backends.{os.environ.get('SESSION_BACKEND', 'cached_db')}"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -194,11 +240,75 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = 'static/'
-STATIC_ROOT = os.path.join(BASE_DIR, "static")
+STATIC_ROOT = os.environ.get("STATIC_ROOT", os.path.join(BASE_DIR, "static"))
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = os.path.join(BASE_DIR, "media")
-
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", os.path.join(BASE_DIR, "media"))
+
+# Uploads and collected static files are stored under content-hashed names,
+# with .br/.gz variants of text files (ecommerce/storage.py); `manage.py
+# hash_product_images` renames images uploaded before. SERVE_FILES=True has
+# the application serve both (ecommerce/files.py) where no CDN or front
+# server does.
+STORAGES = {
+    "default": {"BACKEND": "ecommerce.storage.HashedMediaStorage"},
+    "staticfiles": {"BACKEND": "ecommerce.storage.CompressedManifestStaticFilesStorage"},
+}
+SERVE_FILES = os.environ.get("SERVE_FILES", "True") == "True"
+
+# Precomputed OpenAPI schema, written by `manage.py build_schema`
+OPENAPI_SCHEMA_DIR = os.environ.get("OPENAPI_SCHEMA_DIR", BASE_DIR / "build" / "openapi")
+
+# In-process autocomplete index (products/suggest.py): entries kept per kind,
+# and the minimum number of seconds between rebuilds after catalog changes
+SUGGEST_MAX_ENTRIES = int(os.environ.get("SUGGEST_MAX_ENTRIES", 2_000_000))
+SUGGEST_REBUILD_INTERVAL = int(os.environ.get("SUGGEST_REBUILD_INTERVAL", 300))
+
+# Completed/cancelled orders older than this many days are moved to the
+# archive tables by `manage.py archive_orders` (orders/archive.py)
+ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get("ORDER_ARCHIVE_AFTER_DAYS", 365))
+
+
+# Request profiling (profiling/): requests slower than PROFILING_SLOW_MS are
+# kept with their sampled stacks and SQL (the PROFILING_KEEP slowest per
+# endpoint), a PROFILING_SAMPLE_RATE share of all requests additionally runs
+# under cProfile. 0 disables either; with both at 0 the middleware is removed.
+PROFILING_SLOW_MS = int(os.environ.get("PROFILING_SLOW_MS", 1000))
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+PROFILING_INTERVAL_MS = float(os.environ.get("PROFILING_INTERVAL_MS", 5))
+PROFILING_KEEP = int(os.environ.get("PROFILING_KEEP", 10))
+
+# Admin change lists (ecommerce/admin_tools.py) count exactly up to this many
+# rows and use the database's row estimate beyond
+ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get("ADMIN_EXACT_COUNT_LIMIT", 10_000))
+
+# Response compression (ecommerce/compression.py): bodies smaller than
+# COMPRESSION_MIN_BYTES are sent as they are, brotli is preferred over gzip
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 5))
+
+# Cache-Control of the public catalog endpoints (ecommerce/http_cache.py) and
+# the header carrying their surrogate keys (Surrogate-Key for Fastly and Varnish)
+CATALOG_CACHE_MAX_AGE = int(os.environ.get("CATALOG_CACHE_MAX_AGE", 60))
+CATALOG_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get("CATALOG_CACHE_STALE_WHILE_REVALIDATE", 300))
+SURROGATE_KEY_HEADER = os.environ.get("SURROGATE_KEY_HEADER", "Surrogate-Key")
+
+# Stock notifications (notifications/): a product going from 0 to some stock
+# notifies its wishlisters, one dropping to LOW_STOCK_THRESHOLD or below the
+# staff. `manage.py send_notifications` fans them out NOTIFICATION_CHUNK_SIZE
+# recipients per transaction and emails NOTIFICATION_EMAIL_BATCH per batch.
+LOW_STOCK_THRESHOLD = int(os.environ.get("LOW_STOCK_THRESHOLD", 5))
+NOTIFICATION_CHUNK_SIZE = int(os.environ.get("NOTIFICATION_CHUNK_SIZE", 1000))
+NOTIFICATION_EMAIL_BATCH = int(os.environ.get("NOTIFICATION_EMAIL_BATCH", 500))
+
+# Transactional email outbox (mailer/): `manage.py send_outbox` reads
+# OUTBOX_BATCH_SIZE messages per query, sends them over one SMTP connection
+# and gives up on a message after OUTBOX_MAX_ATTEMPTS failures; a password
+# reset is mailed at most once per OUTBOX_DEDUP_WINDOW seconds per user.
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 100))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 5))
+OUTBOX_DEDUP_WINDOW = int(os.environ.get("OUTBOX_DEDUP_WINDOW", 300))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -0,0 +1,111 @@
+"""
+File storages that name files after their content.
+
+* ``HashedMediaStorage`` (uploads, ``STORAGES['default']``) saves
+  ``products/lamp.jpg`` as ``products/lamp.3f2a9c1b0d4e.jpg``, the first 12
+  hex digits of the file's SHA-256. A name never points at other bytes, so
+  ``ecommerce.files.serve`` lets browsers cache it for a year without
+  revalidating; uploading the same bytes again reuses the stored file.
+* ``CompressedManifestStaticFilesStorage`` (``collectstatic``) is Django's
+  manifest storage, which fingerprints the same way, and falls back to the
+  plain name for files that were never collected (tests, development).
+
+Both write ``.br`` and ``.gz`` variants next to text-like files (SVG, CSS,
+JavaScript, ...), compressed once at the highest levels, which ``serve``
+picks from ``Accept-Encoding``. Photos are already compressed and get none.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from .compression import brotli, compressible
+
+HASH_LENGTH = 12
+# ``name.<12 hex digits>.ext``, as written by both storages
+HASHED_NAME = re.compile(r'\.[0-9a-f]{%d}(\.[^./]+)?$' % HASH_LENGTH)
+STEM_HASH = re.compile(r'\.[0-9a-f]{%d}$' % HASH_LENGTH)
+VARIANTS = {'br': '.br', 'gzip': '.gz'}
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name, digest, max_length=None):
+    """``dir/stem.<digest>.ext``, the stem shortened to fit ``max_length``."""
+    directory, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    # a hashed name being hashed again (a re-run backfill) keeps one hash
+    stem = STEM_HASH.sub('', stem)
+    suffix = f'.{digest}{ext}'
+    if max_length is not None:
+        stem = stem[:max(max_length - len(directory) - 1 - len(suffix), 1)]
+    return os.path.join(directory, f'{stem}{suffix}')
+
+
+def write_variants(path):
+    """Write the ``.br`` and ``.gz`` variants of the file at ``path`` when it is text-like."""
+    content_type, _ = mimetypes.guess_type(path)
+    if content_type is None or not compressible(content_type):
+        return
+    with open(path, 'rb') as fh:
+        body = fh.read()
+    variants = {'.gz': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(body, quality=11)
+    for extension, data in variants.items():
+        # a variant only helps when it is smaller
+        if len(data) < len(body):
+            with open(path + extension, 'wb') as fh:
+                fh.write(data)
+
+
+class HashedMediaStorage(FileSystemStorage):
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = hashed_name(name, content_hash(content), max_length)
+        if self.exists(name):
+            # the same bytes are already stored under this name
+            return name
+        name = super().save(name, content, max_length)
+        write_variants(self.path(name))
+        return name
+
+    def delete(self, name):
+        super().delete(name)
+        for extension in VARIANTS.values():
+            super().delete(name + extension)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # not collected (yet): served under its plain name, as in DEBUG
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            write_variants(self.path(name))
@@ -14,12 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+import re
+
+from django.conf import settings
+from django.urls import URLResolver, include, path, re_path
+from django.urls.resolvers import RoutePattern
+
+from .files import serve
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    # unlike include(), a resolver built from a dotted path imports it on first use (see admin_urls.py)
+    URLResolver(RoutePattern('admin/'), 'ecommerce.admin_urls', app_name='admin', namespace='admin'),
     path('api/auth/', include('authentication.urls')),
     path("api/categories/", include("categories.urls")),
     path("api/products/", include("products.urls")),
@@ -28,7 +33,15 @@ urlpatterns = [
     path('api/payments/', include('payments.urls')),
     path('api/reviews/', include('reviews.urls')),
     path('api/wishlist/', include('wishlist.urls')),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    path('api/pricing/', include('pricing.urls')),
+    path('api/notifications/', include('notifications.urls')),
+    path('api/reports/', include('reporting.urls')),
+    path('api/profiling/', include('profiling.urls')),
+    path('api/', include('apidocs.urls')),
 ]
+
+if settings.SERVE_FILES:
+    urlpatterns += [
+        re_path(rf'^{re.escape(prefix.strip("/"))}/(?P<path>.+)$', serve, {'document_root': root})
+        for prefix, root in ((settings.MEDIA_URL, settings.MEDIA_ROOT), (settings.STATIC_URL, settings.STATIC_ROOT))
+    ]
@@ -0,0 +1,50 @@
+# Gunicorn configuration shared by Dockerfile.prod and docker-entrypoint.sh.
+#
+# SERVER_MODE=wsgi (default) runs the classic sync worker stack on ecommerce.wsgi.
+# SERVER_MODE=asgi serves ecommerce.asgi through uvicorn workers, so the async
+# read views (/api/products/async/, /api/cart/async/my_cart/, ...) can keep
+# hundreds of slow connections open per worker; every sync DRF view then runs
+# in a thread-sensitive executor. Compare with `python -m benchmarks.async_views`
+# before switching: on the current views ASGI serves fewer requests per second.
+import multiprocessing
+import os
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "ecommerce.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "ecommerce.wsgi:application"
+    worker_class = "sync"
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 4)))
+backlog = int(os.environ.get("GUNICORN_BACKLOG", 2048))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+
+# Import the application once in the master and fork warm workers from it:
+# a recycled or added worker serves its first request without re-importing
+# Django and every app (see `python -m benchmarks.startup`). Code changes then
+# need a full restart instead of a HUP.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true") == "true"
+
+
+def when_ready(server):
+    if preload_app:
+        from ecommerce.preload import warm_up
+        warm_up()
+
+
+def post_fork(server, worker):
+    # database connections opened while preloading must not be shared between processes
+    from django.db import connections
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # build the autocomplete index before the first /api/products/suggest/ request
+    from products.suggest import warm_up
+    warm_up()
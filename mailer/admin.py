@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Message
+
+
+@admin.register(Message)
+class MessageAdmin(admin.ModelAdmin):
+    list_display = ['template', 'to', 'key', 'created_at', 'attempts', 'sent_at']
+    list_filter = ['template']
+    search_fields = ['to', 'key']
+    readonly_fields = ['attempts', 'last_error', 'sent_at']
@@ -0,0 +1,34 @@
+"""
+Send the transactional emails queued in the outbox (``mailer.outbox``).
+
+    manage.py send_outbox                    # once, e.g. from cron every minute
+    manage.py send_outbox --interval 5       # as a long-running worker
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from mailer import outbox
+
+
+class Command(BaseCommand):
+    help = "Send queued emails over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+                            help="Emails read from the queue per query (default: %(default)s).")
+        parser.add_argument('--limit', type=int, help="Send at most this many emails per run.")
+        parser.add_argument('--interval', type=int, help="Keep running, every N seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            sent = outbox.send_pending(batch_size=options['batch_size'], limit=options['limit'])
+            if sent or options['verbosity'] > 1:
+                self.stdout.write(f"Sent {sent} email(s) in {time.perf_counter() - start:.2f}s.")
+            if not options['interval']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
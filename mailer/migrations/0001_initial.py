@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Message',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('template', models.CharField(max_length=50)),
+                ('to', models.EmailField(max_length=254)),
+                ('context', models.JSONField(default=dict)),
+                ('key', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='mailer_unsent_idx'), models.Index(condition=models.Q(('key', ''), _negated=True), fields=['key', 'created_at'], name='mailer_key_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('sent_at__isnull', True), models.Q(('key', ''), _negated=True)), fields=('key',), name='mailer_pending_key_unique')],
+            },
+        ),
+    ]
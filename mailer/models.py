@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class Message(models.Model):
+    """
+    A transactional email waiting in the outbox: queued by ``outbox.enqueue``
+    in the request, rendered and sent later by ``outbox.send_pending``
+    (``manage.py send_outbox``). Messages sharing a ``key`` (e.g. one
+    user's password resets) are coalesced while pending.
+    """
+    template = models.CharField(max_length=50)
+    to = models.EmailField()
+    context = models.JSONField(default=dict)
+    key = models.CharField(max_length=100, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # the sender's queue
+            models.Index(fields=['id'], condition=models.Q(sent_at__isnull=True), name='mailer_unsent_idx'),
+            # the messages of a key in the dedup window
+            models.Index(fields=['key', 'created_at'], condition=~models.Q(key=''), name='mailer_key_idx'),
+        ]
+        constraints = [
+            # at most one pending message per key, concurrent requests included
+            models.UniqueConstraint(fields=['key'], condition=models.Q(sent_at__isnull=True) & ~models.Q(key=''),
+                                    name='mailer_pending_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.template} to {self.to}"
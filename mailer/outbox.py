@@ -0,0 +1,127 @@
+"""
+Transactional email through an outbox table, off the request path.
+
+``enqueue`` stores the template name, recipient and context of a message
+in the request's transaction; ``send_pending`` (``manage.py send_outbox``,
+from cron or with ``--interval``) renders them and sends them
+``OUTBOX_BATCH_SIZE`` rows at a time over one SMTP connection
+(``get_connection`` / ``send_messages``) instead of a connection, with its
+TLS handshake and login, per message.
+
+Messages with a ``key`` are deduplicated: a new request for a key whose
+message is still pending replaces that message's context (the latest reset
+link wins), and one for a key already mailed less than ``window`` ago is
+dropped.
+
+Templates are compiled once per process (``compiled``); sending a message
+only renders the compiled template with its context.
+"""
+import smtplib
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.template import Context, Template
+from django.utils import timezone
+
+from .models import Message
+
+# name: (subject, body), in the Django template language, rendered without autoescaping
+TEMPLATES = {
+    'password_reset': (
+        "Password Reset",
+        "Reset your password using the following link: {{ reset_link }}",
+    ),
+}
+
+# refusals of a single message, after which the connection is still usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+@lru_cache(maxsize=None)
+def compiled(name):
+    subject, body = TEMPLATES[name]
+    return Template(subject), Template(body)
+
+
+def render(name, context):
+    """``(subject, body)`` of template ``name`` for ``context``."""
+    context = Context(context, autoescape=False)
+    return tuple(template.render(context) for template in compiled(name))
+
+
+def enqueue(template, to, context, key='', window=None):
+    """
+    Queue a message; returns whether a new message was queued (``False``
+    when it was coalesced into a pending one or dropped as a duplicate).
+    """
+    if template not in TEMPLATES:
+        raise KeyError(template)
+    if not key:
+        Message.objects.create(template=template, to=to, context=context)
+        return True
+
+    pending = Message.objects.filter(key=key, sent_at__isnull=True)
+    # a message that ran out of attempts is given a fresh start
+    fields = {'to': to, 'context': context, 'attempts': 0, 'last_error': ''}
+    if pending.update(**fields):
+        return False
+    window = settings.OUTBOX_DEDUP_WINDOW if window is None else window
+    if Message.objects.filter(key=key, created_at__gte=timezone.now() - timedelta(seconds=window)).exists():
+        return False
+    try:
+        with transaction.atomic():
+            Message.objects.create(template=template, to=to, context=context, key=key)
+    except IntegrityError:
+        # queued by a concurrent request since (mailer_pending_key_unique)
+        pending.update(**fields)
+        return False
+    return True
+
+
+def send_pending(batch_size=None, limit=None, connection=None):
+    """
+    Send queued messages over one connection; returns how many went out.
+
+    Messages are sent and marked sent one at a time on that connection:
+    one refused by the server is retried by a later run, up to
+    ``OUTBOX_MAX_ATTEMPTS`` times, without holding back or resending the
+    others. A broken connection ends the run.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    queue = Message.objects.filter(sent_at__isnull=True, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS).order_by('pk')
+    connection = connection or get_connection()
+    sent, last, opened, broken = 0, 0, False, False
+    try:
+        while not broken and (limit is None or sent < limit):
+            batch = list(queue.filter(pk__gt=last)[:batch_size if limit is None else min(batch_size, limit - sent)])
+            if not batch:
+                break
+            last = batch[-1].pk
+            for message in batch:
+                email = EmailMessage(*render(message.template, message.context), settings.DEFAULT_FROM_EMAIL,
+                                     [message.to], connection=connection)
+                try:
+                    if not opened:
+                        # once there is something to send, then kept open for the following messages
+                        connection.open()
+                        opened = True
+                    if connection.send_messages([email]) != 1:
+                        # only with fail_silently, e.g. when the connection could not be opened
+                        raise smtplib.SMTPException("not sent")
+                except (smtplib.SMTPException, OSError) as exc:
+                    Message.objects.filter(pk=message.pk).update(attempts=F('attempts') + 1, last_error=str(exc))
+                    if not isinstance(exc, MESSAGE_ERRORS):
+                        broken = True
+                        break
+                    continue
+                # right away: a run stopped half way through a batch resends nothing
+                Message.objects.filter(pk=message.pk).update(sent_at=timezone.now())
+                sent += 1
+    finally:
+        if opened:
+            connection.close()
+    return sent
@@ -0,0 +1,118 @@
+import smtplib
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from benchmarks.smtp_sink import smtp_sink
+from . import outbox
+from .models import Message
+
+User = get_user_model()
+
+
+class FailingBackend(locmem.EmailBackend):
+
+    def send_messages(self, messages):
+        raise smtplib.SMTPServerDisconnected('gone')
+
+
+class ResetPasswordTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='shopper', email='shopper@example.com', password='pass-1234')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=self.user)[0].key}')
+
+    def reset(self):
+        response = self.client.post('/api/auth/reset-password/', {'email': self.user.email}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_queued_not_sent_in_request(self):
+        self.reset()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(outbox.send_pending(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertIn(f'/reset-password/{self.user.pk}/', mail.outbox[0].body)
+
+    def test_repeated_requests_coalesced(self):
+        for _ in range(3):
+            self.reset()
+        self.assertEqual(Message.objects.count(), 1)
+        self.assertEqual(outbox.send_pending(), 1)
+        # already mailed within the window
+        self.reset()
+        self.assertEqual(outbox.send_pending(), 0)
+        Message.objects.update(created_at=timezone.now() - timedelta(days=1))
+        self.reset()
+        self.assertEqual(outbox.send_pending(), 1)
+        self.assertEqual(len(mail.outbox), 2)
+
+
+class SendPendingTests(TestCase):
+
+    def enqueue(self, count):
+        for i in range(count):
+            outbox.enqueue('password_reset', f'user{i}@example.com', {'reset_link': f'http://example.com/{i}/?a=1&b=2'})
+
+    def test_rendered_without_escaping(self):
+        self.enqueue(1)
+        outbox.send_pending()
+        self.assertEqual(mail.outbox[0].subject, 'Password Reset')
+        self.assertTrue(mail.outbox[0].body.endswith('http://example.com/0/?a=1&b=2'))
+
+    @override_settings(EMAIL_HOST='127.0.0.1', EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='')
+    def test_one_connection_for_all_batches(self):
+        self.enqueue(25)
+        with smtp_sink() as sink:
+            connection = get_connection('django.core.mail.backends.smtp.EmailBackend', port=sink.port)
+            self.assertEqual(outbox.send_pending(batch_size=10, connection=connection), 25)
+        self.assertEqual((sink.connections, sink.messages), (1, 25))
+        self.assertFalse(Message.objects.filter(sent_at__isnull=True).exists())
+
+    def test_limit(self):
+        self.enqueue(5)
+        self.assertEqual(outbox.send_pending(batch_size=2, limit=3), 3)
+        self.assertEqual(Message.objects.filter(sent_at__isnull=True).count(), 2)
+
+    @override_settings(EMAIL_HOST='127.0.0.1', EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='')
+    def test_refused_recipient_does_not_hold_back_the_others(self):
+        self.enqueue(5)
+        with smtp_sink(refuse=['user2@']) as sink:
+            connection = get_connection('django.core.mail.backends.smtp.EmailBackend', port=sink.port)
+            self.assertEqual(outbox.send_pending(batch_size=10, connection=connection), 4)
+            connection = get_connection('django.core.mail.backends.smtp.EmailBackend', port=sink.port)
+            self.assertEqual(outbox.send_pending(batch_size=10, connection=connection), 0)
+        # nothing delivered twice
+        self.assertEqual((sink.connections, sink.messages), (2, 4))
+        refused = Message.objects.get(sent_at__isnull=True)
+        self.assertEqual((refused.to, refused.attempts), ('user2@example.com', 2))
+        self.assertIn('no such user', refused.last_error)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_broken_connection_ends_the_run(self):
+        self.enqueue(3)
+        for _ in range(3):
+            self.assertEqual(outbox.send_pending(connection=FailingBackend()), 0)
+        # the first message ran out of attempts, the second was tried once since
+        self.assertEqual(list(Message.objects.order_by('pk').values_list('attempts', flat=True)), [2, 1, 0])
+        self.assertEqual(Message.objects.first().last_error, 'gone')
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_new_request_revives_exhausted_message(self):
+        outbox.enqueue('password_reset', 'user@example.com', {'reset_link': 'old'}, key='reset:1')
+        outbox.send_pending(connection=FailingBackend())
+        self.assertEqual(outbox.send_pending(), 0)
+        self.assertFalse(outbox.enqueue('password_reset', 'user@example.com', {'reset_link': 'new'}, key='reset:1'))
+        self.assertEqual(outbox.send_pending(), 1)
+        self.assertTrue(mail.outbox[0].body.endswith('new'))
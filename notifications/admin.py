@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import Notification, StockEvent
+
+
+@admin.register(StockEvent)
+class StockEventAdmin(admin.ModelAdmin):
+    list_display = ['product', 'kind', 'stock', 'notified', 'created_at', 'processed_at']
+    list_filter = ['kind']
+    list_select_related = ['product']
+    raw_id_fields = ['product']
+    readonly_fields = ['cursor', 'notified', 'processed_at']
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['user', 'product', 'kind', 'created_at', 'sent_at']
+    list_filter = ['kind']
+    list_select_related = ['user', 'product']
+    raw_id_fields = ['user', 'product']
@@ -0,0 +1,109 @@
+"""
+Turning stock events into notifications and emails, off the request path
+(``manage.py send_notifications``, from cron or with ``--interval``).
+
+``fan_out`` walks the recipients of an event by primary key,
+``chunk_size`` rows per query, and bulk-creates their notifications in one
+short transaction per chunk that also advances the event's ``cursor``. No
+lock is held between chunks, so stock and wishlist writes are never queued
+behind a product with half a million wishlisters, and a fan-out that stops
+half way resumes from its cursor without notifying anyone twice.
+
+``send_pending`` then mails the unsent notifications in batches over a
+single SMTP connection (``get_connection`` / ``send_messages``) and marks
+each batch sent once it went out; a batch that fails is retried on the next
+run.
+
+One worker runs both at a time.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from products.models import Product
+from wishlist.models import Wishlist
+
+from .models import Notification, StockEvent
+
+SUBJECTS = {
+    StockEvent.BACK_IN_STOCK: "{product} is back in stock",
+    StockEvent.LOW_STOCK: "Low stock: {product}",
+}
+BODIES = {
+    StockEvent.BACK_IN_STOCK: (
+        "Hi {username},\n\n{product}, on your wishlist, is back in stock.\n"
+        "Order it before it runs out again.\n"
+    ),
+    StockEvent.LOW_STOCK: "{product} is down to {stock} in stock.\n",
+}
+
+
+def recipients(event):
+    """``(cursor, user id)`` rows of the users ``event`` notifies, in cursor order."""
+    if event.kind == StockEvent.BACK_IN_STOCK:
+        # served by wishlist_product_idx
+        return Wishlist.objects.filter(product_id=event.product_id).order_by('pk').values_list('pk', 'user_id')
+    return get_user_model().objects.filter(is_staff=True, is_active=True).order_by('pk').values_list('pk', 'pk')
+
+
+def fan_out(event, chunk_size=None):
+    """Create the notifications of ``event`` from its cursor on; returns how many were created."""
+    chunk_size = chunk_size or settings.NOTIFICATION_CHUNK_SIZE
+    if event.kind == StockEvent.BACK_IN_STOCK and not Product.objects.filter(pk=event.product_id, stock__gt=0).exists():
+        # sold out again before anyone was told
+        StockEvent.objects.filter(pk=event.pk).update(processed_at=timezone.now())
+        return 0
+
+    rows, created = recipients(event), 0
+    while True:
+        chunk = list(rows.filter(pk__gt=event.cursor)[:chunk_size])
+        if not chunk:
+            break
+        notifications = [Notification(user_id=user_id, product_id=event.product_id, kind=event.kind)
+                         for _, user_id in chunk]
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications)
+            event.cursor, event.notified = chunk[-1][0], event.notified + len(chunk)
+            StockEvent.objects.filter(pk=event.pk).update(cursor=event.cursor, notified=event.notified)
+        created += len(chunk)
+    StockEvent.objects.filter(pk=event.pk).update(processed_at=timezone.now())
+    return created
+
+
+def process_events(chunk_size=None):
+    """Fan out every pending event, oldest first; returns ``(events, notifications)``."""
+    events = notifications = 0
+    for event in StockEvent.objects.filter(processed_at__isnull=True).order_by('pk'):
+        notifications += fan_out(event, chunk_size)
+        events += 1
+    return events, notifications
+
+
+def send_pending(batch_size=None, limit=None, connection=None):
+    """Email unsent notifications over one connection; returns how many messages went out."""
+    batch_size = batch_size or settings.NOTIFICATION_EMAIL_BATCH
+    pending = (
+        Notification.objects.filter(sent_at__isnull=True).order_by('pk')
+        .values_list('pk', 'kind', 'user__email', 'user__username', 'product__name', 'product__stock')
+    )
+    connection = connection or get_connection()
+    sent = 0
+    with connection:
+        while limit is None or sent < limit:
+            rows = list(pending[:batch_size if limit is None else min(batch_size, limit - sent)])
+            if not rows:
+                break
+            messages = []
+            for pk, kind, email, username, product, stock in rows:
+                if not email:
+                    continue
+                context = {'username': username, 'product': product, 'stock': stock}
+                messages.append(EmailMessage(SUBJECTS[kind].format_map(context), BODIES[kind].format_map(context),
+                                             settings.DEFAULT_FROM_EMAIL, [email], connection=connection))
+            if messages:
+                connection.send_messages(messages)
+            Notification.objects.filter(pk__in=[row[0] for row in rows]).update(sent_at=timezone.now())
+            sent += len(messages)
+    return sent
@@ -0,0 +1,41 @@
+"""
+Fan pending stock events out to notifications and email them
+(``notifications.fanout``).
+
+    manage.py send_notifications                   # once, e.g. from cron every minute
+    manage.py send_notifications --interval 30     # as a long-running worker
+    manage.py send_notifications --no-email        # in-app notifications only
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications import fanout
+
+
+class Command(BaseCommand):
+    help = "Turn stock events into notifications and send the pending notification emails."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=settings.NOTIFICATION_CHUNK_SIZE,
+                            help="Recipients per fan-out transaction (default: %(default)s).")
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_EMAIL_BATCH,
+                            help="Emails per send_messages call (default: %(default)s).")
+        parser.add_argument('--limit', type=int, help="Send at most this many emails per run.")
+        parser.add_argument('--no-email', action='store_true', help="Only create the notifications.")
+        parser.add_argument('--interval', type=int, help="Keep running, every N seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            events, created = fanout.process_events(chunk_size=options['chunk_size'])
+            sent = 0 if options['no_email'] else fanout.send_pending(batch_size=options['batch_size'],
+                                                                     limit=options['limit'])
+            self.stdout.write(f"{events} event(s), {created} notification(s) created, {sent} email(s) sent "
+                              f"in {time.perf_counter() - start:.2f}s.")
+            if not options['interval']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
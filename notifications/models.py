@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import models
+
+
+class StockEvent(models.Model):
+    """
+    A product's stock crossing a threshold, recorded by ``signals.py`` in the
+    transaction of the write that caused it and fanned out to notifications
+    later by ``fanout.process_events`` (``manage.py send_notifications``).
+    ``cursor`` is the last recipient row done, so an interrupted fan-out
+    resumes where it stopped.
+    """
+    BACK_IN_STOCK = 'BACK_IN_STOCK'
+    LOW_STOCK = 'LOW_STOCK'
+    KIND_CHOICES = [
+        (BACK_IN_STOCK, 'Back in stock'),
+        (LOW_STOCK, 'Low stock'),
+    ]
+
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='stock_events')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    stock = models.PositiveIntegerField()
+    cursor = models.BigIntegerField(default=0)
+    notified = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # pending events, looked up per product when a new crossing is recorded
+        indexes = [
+            models.Index(fields=['product', 'kind'], condition=models.Q(processed_at__isnull=True),
+                         name='stockevent_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: product {self.product_id} at {self.stock}"
+
+
+class Notification(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=20, choices=StockEvent.KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # when the email went out (or was skipped, for users without an address)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_idx'),
+            # the sender's queue
+            models.Index(fields=['id'], condition=models.Q(sent_at__isnull=True), name='notification_unsent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.user_id}: product {self.product_id}"
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'product', 'product_name', 'kind', 'created_at']
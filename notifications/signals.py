@@ -0,0 +1,70 @@
+"""
+Stock threshold crossings, recorded as ``StockEvent`` rows next to the write
+that caused them.
+
+``Product.save()`` is watched through ``post_save``, including saves of an
+expression (``product.stock = F('stock') - 1``), which re-read the stock.
+``QuerySet.update()`` sends no signal: bulk stock writes go through
+``update_stock`` to be noticed (and to refresh the cached catalog).
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.expressions import Combinable
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from ecommerce.cache import bump_version
+from products.facets import CATALOG_NAMESPACE
+from products.models import Product
+
+from .models import StockEvent
+
+
+def crossing(before, after):
+    """The ``StockEvent`` kind of a stock change from ``before`` to ``after``, ``None`` if it crosses nothing."""
+    if before == 0 and after > 0:
+        return StockEvent.BACK_IN_STOCK
+    if before > settings.LOW_STOCK_THRESHOLD >= after:
+        return StockEvent.LOW_STOCK
+    return None
+
+
+def record(product_id, before, after):
+    kind = crossing(before, after)
+    if kind is None:
+        return
+    # written right after the stock (in the writer's transaction when it runs in one); a
+    # pending event of the same kind already covers this crossing
+    pending = StockEvent.objects.filter(product_id=product_id, kind=kind, processed_at__isnull=True)
+    if not pending.exists():
+        StockEvent.objects.create(product_id=product_id, kind=kind, stock=after)
+
+
+def update_stock(queryset, stock):
+    """
+    ``queryset.update(stock=stock)``, ``stock`` being a value or an
+    expression such as ``F('stock') + 10``, recording the crossings it
+    causes. Returns the number of products updated.
+    """
+    with transaction.atomic():
+        before = dict(queryset.select_for_update().order_by('pk').values_list('pk', 'stock'))
+        # auto_now and the post_save invalidation (products/signals.py) do not apply to update()
+        updated = Product.objects.filter(pk__in=before).update(stock=stock, updated_at=timezone.now())
+        for pk, after in Product.objects.filter(pk__in=before).values_list('pk', 'stock'):
+            record(pk, before[pk], after)
+        if updated:
+            transaction.on_commit(lambda: bump_version(CATALOG_NAMESPACE))
+    return updated
+
+
+@receiver(post_save, sender=Product)
+def record_stock_crossing(sender, instance, created, update_fields=None, **kwargs):
+    if isinstance(instance.stock, Combinable):
+        # saved as an expression: the database computed the value
+        instance.refresh_from_db(fields=['stock'])
+    # the stock as loaded from the database, see Product.from_db
+    before, instance._loaded_stock = getattr(instance, '_loaded_stock', None), instance.stock
+    if created or before is None or update_fields is not None and 'stock' not in update_fields:
+        return
+    record(instance.pk, before, instance.stock)
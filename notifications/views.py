@@ -0,0 +1,15 @@
+from rest_framework import generics, permissions
+from .models import Notification
+from .serializers import NotificationSerializer
+from ecommerce.http_cache import PRIVATE
+
+
+class NotificationListView(generics.ListAPIView):
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    cache_policy = PRIVATE
+
+    def get_queryset(self):
+        # newest first, served by notification_user_idx
+        return (Notification.objects.filter(user=self.request.user).select_related('product')
+                .order_by('-created_at'))
@@ -1,8 +1,61 @@
 from django.contrib import admin
-from .models import Order
+
+from ecommerce.admin_tools import FastAdmin
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+from .transitions import TRANSITIONS
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    raw_id_fields = ['product']
+    extra = 0
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(FastAdmin):
     list_display = ['id', 'user', 'status', 'total_amount', 'created_at']
     list_filter = ['status']
-    search_fields = ['user__username', 'id']
\ No newline at end of file
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    indexed_search_fields = {'id': 'exact', 'user__username': 'prefix'}
+    inlines = [OrderItemInline]
+    # status only changes through the transition actions
+    readonly_fields = ['status']
+    actions = ['process_orders', 'complete_orders', 'cancel_orders']
+
+    def apply_transition(self, request, queryset, name):
+        moved, rejected = TRANSITIONS[name].apply(queryset.values_list('pk', flat=True))
+        self.message_user(request, f"{len(moved)} order(s) moved to {TRANSITIONS[name].target.lower()}, "
+                                   f"{len(rejected)} rejected.")
+
+    @admin.action(description="Mark selected orders as processing", permissions=['change'])
+    def process_orders(self, request, queryset):
+        self.apply_transition(request, queryset, 'process')
+
+    @admin.action(description="Mark selected orders as completed (paid orders only)", permissions=['change'])
+    def complete_orders(self, request, queryset):
+        self.apply_transition(request, queryset, 'complete')
+
+    @admin.action(description="Cancel selected orders", permissions=['change'])
+    def cancel_orders(self, request, queryset):
+        self.apply_transition(request, queryset, 'cancel')
+class ArchivedOrderItemInline(admin.TabularInline):
+    model = ArchivedOrderItem
+    raw_id_fields = ['product']
+    extra = 0
+    can_delete = False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(FastAdmin):
+    list_display = ['id', 'user', 'status', 'total_amount', 'created_at', 'archived_at']
+    list_filter = ['status']
+    list_select_related = ['user']
+    indexed_search_fields = {'id': 'exact', 'user__username': 'prefix'}
+    inlines = [ArchivedOrderItemInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
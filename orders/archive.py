@@ -0,0 +1,80 @@
+"""
+Hot/cold order storage.
+
+``archive(before)`` moves completed and cancelled orders created before
+``before`` (with their items and payment) from ``Order``/``OrderItem``/
+``Payment`` to the ``Archived*`` tables, ``batch_size`` orders at a time.
+Each batch is one transaction: three ``INSERT ... SELECT`` statements copy
+the rows and three deletes remove them, so an interrupted run loses nothing
+and simply continues where it stopped when started again.
+
+Archived orders never change again; the reporting rollups read them
+together with the hot tables, so a day can be recomputed whatever part of
+it was archived.
+"""
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from ecommerce.cache import invalidate_objects
+
+from payments.models import ArchivedPayment, Payment
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+
+STATUSES = ('COMPLETED', 'CANCELLED')
+BATCH_SIZE = 1000
+
+
+def copy_rows(queryset, model, now=None):
+    """``INSERT INTO model SELECT ... FROM queryset`` on the columns both tables share."""
+    connection = connections[router.db_for_write(model)]
+    fields = model._meta.concrete_fields
+    source = queryset.order_by()
+    if now is not None:
+        source = source.annotate(archived_at=models.Value(now, output_field=models.DateTimeField()))
+    sql, params = source.values(*[field.attname for field in fields]).query.sql_with_params()
+
+    qn = connection.ops.quote_name
+    names = ', '.join(qn(field.column) for field in fields)
+    # select by name, the ORM decides the column order of ``sql``
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {qn(model._meta.db_table)} ({names}) SELECT {names} FROM ({sql}) source", params)
+        return cursor.rowcount
+
+
+def archive_batch(before, batch_size=BATCH_SIZE, statuses=STATUSES):
+    """Archive up to ``batch_size`` orders; returns how many were moved."""
+    with transaction.atomic():
+        ids = list(
+            Order.objects.filter(status__in=statuses, created_at__lt=before)
+            .select_for_update(skip_locked=True).order_by('status', 'pk')  # order_status_idx, no sort
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        copy_rows(Order.objects.filter(pk__in=ids), ArchivedOrder, now=timezone.now())
+        copy_rows(OrderItem.objects.filter(order_id__in=ids), ArchivedOrderItem)
+        copy_rows(Payment.objects.filter(order_id__in=ids), ArchivedPayment)
+        payment_ids = list(Payment.objects.filter(order_id__in=ids).values_list('pk', flat=True))
+        # nothing else references these rows: skip the deletion collector
+        for queryset in (OrderItem.objects.filter(order_id__in=ids), Payment.objects.filter(order_id__in=ids),
+                         Order.objects.filter(pk__in=ids)):
+            queryset._raw_delete(queryset.db)
+        # the batch endpoints must stop returning archived rows
+        transaction.on_commit(lambda: invalidate_objects(Order, ids))
+        transaction.on_commit(lambda: invalidate_objects(Payment, payment_ids))
+    return len(ids)
+
+
+def archive(before, batch_size=BATCH_SIZE, statuses=STATUSES, max_batches=None, progress=None):
+    """Archive every matching order in batches; returns the number of orders moved."""
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(before, batch_size, statuses)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        if progress is not None:
+            progress(total)
+    return total
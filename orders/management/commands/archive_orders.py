@@ -0,0 +1,42 @@
+"""
+Move old completed/cancelled orders, their items and payments to the
+archive tables (``orders.archive``).
+
+    manage.py archive_orders                    # older than ORDER_ARCHIVE_AFTER_DAYS
+    manage.py archive_orders --days 90 --batch-size 5000 --max-batches 100
+
+Every batch commits on its own: the command can be stopped at any time and
+run again (e.g. nightly, with ``--max-batches`` to bound each run).
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders import archive
+
+
+class Command(BaseCommand):
+    help = "Archive completed and cancelled orders older than a number of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+                            help="Archive orders created more than this many days ago.")
+        parser.add_argument('--batch-size', type=int, default=archive.BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, help="Stop after this many batches (default: no limit).")
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        start = time.perf_counter()
+
+        def progress(total):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {total} orders archived")
+
+        total = archive.archive(before, batch_size=options['batch_size'],
+                                max_batches=options['max_batches'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total} order(s) created before {before:%Y-%m-%d} in {time.perf_counter() - start:.1f}s."
+        ))
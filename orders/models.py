@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from .transitions import TRANSITIONS, TransitionNotAllowed
 
 User = get_user_model()
 
@@ -11,19 +12,85 @@ class Order(models.Model):
         ('CANCELLED', 'Cancelled'),
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders', null=True, blank=True)
+    # indexed by order_user_created_idx below
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders', null=True, blank=True,
+                             db_index=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        # range scans of the reporting rollups (reporting/rollups.py) and the archival
+        # job (orders/archive.py); per-user history, anonymous orders (user IS NULL) included
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='order_user_created_idx'),
+            models.Index(fields=['created_at'], name='order_created_at_idx'),
+            models.Index(fields=['updated_at'], name='order_updated_at_idx'),
+            # admin change list filtered by status, newest first
+            models.Index(fields=['status', 'id'], name='order_status_idx'),
+        ]
+
     def __str__(self):
-        return f"Order {self.id} by {self.user.username}"
+        username = self.user.username if self.user else "Anonymous"
+        return f"Order {self.id} by {username}"
+
+    def transition(self, name):
+        """Apply one of ``orders.transitions.TRANSITIONS`` with compare-and-set semantics."""
+        TRANSITIONS[name].apply_one(self)
 
     def cancel(self):
-        if self.status == 'PENDING':
-            self.status = 'CANCELLED'
-            self.save()
-            return True
-        return False
\ No newline at end of file
+        try:
+            self.transition('cancel')
+        except TransitionNotAllowed:
+            return False
+        return True
+
+
+class OrderItem(models.Model):
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='order_items')
+    quantity = models.PositiveIntegerField(default=1)
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} in order {self.order_id}"
+
+
+class ArchivedOrder(models.Model):
+    """
+    Completed and cancelled orders moved out of ``Order`` by
+    ``manage.py archive_orders`` (see ``orders/archive.py``); ids are kept.
+    Nothing references this table with a database constraint, so it can be
+    range-partitioned on ``created_at`` where the database supports it.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    # history outlives its user and products: no cascade through the collector
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='archived_orders', null=True, blank=True,
+                             db_index=False, db_constraint=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='archived_order_user_idx'),
+            models.Index(fields=['created_at'], name='archived_order_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order {self.id}"
+
+
+class ArchivedOrderItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name='items', db_constraint=False)
+    product = models.ForeignKey('products.Product', on_delete=models.DO_NOTHING, related_name='+', db_constraint=False)
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} in archived order {self.order_id}"
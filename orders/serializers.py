@@ -1,11 +1,45 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import Order
+from .models import Order, OrderItem
+from .transitions import TRANSITIONS
+from ecommerce.serializers import ValuesSerializer
+from pricing.rules import quote
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+    class Meta:
+        model = OrderItem
+        fields = ['product', 'quantity', 'unit_price']
+        read_only_fields = ['unit_price']
 
 class OrderSerializer(serializers.ModelSerializer):
+    # write-only so list responses (and OrderValuesSerializer) stay one query
+    items = OrderItemSerializer(many=True, write_only=True, allow_empty=False)
+
     class Meta:
         model = Order
-        fields = ['id', 'user', 'created_at', 'updated_at', 'status', 'total_amount']
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        fields = ['id', 'user', 'created_at', 'updated_at', 'status', 'total_amount', 'items']
+        # status only changes through orders.transitions, the total is priced from the items (pricing.rules)
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'status', 'total_amount']
+
+    def create(self, validated_data):
+        items = validated_data.pop('items', [])
+        quantities = {}
+        for item in items:
+            product = item['product']
+            quantities[product] = quantities.get(product, 0) + item['quantity']
+        priced = quote(quantities)
+        products = {product.pk: product for product in quantities}
+        with transaction.atomic():
+            order = super().create({**validated_data, 'total_amount': priced.total})
+            # unit prices after line promotions; an order promotion only lowers the total
+            OrderItem.objects.bulk_create(
+                OrderItem(order=order, product=products[line.product_id], quantity=line.quantity,
+                          unit_price=line.unit_price)
+                for line in priced.lines
+            )
+        return order
 
 class OrderCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -15,4 +49,14 @@ class OrderCreateSerializer(serializers.ModelSerializer):
 class OrderCancelSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
-        fields = ['status']
\ No newline at end of file
+        fields = ['status']
+
+class OrderTransitionSerializer(serializers.Serializer):
+    transition = serializers.ChoiceField(choices=list(TRANSITIONS))
+
+class BulkOrderTransitionSerializer(OrderTransitionSerializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=10000)
+
+class OrderValuesSerializer(ValuesSerializer):
+    class Meta:
+        serializer = OrderSerializer
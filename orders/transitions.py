@@ -0,0 +1,95 @@
+"""
+Order state machine.
+
+``TRANSITIONS`` declares every allowed status change: the source statuses,
+the target status, an optional guard (a ``Q`` on ``Order`` so it can be
+checked inside the ``UPDATE`` itself) and hooks run with the ids that
+actually moved.
+
+Every transition is a conditional, set-based update::
+
+    UPDATE orders_order SET status = <target>, updated_at = <now>
+    WHERE id IN (...) AND status IN (<sources>) AND <guard>
+
+so an order that another request moved in the meantime simply does not
+match any more (compare-and-set) instead of being overwritten. The cached
+rows of the batch endpoints (``ecommerce.cache``) are dropped on commit.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ecommerce.cache import invalidate_objects
+
+
+class TransitionNotAllowed(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Transition:
+    name: str
+    sources: tuple
+    target: str
+    guard: Q = field(default_factory=Q)
+    # called as hook(transition, order_ids) inside the transaction
+    hooks: tuple = ()
+
+    def apply(self, ids):
+        """Move the orders in ``ids`` that allow it; returns ``(moved ids, rejected ids)``."""
+        from .models import Order
+
+        ids = list(dict.fromkeys(ids))
+        with transaction.atomic():
+            candidates = Order.objects.filter(pk__in=ids, status__in=self.sources).filter(self.guard)
+            moved = list(candidates.select_for_update().order_by('pk').values_list('pk', flat=True))
+            if moved:
+                # the status condition is repeated: rows are locked where the database supports it,
+                # and the update never overwrites a status it did not expect anyway
+                Order.objects.filter(pk__in=moved, status__in=self.sources).update(
+                    status=self.target, updated_at=timezone.now()
+                )
+                for hook in self.hooks:
+                    hook(self, moved)
+                transaction.on_commit(lambda: invalidate_objects(Order, moved))
+        moved_set = set(moved)
+        return moved, [pk for pk in ids if pk not in moved_set]
+
+    def apply_one(self, order):
+        """Compare-and-set ``order`` from its current status; raises ``TransitionNotAllowed``."""
+        from .models import Order
+
+        if order.status not in self.sources:
+            raise TransitionNotAllowed(f"Cannot {self.name} an order that is {order.get_status_display().lower()}.")
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Order.objects.filter(pk=order.pk, status=order.status).filter(self.guard).update(
+                status=self.target, updated_at=now
+            )
+            if not updated:
+                raise TransitionNotAllowed(f"Order {order.pk} changed concurrently or does not meet the conditions.")
+            for hook in self.hooks:
+                hook(self, [order.pk])
+            transaction.on_commit(lambda: invalidate_objects(Order, [order.pk]))
+        order.status, order.updated_at = self.target, now
+
+
+def fail_pending_payments(transition, order_ids):
+    from payments.models import Payment
+
+    ids = list(Payment.objects.filter(order_id__in=order_ids, status='PENDING').values_list('pk', flat=True))
+    if ids:
+        Payment.objects.filter(pk__in=ids, status='PENDING').update(status='FAILED', updated_at=timezone.now())
+        transaction.on_commit(lambda: invalidate_objects(Payment, ids))
+
+
+TRANSITIONS = {
+    transition.name: transition
+    for transition in (
+        Transition('process', sources=('PENDING',), target='PROCESSING'),
+        Transition('complete', sources=('PROCESSING',), target='COMPLETED', guard=Q(payment__status='COMPLETED')),
+        Transition('cancel', sources=('PENDING',), target='CANCELLED', hooks=(fail_pending_payments,)),
+    )
+}
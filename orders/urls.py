@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderDetailView, OrderCancelView
+from .views import OrderListCreateView, OrderDetailView, OrderCancelView, OrderTransitionView, BulkOrderTransitionView, OrderBatchView
 
 urlpatterns = [
     path('', OrderListCreateView.as_view(), name='order-list-create'),
+    path('batch/', OrderBatchView.as_view(), name='order-batch'),
+    path('transition/', BulkOrderTransitionView.as_view(), name='order-bulk-transition'),
     path('<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
     path('<int:pk>/cancel/', OrderCancelView.as_view(), name='order-cancel'),
+    path('<int:pk>/transition/', OrderTransitionView.as_view(), name='order-transition'),
 ]
\ No newline at end of file
@@ -1,18 +1,52 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from .models import Order
-from .serializers import OrderSerializer, OrderCreateSerializer, OrderCancelSerializer
+from .models import ArchivedOrder, Order
+from .serializers import (
+    OrderSerializer, OrderCreateSerializer, OrderCancelSerializer, OrderValuesSerializer,
+    OrderTransitionSerializer, BulkOrderTransitionSerializer,
+)
+from .transitions import TRANSITIONS, TransitionNotAllowed
+from ecommerce.http_cache import PRIVATE
+from ecommerce.mixins import BatchRetrieveMixin, ValuesListMixin
 
-class OrderListCreateView(generics.ListCreateAPIView):
+class OrderListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = OrderSerializer
+    values_serializer_class = OrderValuesSerializer
     permission_classes = [permissions.AllowAny]  # Allow any user
+    cache_policy = PRIVATE
 
     def get_queryset(self):
         # Return all orders for unauthenticated users or filter by user if authenticated
+        # (newest first, served by order_user_created_idx)
+        return self.owned(Order.objects.order_by('-created_at', '-id'))
+
+    def owned(self, queryset):
         user = self.request.user
         if user.is_authenticated:
-            return Order.objects.filter(user=user)
-        return Order.objects.filter(user__isnull=True)
+            return queryset.filter(user=user)
+        return queryset.filter(user__isnull=True)
+
+    def include_archived(self):
+        return self.request.query_params.get('include_archived') in ('1', 'true', 'True')
+
+    def get_values_queryset(self):
+        """``?include_archived=true`` appends the archived orders (orders/archive.py)."""
+        if not self.include_archived():
+            return super().get_values_queryset()
+        fields, expand = self.get_sparse_fieldset()
+        columns = self.values_serializer_class.get_plan(fields, expand).columns
+        # a union can only be ordered by selected columns; they are dropped again in get_values_serializer
+        self.sort_columns = [name for name in ('created_at', 'id') if name not in columns]
+        columns += tuple(self.sort_columns)
+        hot = self.filter_queryset(self.get_queryset()).order_by().values(*columns)
+        archived = self.owned(ArchivedOrder.objects.all()).values(*columns)
+        return hot.union(archived, all=True).order_by('-created_at', '-id')
+
+    def get_values_serializer(self, rows):
+        for name in getattr(self, 'sort_columns', ()):
+            for row in rows:
+                del row[name]
+        return super().get_values_serializer(rows)
 
     def perform_create(self, serializer):
         # Save with user if authenticated, otherwise None
@@ -22,11 +56,20 @@ class OrderListCreateView(generics.ListCreateAPIView):
 class OrderDetailView(generics.RetrieveAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.AllowAny]
+    cache_policy = PRIVATE
 
     def get_queryset(self):
         # Allow retrieving any order
         return Order.objects.all()
 
+class OrderBatchView(BatchRetrieveMixin, generics.GenericAPIView):
+    """``GET /api/orders/batch/?ids=3,1,2``, same orders as ``OrderDetailView``."""
+    serializer_class = OrderSerializer
+    values_serializer_class = OrderValuesSerializer
+    permission_classes = [permissions.AllowAny]
+    cache_policy = PRIVATE
+    queryset = Order.objects.all()
+
 class OrderCancelView(generics.UpdateAPIView):
     serializer_class = OrderCancelSerializer
     permission_classes = [permissions.AllowAny]
@@ -43,3 +86,36 @@ class OrderCancelView(generics.UpdateAPIView):
         if order.cancel():
             return Response({'status': 'Order cancelled'}, status=status.HTTP_200_OK)
         return Response({'error': 'Order cannot be cancelled'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class OrderTransitionView(generics.GenericAPIView):
+    """Apply a transition (``process``, ``complete``, ``cancel``) to one order."""
+    serializer_class = OrderTransitionSerializer
+    permission_classes = [permissions.IsAdminUser]
+    queryset = Order.objects.all()
+
+    def post(self, request, *args, **kwargs):
+        order = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            order.transition(serializer.validated_data['transition'])
+        except TransitionNotAllowed as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(OrderSerializer(order).data, status=status.HTTP_200_OK)
+
+class BulkOrderTransitionView(generics.GenericAPIView):
+    """
+    Apply a transition to up to 10,000 orders with one conditional UPDATE;
+    orders not in a source status (or failing the guard) are rejected.
+    """
+    serializer_class = BulkOrderTransitionSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        transition = TRANSITIONS[serializer.validated_data['transition']]
+        moved, rejected = transition.apply(serializer.validated_data['ids'])
+        return Response({'transition': transition.name, 'status': transition.target,
+                         'moved': moved, 'rejected': rejected}, status=status.HTTP_200_OK)
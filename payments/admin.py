@@ -1,8 +1,13 @@
 from django.contrib import admin
+
+from ecommerce.admin_tools import FastAdmin
 from .models import Payment
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(FastAdmin):
     list_display = ['id', 'order', 'payment_method', 'amount', 'status', 'created_at']
     list_filter = ['status', 'payment_method']
-    search_fields = ['order__id', 'transaction_id']
\ No newline at end of file
+    # Order.__str__ shows the username
+    list_select_related = ['order__user']
+    raw_id_fields = ['order']
+    indexed_search_fields = {'order__id': 'exact', 'transaction_id': 'prefix'}
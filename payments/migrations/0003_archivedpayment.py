@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_archivedorder_and_more'),
+        ('payments', '0002_payment_payment_created_at_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('payment_method', models.CharField(choices=[('CREDIT_CARD', 'Credit Card'), ('PAYPAL', 'PayPal'), ('STRIPE', 'Stripe')], max_length=20)),
+                ('transaction_id', models.CharField(max_length=100, unique=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('order', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='orders.archivedorder')),
+            ],
+        ),
+    ]
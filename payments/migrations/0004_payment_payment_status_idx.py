@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_order_status_idx'),
+        ('payments', '0003_archivedpayment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'id'], name='payment_status_idx'),
+        ),
+    ]
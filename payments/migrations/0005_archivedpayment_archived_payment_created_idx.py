@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_alter_archivedorder_user_and_more'),
+        ('payments', '0004_payment_payment_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedpayment',
+            index=models.Index(fields=['created_at'], name='archived_payment_created_idx'),
+        ),
+    ]
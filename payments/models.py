@@ -1,5 +1,5 @@
 from django.db import models
-from orders.models import Order
+from orders.models import ArchivedOrder, Order
 
 class Payment(models.Model):
     STATUS_CHOICES = [
@@ -22,6 +22,15 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # range scans of the reporting rollups (reporting/rollups.py)
+        indexes = [
+            models.Index(fields=['created_at'], name='payment_created_at_idx'),
+            models.Index(fields=['updated_at'], name='payment_updated_at_idx'),
+            # admin change list filtered by status, newest first
+            models.Index(fields=['status', 'id'], name='payment_status_idx'),
+        ]
+
     def __str__(self):
         return f"Payment {self.transaction_id} for Order {self.order.id}"
 
@@ -31,4 +40,23 @@ class Payment(models.Model):
 
     def mark_as_failed(self):
         self.status = 'FAILED'
-        self.save()
\ No newline at end of file
+        self.save()
+
+
+class ArchivedPayment(models.Model):
+    """Payment of an ``ArchivedOrder``, moved together with it by ``orders/archive.py``."""
+    id = models.BigIntegerField(primary_key=True)
+    order = models.OneToOneField(ArchivedOrder, on_delete=models.CASCADE, related_name='payment', db_constraint=False)
+    payment_method = models.CharField(max_length=20, choices=Payment.PAYMENT_METHOD_CHOICES)
+    transaction_id = models.CharField(max_length=100, unique=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Payment.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        # payment rollups of a day (reporting/rollups.py)
+        indexes = [models.Index(fields=['created_at'], name='archived_payment_created_idx')]
+
+    def __str__(self):
+        return f"Archived payment {self.transaction_id} for order {self.order_id}"
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import Payment
+from ecommerce.serializers import ValuesSerializer
+from orders.serializers import OrderValuesSerializer
 
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -15,4 +17,9 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
 class PaymentStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
-        fields = ['status']
\ No newline at end of file
+        fields = ['status']
+
+class PaymentValuesSerializer(ValuesSerializer):
+    class Meta:
+        serializer = PaymentSerializer
+        expandable = {'order': OrderValuesSerializer}
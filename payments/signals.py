@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.cache import invalidate_objects
+
+from .models import Payment
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_payment(sender, instance, **kwargs):
+    # after the commit, so a concurrent batch read cannot cache the old row again
+    transaction.on_commit(lambda: invalidate_objects(Payment, [instance.pk]))
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import PaymentCreateView, PaymentDetailView, PaymentListView
+from .views import PaymentBatchView, PaymentCreateView, PaymentDetailView, PaymentListView
 
 urlpatterns = [
     path('', PaymentListView.as_view(), name='payment-list'),   
     path('', PaymentCreateView.as_view(), name='payment-create'),
+    path('batch/', PaymentBatchView.as_view(), name='payment-batch'),
     path('<int:pk>/', PaymentDetailView.as_view(), name='payment-detail'),
 ]
\ No newline at end of file
@@ -1,7 +1,9 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from .models import Payment
-from .serializers import PaymentSerializer, PaymentCreateSerializer
+from .serializers import PaymentSerializer, PaymentCreateSerializer, PaymentValuesSerializer
+from ecommerce.http_cache import PRIVATE
+from ecommerce.mixins import BatchRetrieveMixin, ValuesListMixin
 import uuid
 
 class PaymentCreateView(generics.CreateAPIView):
@@ -12,12 +14,22 @@ class PaymentCreateView(generics.CreateAPIView):
         transaction_id = str(uuid.uuid4())
         serializer.save(transaction_id=transaction_id, status='PENDING')
 
-class PaymentListView(generics.ListAPIView):
+class PaymentListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = PaymentSerializer
+    values_serializer_class = PaymentValuesSerializer
     queryset = Payment.objects.all()
     permission_classes = []  # No authentication
+    cache_policy = PRIVATE
 
 class PaymentDetailView(generics.RetrieveAPIView):
     serializer_class = PaymentSerializer
     queryset = Payment.objects.all()
     permission_classes = []  # No authentication
+    cache_policy = PRIVATE
+
+class PaymentBatchView(BatchRetrieveMixin, generics.GenericAPIView):
+    serializer_class = PaymentSerializer
+    values_serializer_class = PaymentValuesSerializer
+    queryset = Payment.objects.all()
+    permission_classes = []  # No authentication
+    cache_policy = PRIVATE
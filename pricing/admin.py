@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Promotion
+
+
+@admin.register(Promotion)
+class PromotionAdmin(admin.ModelAdmin):
+    list_display = ['name', 'scope', 'kind', 'value', 'product', 'category', 'min_subtotal', 'starts_at', 'ends_at',
+                    'is_active']
+    list_filter = ['scope', 'kind', 'is_active']
+    list_select_related = ['product', 'category']
+    raw_id_fields = ['product', 'category']
+    search_fields = ['name']
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
+from django.db import models
+
+
+class Promotion(models.Model):
+    """
+    A discount rule, evaluated by ``pricing.rules``. Line promotions target
+    a product, a category (and its subcategories) or, with neither, every
+    product; order promotions discount the subtotal of carts reaching
+    ``min_subtotal``. Only the best line promotion applies per line and the
+    best order promotion per order; promotions do not stack.
+    """
+    PERCENT = 'PERCENT'
+    FIXED = 'FIXED'
+    KIND_CHOICES = [
+        (PERCENT, 'Percentage'),
+        (FIXED, 'Fixed amount'),
+    ]
+
+    LINE = 'LINE'
+    ORDER = 'ORDER'
+    SCOPE_CHOICES = [
+        (LINE, 'Each unit of matching products'),
+        (ORDER, 'Order subtotal'),
+    ]
+
+    name = models.CharField(max_length=255)
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, default=LINE)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=PERCENT)
+    # percent off, or amount off per unit (line) or per order
+    value = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal('0.01'))])
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='promotions',
+                                null=True, blank=True)
+    category = models.ForeignKey('categories.Category', on_delete=models.CASCADE, related_name='promotions',
+                                 null=True, blank=True)
+    min_subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    starts_at = models.DateTimeField(null=True, blank=True)
+    ends_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # the compiler reads the active promotions that have not ended yet
+        indexes = [
+            models.Index(fields=['ends_at'], condition=models.Q(is_active=True), name='promotion_active_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if self.kind == self.PERCENT and self.value is not None and self.value > 100:
+            raise ValidationError({'value': "A percentage cannot exceed 100."})
+        if self.product_id and self.category_id:
+            raise ValidationError("Target a product or a category, not both.")
+        if self.scope == self.ORDER and (self.product_id or self.category_id):
+            raise ValidationError("Order promotions apply to the whole order, not to a product or category.")
+        if self.starts_at and self.ends_at and self.ends_at <= self.starts_at:
+            raise ValidationError({'ends_at': "The promotion must end after it starts."})
@@ -0,0 +1,229 @@
+"""
+Promotions compiled for evaluation (see ``models.Promotion``).
+
+``compile_rules(now)`` reads the active promotions once and builds a
+``RuleSet`` for the period around ``now``:
+
+* line rules by product id and by category id. A category's entry already
+  includes the rules of its ancestors (propagated down the tree in path
+  order), so a product needs one lookup rather than a walk up the tree;
+* per entry only the best percentage and the best fixed rule are kept: for
+  one kind a larger value always wins, so no line ever compares more than
+  six rules (product, category, everything);
+* the order rules sorted by ``min_subtotal``, with the best rule of each
+  kind among the first ``i``: a bisection finds the rules a subtotal
+  reaches and the best of them in O(log n).
+
+The set is valid until the next promotion starts or ends. ``Pricer`` keeps
+it in the process and recompiles when the pricing version (promotion
+changes, see ``signals.py``) or the category tree version moves, or the
+period ends. ``RuleSet.quote`` prices a cart in one pass over its lines.
+"""
+import bisect
+import threading
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db.models import Q
+from django.utils import timezone
+
+from categories.models import PATH_STEP, Category
+from categories.tree import tree_version
+from ecommerce.cache import get_version
+
+from .models import Promotion
+
+PRICING_NAMESPACE = 'pricing'
+CENT = Decimal('0.01')
+ZERO = Decimal('0.00')
+
+
+def money(amount):
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class Rule:
+    __slots__ = ('promotion_id', 'percent', 'amount')
+
+    def __init__(self, promotion_id, kind, value):
+        self.promotion_id = promotion_id
+        self.percent = value / 100 if kind == Promotion.PERCENT else None
+        self.amount = value if kind == Promotion.FIXED else None
+
+    def discount(self, price):
+        """Discount on ``price`` (a unit price or a subtotal), at most ``price``."""
+        if self.percent is not None:
+            return money(price * self.percent)
+        return min(self.amount, price)
+
+
+def better(current, rule):
+    """The larger of two rules of the same kind (ties: the older promotion)."""
+    if current is None:
+        return rule
+    value, current_value = rule.percent or rule.amount, current.percent or current.amount
+    if value > current_value or value == current_value and rule.promotion_id < current.promotion_id:
+        return rule
+    return current
+
+
+def merge(entry, rule):
+    """``(best percent rule, best fixed rule)`` of ``entry`` and ``rule``."""
+    percent, fixed = entry or (None, None)
+    if rule.percent is not None:
+        return better(percent, rule), fixed
+    return percent, better(fixed, rule)
+
+
+def best_discount(price, entries):
+    """``(discount, promotion id)`` of the best rule in ``entries`` for ``price``."""
+    best, promotion_id = ZERO, None
+    for entry in entries:
+        if entry is None:
+            continue
+        for rule in entry:
+            if rule is None:
+                continue
+            discount = rule.discount(price)
+            if discount > best or discount == best and discount and rule.promotion_id < promotion_id:
+                best, promotion_id = discount, rule.promotion_id
+    return best, promotion_id
+
+
+@dataclass
+class QuoteLine:
+    product_id: int
+    quantity: int
+    list_price: Decimal
+    unit_price: Decimal
+    promotion_id: int | None
+    total: Decimal
+
+
+@dataclass
+class Quote:
+    lines: list
+    subtotal: Decimal
+    order_discount: Decimal
+    order_promotion_id: int | None
+    total: Decimal
+
+
+class RuleSet:
+
+    def __init__(self, key, valid_until, products, categories, everything, thresholds, order_rules):
+        self.key = key
+        self.valid_until = valid_until
+        self.products = products
+        self.categories = categories
+        self.everything = everything
+        self.thresholds = thresholds
+        self.order_rules = order_rules
+
+    def covers(self, now):
+        return self.valid_until is None or now < self.valid_until
+
+    def unit_price(self, product_id, category_id, price):
+        """``(price after the best line promotion, its id)`` for one unit."""
+        entries = (self.products.get(product_id), self.categories.get(category_id), self.everything)
+        discount, promotion_id = best_discount(price, entries)
+        return price - discount, promotion_id
+
+    def order_discount(self, subtotal):
+        """``(discount, promotion id)`` of the best order promotion ``subtotal`` reaches."""
+        reached = bisect.bisect_right(self.thresholds, subtotal)
+        if not reached:
+            return ZERO, None
+        return best_discount(subtotal, [self.order_rules[reached - 1]])
+
+    def quote(self, lines):
+        """Price ``(product id, category id, list price, quantity)`` lines."""
+        quoted, subtotal = [], ZERO
+        for product_id, category_id, price, quantity in lines:
+            unit_price, promotion_id = self.unit_price(product_id, category_id, price)
+            total = unit_price * quantity
+            subtotal += total
+            quoted.append(QuoteLine(product_id, quantity, price, unit_price, promotion_id, total))
+        discount, promotion_id = self.order_discount(subtotal)
+        return Quote(quoted, subtotal, discount, promotion_id, subtotal - discount)
+
+
+def compile_rules(now=None, key=None):
+    now = now or timezone.now()
+    promotions = (
+        Promotion.objects.filter(is_active=True)
+        .filter(Q(ends_at__isnull=True) | Q(ends_at__gt=now))
+        .values_list('pk', 'scope', 'kind', 'value', 'product_id', 'category_id', 'min_subtotal',
+                     'starts_at', 'ends_at')
+    )
+    products, own, everything, order_rules = {}, {}, None, []
+    valid_until = None
+    for pk, scope, kind, value, product_id, category_id, min_subtotal, starts_at, ends_at in promotions:
+        if starts_at is not None and starts_at > now:
+            valid_until = starts_at if valid_until is None else min(valid_until, starts_at)
+            continue
+        if ends_at is not None:
+            valid_until = ends_at if valid_until is None else min(valid_until, ends_at)
+        rule = Rule(pk, kind, value)
+        if scope == Promotion.ORDER:
+            order_rules.append((min_subtotal, rule))
+        elif product_id is not None:
+            products[product_id] = merge(products.get(product_id), rule)
+        elif category_id is not None:
+            own[category_id] = merge(own.get(category_id), rule)
+        else:
+            everything = merge(everything, rule)
+
+    categories = {}
+    if own:
+        # parents come before their children in path order
+        by_path = {}
+        for pk, path in Category.objects.order_by('path').values_list('pk', 'path').iterator(chunk_size=5000):
+            entry = by_path.get(path[:-PATH_STEP])
+            for rule in own.get(pk, ()):
+                if rule is not None:
+                    entry = merge(entry, rule)
+            if entry is not None:
+                by_path[path] = categories[pk] = entry
+
+    order_rules.sort(key=lambda item: (item[0], item[1].promotion_id))
+    thresholds, prefix, entry = [], [], None
+    for min_subtotal, rule in order_rules:
+        entry = merge(entry, rule)
+        thresholds.append(min_subtotal)
+        prefix.append(entry)
+    return RuleSet(key, valid_until, products, categories, everything, thresholds, prefix)
+
+
+class Pricer:
+    """The compiled ``RuleSet`` of this process."""
+
+    def __init__(self):
+        self.ruleset = None
+        self.lock = threading.Lock()
+
+    def current_key(self):
+        return get_version(PRICING_NAMESPACE), tree_version()
+
+    def fresh(self, ruleset, key, now):
+        return ruleset is not None and ruleset.key == key and ruleset.covers(now)
+
+    def rules(self):
+        now, key = timezone.now(), self.current_key()
+        ruleset = self.ruleset
+        if not self.fresh(ruleset, key, now):
+            with self.lock:
+                ruleset = self.ruleset
+                if not self.fresh(ruleset, key, now):
+                    ruleset = self.ruleset = compile_rules(now, key)
+        return ruleset
+
+
+pricer = Pricer()
+
+
+def quote(quantities):
+    """Quote ``{product: quantity}`` with the current promotions."""
+    return pricer.rules().quote(
+        (product.pk, product.category_id, product.price, quantity) for product, quantity in quantities.items()
+    )
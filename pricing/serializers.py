@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from products.models import Product
+
+
+class QuoteItemSerializer(serializers.Serializer):
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class QuoteRequestSerializer(serializers.Serializer):
+    # the requester's cart when omitted
+    items = QuoteItemSerializer(many=True, required=False, allow_empty=False, max_length=500)
+
+
+class QuoteLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField(source='product_id')
+    quantity = serializers.IntegerField()
+    list_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    unit_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    promotion = serializers.IntegerField(source='promotion_id', allow_null=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class QuoteSerializer(serializers.Serializer):
+    lines = QuoteLineSerializer(many=True)
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2)
+    order_discount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    order_promotion = serializers.IntegerField(source='order_promotion_id', allow_null=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2)
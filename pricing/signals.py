@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.cache import bump_version
+
+from .models import Promotion
+from .rules import PRICING_NAMESPACE
+
+
+@receiver(post_save, sender=Promotion)
+@receiver(post_delete, sender=Promotion)
+def invalidate_rules(sender, **kwargs):
+    # after the commit: a rule set compiled before it would be kept under the new version
+    transaction.on_commit(bump_pricing_version)
+
+
+def bump_pricing_version():
+    bump_version(PRICING_NAMESPACE)
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from categories.models import Category
+from orders.models import Order
+from products.models import Product
+from .models import Promotion
+from .rules import compile_rules, pricer
+
+User = get_user_model()
+
+
+class PricingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Category.objects.create(name='Home')
+        cls.child = Category.objects.create(name='Lighting', parent=cls.root)
+        cls.leaf = Category.objects.create(name='Lamps', parent=cls.child)
+        cls.other = Category.objects.create(name='Garden')
+        cls.lamp = Product.objects.create(name='Lamp', description='', price=Decimal('50.00'), stock=10,
+                                          category=cls.leaf)
+        cls.hose = Product.objects.create(name='Hose', description='', price=Decimal('20.00'), stock=10,
+                                          category=cls.other)
+
+    def setUp(self):
+        # the process-wide rule set may have been compiled by another test
+        pricer.ruleset = None
+
+    def promote(self, value, kind=Promotion.PERCENT, **kwargs):
+        return Promotion.objects.create(name=f'{value} {kind}', value=Decimal(value), kind=kind, **kwargs)
+
+    def unit_price(self, product, now=None):
+        return compile_rules(now).unit_price(product.pk, product.category_id, product.price)
+
+
+class LinePromotionTests(PricingTestCase):
+
+    def test_best_rule_wins(self):
+        self.promote('10')
+        fixed = self.promote('8.00', kind=Promotion.FIXED, product=self.lamp)
+        # 10% of 50.00 is 5.00: the fixed 8.00 is the better of the two
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('42.00'), fixed.pk))
+        percent = self.promote('20', category=self.leaf)
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('40.00'), percent.pk))
+
+    def test_ties_go_to_the_older_promotion(self):
+        older = self.promote('5.00', kind=Promotion.FIXED)
+        self.promote('10', product=self.lamp)
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('45.00'), older.pk))
+
+    def test_fixed_discount_at_most_the_price(self):
+        promotion = self.promote('30.00', kind=Promotion.FIXED, product=self.hose)
+        self.assertEqual(self.unit_price(self.hose), (Decimal('0.00'), promotion.pk))
+
+    def test_category_promotion_reaches_the_subtree(self):
+        promotion = self.promote('10', category=self.root)
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('45.00'), promotion.pk))
+        self.assertEqual(self.unit_price(self.hose), (Decimal('20.00'), None))
+
+    def test_best_rule_across_ancestors(self):
+        self.promote('10', category=self.root)
+        best = self.promote('25', category=self.child)
+        self.promote('15', category=self.leaf)
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('37.50'), best.pk))
+
+    def test_moved_category_follows_its_new_parent(self):
+        promotion = self.promote('10', category=self.other)
+        self.leaf.parent = self.other
+        self.leaf.save()
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('45.00'), promotion.pk))
+
+
+class OrderPromotionTests(PricingTestCase):
+
+    def order_discount(self, subtotal):
+        return compile_rules().order_discount(Decimal(subtotal))
+
+    def test_thresholds(self):
+        small = self.promote('5.00', kind=Promotion.FIXED, scope=Promotion.ORDER, min_subtotal=Decimal('50.00'))
+        large = self.promote('10', scope=Promotion.ORDER, min_subtotal=Decimal('100.00'))
+        self.assertEqual(self.order_discount('49.99'), (Decimal('0.00'), None))
+        self.assertEqual(self.order_discount('50.00'), (Decimal('5.00'), small.pk))
+        self.assertEqual(self.order_discount('100.00'), (Decimal('10.00'), large.pk))
+
+    def test_best_rule_among_those_reached(self):
+        better = self.promote('20.00', kind=Promotion.FIXED, scope=Promotion.ORDER, min_subtotal=Decimal('50.00'))
+        percent = self.promote('10', scope=Promotion.ORDER, min_subtotal=Decimal('100.00'))
+        self.assertEqual(self.order_discount('150.00'), (Decimal('20.00'), better.pk))
+        self.assertEqual(self.order_discount('300.00'), (Decimal('30.00'), percent.pk))
+
+    def test_order_rules_do_not_discount_lines(self):
+        self.promote('50', scope=Promotion.ORDER)
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('50.00'), None))
+
+
+class PromotionPeriodTests(PricingTestCase):
+
+    def test_time_window(self):
+        now = timezone.now()
+        self.promote('10', starts_at=now + timedelta(hours=1), ends_at=now + timedelta(hours=2))
+        self.assertEqual(self.unit_price(self.lamp, now), (Decimal('50.00'), None))
+        self.assertEqual(self.unit_price(self.lamp, now + timedelta(hours=1))[0], Decimal('45.00'))
+        self.assertEqual(self.unit_price(self.lamp, now + timedelta(hours=2)), (Decimal('50.00'), None))
+
+    def test_inactive_promotions_ignored(self):
+        self.promote('10', is_active=False)
+        self.assertEqual(self.unit_price(self.lamp), (Decimal('50.00'), None))
+
+    def test_valid_until_the_next_start_or_end(self):
+        now = timezone.now()
+        self.promote('10', ends_at=now + timedelta(hours=3))
+        self.promote('20', starts_at=now + timedelta(hours=1))
+        self.assertEqual(compile_rules(now).valid_until, now + timedelta(hours=1))
+        self.assertEqual(compile_rules(now + timedelta(hours=1)).valid_until, now + timedelta(hours=3))
+        self.assertIsNone(compile_rules(now + timedelta(hours=3)).valid_until)
+
+    def test_recompiled_once_the_period_ends(self):
+        now = timezone.now()
+        self.promote('10', starts_at=now + timedelta(minutes=1))
+        ruleset = pricer.rules()
+        self.assertIs(pricer.rules(), ruleset)
+        # the promotion has started since
+        ruleset.valid_until = timezone.now()
+        self.assertIsNot(pricer.rules(), ruleset)
+
+    def test_recompiled_after_a_promotion_change(self):
+        ruleset = pricer.rules()
+        self.assertIs(pricer.rules(), ruleset)
+        with self.captureOnCommitCallbacks() as callbacks:
+            promotion = self.promote('10')
+        # not before the commit
+        self.assertIs(pricer.rules(), ruleset)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(pricer.rules().unit_price(self.lamp.pk, self.leaf.pk, self.lamp.price),
+                         (Decimal('45.00'), promotion.pk))
+
+
+class OrderTotalTests(PricingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='shopper', email='shopper@example.com', password='pass-1234')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def order(self, items, **data):
+        response = self.client.post('/api/orders/', {'items': items, **data}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return Order.objects.get(pk=response.data['id'])
+
+    def test_total_priced_on_the_server(self):
+        self.promote('10', category=self.root)
+        self.promote('5.00', kind=Promotion.FIXED, scope=Promotion.ORDER, min_subtotal=Decimal('100.00'))
+        order = self.order([{'product': self.lamp.pk, 'quantity': 2}, {'product': self.hose.pk, 'quantity': 1},
+                            {'product': self.lamp.pk, 'quantity': 1}],
+                           total_amount='1.00')
+        # 3 lamps at 45.00 and a hose at 20.00 is 155.00, less 5.00 off the order
+        self.assertEqual(order.total_amount, Decimal('150.00'))
+        self.assertEqual(sorted(order.items.values_list('product_id', 'quantity', 'unit_price')),
+                         sorted([(self.lamp.pk, 3, Decimal('45.00')), (self.hose.pk, 1, Decimal('20.00'))]))
+        self.assertEqual(order.user, self.user)
+
+    def test_no_promotions(self):
+        order = self.order([{'product': self.hose.pk, 'quantity': 3}])
+        self.assertEqual(order.total_amount, Decimal('60.00'))
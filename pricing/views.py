@@ -0,0 +1,40 @@
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+
+from cart.models import CartItem
+from cart.views import session_cart
+
+from .rules import quote
+from .serializers import QuoteRequestSerializer, QuoteSerializer
+
+
+class QuoteView(generics.GenericAPIView):
+    """
+    ``POST {"items": [{"product": 1, "quantity": 2}, ...]}``: line and order
+    totals after promotions (see ``pricing.rules``). Without ``items`` the
+    requester's cart is quoted.
+    """
+    serializer_class = QuoteRequestSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        quantities = {}
+        if 'items' in serializer.validated_data:
+            for item in serializer.validated_data['items']:
+                quantities[item['product']] = quantities.get(item['product'], 0) + item['quantity']
+        else:
+            for item in self.cart_items():
+                quantities[item.product] = item.quantity
+        return Response(QuoteSerializer(quote(quantities)).data)
+
+    def cart_items(self):
+        if self.request.user.is_authenticated:
+            owner = {'user': self.request.user}
+        else:
+            cart_id = session_cart(self.request.session)
+            if cart_id is None:
+                return []
+            owner = {'session_key': cart_id}
+        return CartItem.objects.filter(**owner).select_related('product')
@@ -1,9 +1,21 @@
 from django.contrib import admin
-from .models import Product
+
+from ecommerce.admin_tools import FastAdmin
+from .models import Product, ProductRecommendation
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
-    list_display = ('name', 'price', 'stock', 'created_at', 'updated_at')  # Display these fields in the list view
-    search_fields = ('name', 'description')  # Enable search by name or description
+class ProductAdmin(FastAdmin):
+    list_display = ('name', 'category', 'price', 'stock', 'created_at', 'updated_at')  # Display these fields in the list view
+    list_select_related = ('category',)
+    raw_id_fields = ('category',)
+    indexed_search_fields = {'name': 'prefix', 'id': 'exact'}  # Search by name prefix or id
     list_filter = ('created_at', 'updated_at')  # Add filters for creation and update dates
-    ordering = ('-created_at',)  # Order by latest created products first
+    ordering = ('-pk',)  # Latest created products first, in primary key order
+
+
+@admin.register(ProductRecommendation)
+class ProductRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('product', 'kind', 'rank', 'recommended', 'score')
+    list_filter = ('kind',)
+    list_select_related = ('product', 'recommended')
+    raw_id_fields = ('product', 'recommended')
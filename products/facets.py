@@ -0,0 +1,170 @@
+"""
+Facet counts for the product listing.
+
+Every facet is computed with a fixed number of grouped/conditional
+aggregate queries, independent of how many values it has: price buckets and
+rating thresholds are one ``COUNT(...) FILTER (...)`` query each, category
+counts are one ``GROUP BY`` on a prefix of the materialized path plus one
+name lookup. Facets are disjunctive: a facet ignores its own filters
+(``min_price``/``max_price`` for price, ``min_rating`` for rating), so the
+other options of that facet stay visible. Category drills down instead and
+counts the children of the selected category.
+
+Results are cached under the filter signature and the catalog version,
+which product, category and review changes bump (see ``signals.py``).
+"""
+import hashlib
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Substr
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from categories.models import PATH_STEP, Category
+from categories.tree import resolve_category
+from ecommerce.cache import get_version
+from ecommerce.mixins import split_param
+
+CATALOG_NAMESPACE = 'catalog'
+FACET_TIMEOUT = 60 * 5
+
+
+class Facet:
+    name = None
+    # filter parameters ignored when counting this facet
+    exclude_params = ()
+
+    def counts(self, queryset, params):
+        raise NotImplementedError
+
+
+class PriceFacet(Facet):
+    name = 'price'
+    exclude_params = ('min_price', 'max_price')
+    buckets = (0, 25, 50, 100, 250, 500, None)
+
+    def counts(self, queryset, params):
+        ranges = list(zip(self.buckets, self.buckets[1:]))
+        aggregates = {}
+        for index, (low, high) in enumerate(ranges):
+            condition = Q(price__gte=low)
+            if high is not None:
+                condition &= Q(price__lt=high)
+            aggregates[f'bucket_{index}'] = Count('pk', filter=condition)
+        totals = queryset.aggregate(**aggregates)
+        return [
+            {'min': Decimal(low), 'max': Decimal(high) if high is not None else None,
+             'count': totals[f'bucket_{index}']}
+            for index, (low, high) in enumerate(ranges)
+        ]
+
+
+class RatingFacet(Facet):
+    name = 'rating'
+    exclude_params = ('min_rating',)
+    thresholds = (4, 3, 2, 1)
+
+    def counts(self, queryset, params):
+        totals = queryset.with_rating().aggregate(**{
+            f'rating_{value}': Count('pk', filter=Q(rating__gte=value)) for value in self.thresholds
+        })
+        return [{'min_rating': value, 'count': totals[f'rating_{value}']} for value in self.thresholds]
+
+
+class CategoryFacet(Facet):
+    name = 'category'
+
+    def counts(self, queryset, params):
+        value = params.get('category')
+        depth = 0
+        if value:
+            selected = resolve_category(value)
+            if selected is None:
+                return []
+            depth = selected[1] + 1
+
+        prefix_length = (depth + 1) * PATH_STEP
+        rows = (
+            queryset.filter(category__depth__gte=depth)
+            .annotate(branch=Substr('category__path', 1, prefix_length))
+            .order_by().values('branch').annotate(count=Count('pk'))
+        )
+        counts = {row['branch']: row['count'] for row in rows}
+        names = Category.objects.filter(path__in=counts).values_list('path', 'pk', 'name')
+        return sorted(
+            ({'id': pk, 'name': name, 'count': counts[path]} for path, pk, name in names),
+            key=lambda item: (-item['count'], item['name']),
+        )
+
+
+class FacetEngine:
+
+    def __init__(self, *facets, timeout=FACET_TIMEOUT):
+        self.facets = {facet.name: facet for facet in facets}
+        self.timeout = timeout
+
+    def requested(self, request):
+        """Facet names from ``?facets=price,category`` (``all`` for every facet)."""
+        names = split_param(request.query_params.get('facets'))
+        if 'all' in names:
+            return tuple(self.facets)
+        unknown = [name for name in names if name not in self.facets]
+        if unknown:
+            raise ValidationError({'facets': [f"Unknown facet: {name}" for name in unknown]})
+        return names
+
+    def filter_params(self, view):
+        filterset_class = getattr(view, 'filterset_class', None)
+        names = set(filterset_class.base_filters) if filterset_class else set()
+        names.update(getattr(backend, 'search_param', None) for backend in view.filter_backends)
+        params = view.request.query_params
+        return {name: params[name] for name in sorted(names - {None}) if params.get(name)}
+
+    def signature(self, view, names):
+        params = self.filter_params(view)
+        raw = repr((view.__class__.__name__, names, sorted(params.items()), get_version(CATALOG_NAMESPACE)))
+        return 'facets:' + hashlib.sha1(raw.encode()).hexdigest()
+
+    def queryset(self, view, params):
+        queryset = view.get_queryset().order_by()
+        for backend in view.filter_backends:
+            if issubclass(backend, DjangoFilterBackend):
+                filterset = view.filterset_class(params, queryset=queryset, request=view.request)
+                queryset = filterset.qs
+            elif not issubclass(backend, filters.OrderingFilter):
+                queryset = backend().filter_queryset(view.request, queryset, view)
+        return queryset
+
+    def counts(self, view, names):
+        key = self.signature(view, names)
+        result = cache.get(key)
+        if result is None:
+            params = self.filter_params(view)
+            result = {}
+            for name in names:
+                facet = self.facets[name]
+                facet_params = {k: v for k, v in params.items() if k not in facet.exclude_params}
+                result[name] = facet.counts(self.queryset(view, facet_params), params)
+            cache.set(key, result, self.timeout)
+        return result
+
+
+product_facets = FacetEngine(PriceFacet(), CategoryFacet(), RatingFacet())
+
+
+class FacetedListMixin:
+    """
+    Adds ``facets`` to the paginated list response when ``?facets=`` is
+    given. Must come before the mixin providing ``list()``.
+    """
+    facet_engine = product_facets
+
+    def list(self, request, *args, **kwargs):
+        names = self.facet_engine.requested(request)
+        response = super().list(request, *args, **kwargs)
+        if names and isinstance(response.data, dict):
+            response.data['facets'] = self.facet_engine.counts(self, names)
+        return response
@@ -1,11 +1,25 @@
 import django_filters
+from categories.models import subtree_q
+from categories.tree import resolve_category
 from .models import Product
 
 class ProductFilter(django_filters.FilterSet):
     min_price = django_filters.NumberFilter(field_name="price", lookup_expr='gte')
     max_price = django_filters.NumberFilter(field_name="price", lookup_expr='lte')
-    category = django_filters.CharFilter(field_name="category__name", lookup_expr='iexact')
+    # id or name of a category; matches products in that category and all its descendants
+    category = django_filters.CharFilter(method='filter_category')
+    # average rating of the approved reviews
+    min_rating = django_filters.NumberFilter(method='filter_min_rating', min_value=1, max_value=5)
 
     class Meta:
         model = Product
-        fields = ['category', 'min_price', 'max_price']
+        fields = ['category', 'min_price', 'max_price', 'min_rating']
+
+    def filter_category(self, queryset, name, value):
+        category = resolve_category(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(subtree_q(category[0], prefix='category__'))
+
+    def filter_min_rating(self, queryset, name, value):
+        return queryset.with_rating().filter(rating__gte=value)
@@ -0,0 +1,53 @@
+"""
+Rebuild the precomputed product recommendations (``products.recommendations``).
+
+    manage.py build_recommendations
+    manage.py build_recommendations --kind bought --shards 8 --top 20
+
+Run it from cron/a scheduled job; readers keep seeing the previous rows of
+a shard until its replacement is committed.
+"""
+import math
+import time
+
+from django.core.management.base import BaseCommand
+
+from products import recommendations
+from products.models import ProductRecommendation
+
+KINDS = {
+    'bought': ProductRecommendation.BOUGHT_TOGETHER,
+    'wishlisted': ProductRecommendation.ALSO_WISHLISTED,
+}
+# basket rows per shard when --shards is not given
+ROWS_PER_SHARD = 2_000_000
+
+
+class Command(BaseCommand):
+    help = "Recompute 'frequently bought together' and 'also wishlisted' recommendations."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=list(KINDS) + ['all'], default='all')
+        parser.add_argument('--shards', type=int,
+                            help=f"Passes over the data, each counting 1/N of the products "
+                                 f"(default: one per {ROWS_PER_SHARD:,} basket rows).")
+        parser.add_argument('--top', type=int, default=recommendations.TOP_N, help="Neighbours kept per product.")
+        parser.add_argument('--min-score', type=int, default=1, help="Minimum co-occurrence count.")
+        parser.add_argument('--max-basket', type=int, default=recommendations.MAX_BASKET,
+                            help="Ignore baskets with more products than this.")
+        parser.add_argument('--chunk-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        kinds = KINDS.values() if options['kind'] == 'all' else [KINDS[options['kind']]]
+        sources = recommendations.sources()
+        for kind in kinds:
+            shards = options['shards'] or max(1, math.ceil(sources[kind][0].count() / ROWS_PER_SHARD))
+            start = time.perf_counter()
+            pairs, written = recommendations.build(
+                kind, shards=shards, top=options['top'], min_score=options['min_score'],
+                max_basket=options['max_basket'], chunk_size=options['chunk_size'],
+            )
+            self.stdout.write(
+                f"{ProductRecommendation(kind=kind).get_kind_display()}: {pairs} pairs, {written} rows "
+                f"in {shards} shard(s), {time.perf_counter() - start:.1f}s"
+            )
@@ -0,0 +1,84 @@
+"""
+Rename product images uploaded before ``HashedMediaStorage`` to their
+content-hashed names (``products/lamp.jpg`` -> ``products/lamp.3f2a9c1b0d4e.jpg``),
+so they are served with far-future ``immutable`` caching as well.
+
+    manage.py hash_product_images
+    manage.py hash_product_images --dry-run --batch-size 500 --keep-old
+
+Each batch of rows is updated in one transaction, a row only while it still
+holds the old name, then the old files no row refers to any more are
+deleted. Images already hashed are skipped, so the
+command can be stopped and run again.
+"""
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ecommerce.cache import bump_version
+from ecommerce.storage import HASHED_NAME
+from products.facets import CATALOG_NAMESPACE
+from products.models import Product
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Rename existing product images to content-hashed names."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--keep-old', action='store_true', help="Keep the files under their old names.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the images to rename.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        field = Product._meta.get_field('image')
+        images = Product.objects.exclude(image='').exclude(image__isnull=True).order_by('pk')
+        renamed = missing = 0
+        last = 0
+        while True:
+            # by primary key ranges rather than one cursor, as rows change under it
+            rows = list(images.filter(pk__gt=last).values_list('pk', 'image')[:options['batch_size']])
+            if not rows:
+                break
+            last = rows[-1][0]
+            batch = []
+            for pk, name in rows:
+                if HASHED_NAME.search(name):
+                    continue
+                if not default_storage.exists(name):
+                    missing += 1
+                    continue
+                batch.append((pk, name))
+            if batch:
+                renamed += self.rename(batch, field, options)
+        if renamed and not options['dry_run']:
+            # cached product rows still carry the old URLs
+            bump_version(CATALOG_NAMESPACE)
+
+        verb = "Would rename" if options['dry_run'] else "Renamed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {renamed} image(s) in {time.perf_counter() - start:.1f}s, {missing} missing file(s) skipped."
+        ))
+
+    def rename(self, batch, field, options):
+        if options['dry_run']:
+            return len(batch)
+        hashed, renamed = {}, 0
+        for pk, name in batch:
+            if name not in hashed:
+                with default_storage.open(name) as content:
+                    hashed[name] = default_storage.save(name, content, max_length=field.max_length)
+        with transaction.atomic():
+            for pk, name in batch:
+                # only where the row still holds the old name: an upload since wins
+                renamed += Product.objects.filter(pk=pk, image=name).update(image=hashed[name])
+        if not options['keep_old']:
+            old = {name for name, new in hashed.items() if new != name}
+            in_use = set(Product.objects.filter(image__in=old).values_list('image', flat=True))
+            for name in old - in_use:
+                default_storage.delete(name)
+        return renamed
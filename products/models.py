@@ -1,4 +1,19 @@
 from django.db import models
+from django.db.models import Avg, OuterRef, Subquery
+
+
+class ProductQuerySet(models.QuerySet):
+
+    def with_rating(self):
+        """Annotate ``rating`` with the average of the approved reviews (``None`` without any)."""
+        from reviews.models import Review
+
+        ratings = (
+            Review.objects.filter(product=OuterRef('pk'), is_approved=True)
+            .order_by().values('product').annotate(average=Avg('rating')).values('average')
+        )
+        return self.annotate(rating=Subquery(ratings, output_field=models.FloatField()))
+
 
 class Product(models.Model):
     name = models.CharField(max_length=255)
@@ -6,8 +21,54 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField()
     image = models.ImageField(upload_to="products/", blank=True, null=True)
+    category = models.ForeignKey(
+        'categories.Category', on_delete=models.SET_NULL, related_name='products', null=True, blank=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        # the list endpoints sort by price (the default) or name; see `manage.py advise_indexes`
+        indexes = [
+            models.Index(fields=['price'], name='product_price_idx'),
+            models.Index(fields=['name'], name='product_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the stock as loaded, to tell threshold crossings on save (notifications.signals)
+        instance._loaded_stock = instance.__dict__.get('stock')
+        return instance
+
+
+class ProductRecommendation(models.Model):
+    """
+    Precomputed neighbours of a product, ``rank`` 0 being the strongest.
+    Rebuilt by ``manage.py build_recommendations``.
+    """
+    BOUGHT_TOGETHER = 'B'
+    ALSO_WISHLISTED = 'W'
+    KIND_CHOICES = [
+        (BOUGHT_TOGETHER, 'Frequently bought together'),
+        (ALSO_WISHLISTED, 'Also wishlisted'),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommendations')
+    kind = models.CharField(max_length=1, choices=KIND_CHOICES)
+    rank = models.PositiveSmallIntegerField()
+    recommended = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    score = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'kind', 'rank'], name='unique_recommendation_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.recommended_id} ({self.kind}{self.rank})"
@@ -0,0 +1,100 @@
+"""
+Item-item co-occurrence behind ``/api/products/<id>/recommendations/``.
+
+A basket is the set of products of one order (``orders.OrderItem``) or of
+one user's wishlist (``wishlist.Wishlist``). Rows are streamed ordered by
+basket, so only one basket is held at a time. Pair counts are kept in a
+``Counter`` keyed by ``anchor << 32 | neighbour`` (one int per pair instead
+of a tuple) and filled with ``Counter.update``, which counts in C.
+
+Memory is bounded by sharding on the anchor product: pass ``s`` of ``n``
+only counts pairs whose anchor satisfies ``anchor % n == s``, keeps the top
+neighbours of those anchors and replaces their rows. More shards mean more
+scans of the basket table but a proportionally smaller counter.
+"""
+import heapq
+from collections import Counter, defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models.functions import Mod
+
+from .models import ProductRecommendation
+
+SHIFT = 32
+MASK = (1 << SHIFT) - 1
+TOP_N = 10
+# baskets larger than this (bulk/B2B orders) would add n² mostly noise pairs
+MAX_BASKET = 50
+
+
+def sources():
+    """``{kind: (rows, basket field)}``."""
+    from orders.models import OrderItem
+    from wishlist.models import Wishlist
+
+    return {
+        ProductRecommendation.BOUGHT_TOGETHER: (OrderItem.objects.exclude(order__status='CANCELLED'), 'order_id'),
+        ProductRecommendation.ALSO_WISHLISTED: (Wishlist.objects.all(), 'user_id'),
+    }
+
+
+def baskets(queryset, group, chunk_size=10000, max_basket=MAX_BASKET):
+    """Sorted distinct product ids per basket, for baskets of 2..max_basket products."""
+    rows = queryset.order_by(group).values_list(group, 'product_id').iterator(chunk_size=chunk_size)
+    for _, items in groupby(rows, key=itemgetter(0)):
+        products = sorted({product for _, product in items})
+        if 1 < len(products) <= max_basket:
+            yield products
+
+
+def count_pairs(baskets, shard=0, shards=1):
+    counts = Counter()
+    for products in baskets:
+        anchors = [product for product in products if product % shards == shard]
+        if anchors:
+            counts.update(
+                anchor << SHIFT | neighbour
+                for anchor in anchors for neighbour in products if neighbour != anchor
+            )
+    return counts
+
+
+def top_neighbours(counts, top=TOP_N, min_score=1):
+    """``{anchor: [(neighbour, score), ...]}``, best first, ties broken by the lower id."""
+    grouped = defaultdict(list)
+    for key, score in counts.items():
+        if score >= min_score:
+            grouped[key >> SHIFT].append((score, -(key & MASK)))
+    return {
+        anchor: [(-negated, score) for score, negated in heapq.nlargest(top, pairs)]
+        for anchor, pairs in grouped.items()
+    }
+
+
+def store(kind, neighbours, shard=0, shards=1, batch_size=5000):
+    """Replace the ``kind`` rows of every anchor in the shard."""
+    rows = (
+        ProductRecommendation(product_id=anchor, kind=kind, rank=rank, recommended_id=neighbour, score=score)
+        for anchor, ranked in neighbours.items()
+        for rank, (neighbour, score) in enumerate(ranked)
+    )
+    with transaction.atomic():
+        (ProductRecommendation.objects.filter(kind=kind)
+         .alias(shard=Mod('product_id', shards)).filter(shard=shard).delete())
+        ProductRecommendation.objects.bulk_create(rows, batch_size=batch_size)
+
+
+def build(kind, shards=1, top=TOP_N, min_score=1, max_basket=MAX_BASKET, chunk_size=10000):
+    """Rebuild the recommendations of ``kind``; returns ``(pairs counted, rows written)``."""
+    queryset, group = sources()[kind]
+    pairs = written = 0
+    for shard in range(shards):
+        counts = count_pairs(baskets(queryset, group, chunk_size, max_basket), shard, shards)
+        pairs += len(counts)
+        neighbours = top_neighbours(counts, top, min_score)
+        del counts
+        store(kind, neighbours, shard, shards)
+        written += sum(len(ranked) for ranked in neighbours.values())
+    return pairs, written
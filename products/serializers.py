@@ -1,7 +1,12 @@
 from rest_framework import serializers
 from .models import Product
+from ecommerce.serializers import ValuesSerializer
 
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = "__all__"
+
+class ProductValuesSerializer(ValuesSerializer):
+    class Meta:
+        serializer = ProductSerializer
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.models import Category
+from ecommerce.cache import bump_version
+from reviews.models import Review
+
+from .facets import CATALOG_NAMESPACE
+from .models import Product
+from .suggest import suggester
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog(sender, **kwargs):
+    # after the commit, so a concurrent read cannot cache the old catalog under the new version
+    transaction.on_commit(bump_catalog_version)
+
+
+def bump_catalog_version():
+    bump_version(CATALOG_NAMESPACE)
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_catalog_review(sender, instance, **kwargs):
+    # a pending review was never part of the catalog
+    if instance.is_approved:
+        transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Review)
+def invalidate_catalog_ratings(sender, instance, created, **kwargs):
+    # helpful votes and comment edits leave ratings and popularity alone
+    state, loaded = instance.catalog_state(), getattr(instance, '_loaded_catalog', None)
+    instance._loaded_catalog = state
+    if created and not instance.is_approved or state == loaded:
+        return
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+def index_suggestion(sender, instance, **kwargs):
+    suggester.record(kind_of(sender), instance.pk, instance.name)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+def unindex_suggestion(sender, instance, **kwargs):
+    suggester.record(kind_of(sender), instance.pk, None)
+
+
+def kind_of(sender):
+    return 'products' if sender is Product else 'categories'
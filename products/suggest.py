@@ -0,0 +1,322 @@
+"""
+In-process prefix index behind ``/api/products/suggest/``.
+
+``PrefixIndex`` is built once from ``(id, name)`` pairs ordered by
+popularity, so an entry's position is its rank and "top-k" is simply "the k
+smallest entry numbers". It holds:
+
+* ``terms``: the sorted distinct tokens of all names. A prefix maps to a
+  contiguous range of it, found with two bisections.
+* per term postings: every entry number containing that token, best
+  first, as 4-byte integers; single-prefix lookups only read the first
+  ``TOP_K`` of them.
+* ``heavy``: for prefixes matching more than ``RANGE_LIMIT`` terms (short
+  prefixes such as ``"s"``), the precomputed top ``TOP_K`` entries, so no
+  lookup ever merges more than ``RANGE_LIMIT`` postings.
+* names packed into one string with an offsets array, and ids in a sorted
+  array for ``id -> entry`` lookups: a few bytes per entry instead of a
+  Python object each.
+
+``Suggester`` owns the live indexes. Local writes land in a small overlay
+(see ``signals.py``) that is consulted on every lookup; changes made by
+other workers are picked up by a background rebuild when the catalog
+version moves, at most once per ``SUGGEST_REBUILD_INTERVAL``. Rebuilds run
+in a thread and swap the new index in with a single assignment.
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from array import array
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Count
+
+from ecommerce.cache import get_version
+
+from .facets import CATALOG_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 32
+RANGE_LIMIT = 64
+OVERLAY_LIMIT = 1000
+MAX_CHAR = '\U0010ffff'
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def normalize(text):
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+class PrefixIndex:
+
+    def __init__(self, entries):
+        """``entries``: ``(id, name)`` pairs, most popular first."""
+        self.ids = array('q')
+        self.offsets = array('Q', [0])
+        postings = {}
+        chunks, length = [], 0
+        for entry, (pk, name) in enumerate(entries):
+            self.ids.append(pk)
+            chunks.append(name)
+            length += len(name)
+            self.offsets.append(length)
+            for token in set(tokenize(name)):
+                posting = postings.get(token)
+                if posting is None:
+                    postings[token] = array('I', [entry])
+                else:
+                    posting.append(entry)
+        self.names = ''.join(chunks)
+
+        self.terms = sorted(postings)
+        self.posting_offsets = array('Q', [0])
+        self.postings = array('I')
+        for term in self.terms:
+            self.postings.extend(postings[term])
+            self.posting_offsets.append(len(self.postings))
+        del postings, chunks
+        # slices without copies
+        self.postings_view = memoryview(self.postings)
+
+        order = sorted(range(len(self.ids)), key=self.ids.__getitem__)
+        self.sorted_ids = array('q', (self.ids[entry] for entry in order))
+        self.sorted_entries = array('l', order)
+
+        self.heavy = {}
+        if self.terms:
+            self.collect_heavy('', 0, len(self.terms))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def posting(self, term_index, limit=TOP_K):
+        start, end = self.posting_offsets[term_index], self.posting_offsets[term_index + 1]
+        return self.postings_view[start:end if limit is None else min(end, start + limit)]
+
+    def entries(self, span):
+        """Every entry with a token in ``terms[lo:hi]``, best first."""
+        previous = None
+        for entry in heapq.merge(*(self.posting(i, None) for i in range(*span))):
+            # an entry with several tokens of the range
+            if entry != previous:
+                previous = entry
+                yield entry
+
+    def merge(self, lists):
+        top, seen = [], set()
+        for entry in heapq.merge(*lists):
+            if entry not in seen:
+                seen.add(entry)
+                top.append(entry)
+                if len(top) == TOP_K:
+                    break
+        return top
+
+    def collect_heavy(self, prefix, lo, hi):
+        """Top entries of ``terms[lo:hi]`` (all starting with ``prefix``), storing heavy prefixes."""
+        if hi - lo <= RANGE_LIMIT:
+            return self.merge([self.posting(i) for i in range(lo, hi)])
+
+        terms, depth, lists, i = self.terms, len(prefix), [], lo
+        while i < hi and len(terms[i]) == depth:
+            lists.append(self.posting(i))
+            i += 1
+        while i < hi:
+            child = prefix + terms[i][depth]
+            end = bisect.bisect_left(terms, child + MAX_CHAR, i, hi)
+            lists.append(self.collect_heavy(child, i, end))
+            i = end
+        top = self.merge(lists)
+        if prefix:
+            self.heavy[prefix] = array('l', top)
+        return top
+
+    def term_range(self, prefix):
+        lo = bisect.bisect_left(self.terms, prefix)
+        return lo, bisect.bisect_left(self.terms, prefix + MAX_CHAR, lo)
+
+    def top(self, prefix, span=None):
+        lo, hi = span or self.term_range(prefix)
+        if hi - lo > RANGE_LIMIT:
+            return self.heavy[prefix]
+        return self.merge([self.posting(i) for i in range(lo, hi)])
+
+    def name(self, entry):
+        return self.names[self.offsets[entry]:self.offsets[entry + 1]]
+
+    def entry_of(self, pk):
+        position = bisect.bisect_left(self.sorted_ids, pk)
+        if position < len(self.sorted_ids) and self.sorted_ids[position] == pk:
+            return self.sorted_entries[position]
+        return None
+
+    def search(self, tokens, limit, overlay=None):
+        """
+        ``(id, name)`` of the best entries whose tokens start with every
+        query token. A single token is answered from the top entries of its
+        prefix; with several, candidates are all the entries of the most
+        selective one, scanned best first until ``limit`` match, so whatever
+        the word order nothing is missed. The overlay replaces or hides
+        entries changed since the build and adds new ones.
+        """
+        overlay = overlay or {}
+        spans = [(self.term_range(token), token) for token in tokens]
+        span, token = min(spans, key=lambda item: item[0][1] - item[0][0])
+        if span[1] == span[0]:
+            candidates = []
+        elif len(tokens) == 1:
+            candidates = self.top(token, span)
+        else:
+            candidates = self.entries(span)
+
+        results = []
+        for entry in candidates:
+            pk = self.ids[entry]
+            if pk in overlay:
+                continue
+            name = self.name(entry)
+            if len(tokens) == 1 or matches(tokens, name):
+                results.append((entry, pk, name))
+                if len(results) == limit:
+                    break
+
+        for pk, (sequence, name) in list(overlay.items()):
+            if name is not None and matches(tokens, name):
+                entry = self.entry_of(pk)
+                results.append((len(self.ids) + sequence if entry is None else entry, pk, name))
+        results.sort()
+        return [(pk, name) for _, pk, name in results[:limit]]
+
+
+def matches(tokens, name):
+    words = tokenize(name)
+    return all(any(word.startswith(token) for word in words) for token in tokens)
+
+
+def product_entries(limit):
+    from reviews.models import Review
+    from .models import Product
+
+    popularity = dict(
+        Review.objects.filter(is_approved=True).order_by().values_list('product').annotate(count=Count('pk'))
+    )
+    rows = list(Product.objects.order_by().values_list('pk', 'name').iterator(chunk_size=10000))
+    rows.sort(key=lambda row: (-popularity.get(row[0], 0), row[0]))
+    return rows[:limit]
+
+
+def category_entries(limit):
+    from categories.models import Category
+
+    rows = Category.objects.annotate(count=Count('products')).order_by('-count', 'pk').values_list('pk', 'name')
+    return list(rows[:limit])
+
+
+class Suggester:
+    sources = {
+        'products': product_entries,
+        'categories': category_entries,
+    }
+
+    def __init__(self):
+        self.indexes = None
+        self.overlays = {kind: {} for kind in self.sources}
+        self.sequence = 0
+        self.version = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+        self.building = False
+
+    @property
+    def ready(self):
+        return self.indexes is not None
+
+    def build(self):
+        """Build new indexes from the database and swap them in."""
+        version = get_version(CATALOG_NAMESPACE)
+        with self.lock:
+            sequence = self.sequence
+        limit = settings.SUGGEST_MAX_ENTRIES
+        indexes = {kind: PrefixIndex(source(limit)) for kind, source in self.sources.items()}
+        with self.lock:
+            # keep the overlay entries recorded while we were building
+            self.overlays = {
+                kind: {pk: item for pk, item in overlay.items() if item[0] > sequence}
+                for kind, overlay in self.overlays.items()
+            }
+            self.indexes, self.version, self.built_at = indexes, version, time.monotonic()
+
+    def build_in_background(self):
+        with self.lock:
+            if self.building:
+                return
+            self.building = True
+
+        def run():
+            try:
+                self.build()
+            except Exception:
+                logger.exception("Building the suggest index failed")
+            finally:
+                self.building = False
+                connection.close()
+
+        threading.Thread(target=run, name='suggest-index', daemon=True).start()
+
+    def refresh_if_stale(self):
+        now = time.monotonic()
+        if now - self.checked_at < 5:
+            return
+        self.checked_at = now
+        overlay_full = any(len(overlay) > OVERLAY_LIMIT for overlay in self.overlays.values())
+        stale = get_version(CATALOG_NAMESPACE) != self.version
+        if overlay_full or (stale and now - self.built_at > settings.SUGGEST_REBUILD_INTERVAL):
+            self.build_in_background()
+
+    def record(self, kind, pk, name):
+        """Note a created/renamed (``name``) or deleted (``None``) entry."""
+        indexes = self.indexes
+        if indexes is not None and name is not None:
+            entry = indexes[kind].entry_of(pk)
+            if entry is not None and indexes[kind].name(entry) == name:
+                return
+        with self.lock:
+            self.sequence += 1
+            self.overlays[kind][pk] = (self.sequence, name)
+
+    def suggest(self, query, limit):
+        """``{kind: [(id, name), ...]}`` or ``None`` while the first build is running."""
+        if self.indexes is None:
+            self.build_in_background()
+            return None
+        self.refresh_if_stale()
+        tokens = tokenize(query)
+        if not tokens:
+            return {kind: [] for kind in self.sources}
+        return {
+            kind: index.search(tokens, limit, self.overlays[kind])
+            for kind, index in self.indexes.items()
+        }
+
+
+suggester = Suggester()
+
+
+def warm_up():
+    """Build the index off the request path (called from gunicorn's post_worker_init)."""
+    close_old_connections()
+    suggester.build_in_background()
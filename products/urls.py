@@ -1,6 +1,10 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import ProductListCreateView, ProductDetailView, ProductViewSet
+from .views import (
+    ProductListCreateView, ProductDetailView, ProductViewSet,
+    AsyncProductListView, AsyncProductDetailView, ProductSuggestView,
+    ProductRecommendationsView, ProductBatchView,
+)
 
 
 router = DefaultRouter()
@@ -8,5 +12,10 @@ router.register(r'products', ProductViewSet)
 
 urlpatterns = [
     path("", ProductListCreateView.as_view(), name="product-list"),
+    path("batch/", ProductBatchView.as_view(), name="product-batch"),
+    path("suggest/", ProductSuggestView.as_view(), name="product-suggest"),
     path("<int:pk>/", ProductDetailView.as_view(), name="product-detail"),
+    path("<int:pk>/recommendations/", ProductRecommendationsView.as_view(), name="product-recommendations"),
+    path("async/", AsyncProductListView.as_view(), name="product-list-async"),
+    path("async/<int:pk>/", AsyncProductDetailView.as_view(), name="product-detail-async"),
 ]
@@ -1,15 +1,29 @@
 from rest_framework import generics, permissions, filters, viewsets
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from categories.models import Category
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Product
-from .serializers import ProductSerializer
+from .models import Product, ProductRecommendation
+from .serializers import ProductSerializer, ProductValuesSerializer
+from .facets import CATALOG_NAMESPACE, FacetedListMixin
 from .filters import ProductFilter
 from .pagination import CustomPagination  
+from .suggest import suggester
+from ecommerce.async_views import AsyncListAPIView, AsyncRetrieveAPIView
+from ecommerce.http_cache import CachePolicy
+from ecommerce.mixins import BatchRetrieveMixin, ValuesListMixin
+from pricing.mixins import EffectivePriceMixin
+
+PRODUCT_CACHE = CachePolicy(public=True, kind='product', related={'category': 'category'}, collection='products')
 
 # List and Create Products
-class ProductListCreateView(generics.ListCreateAPIView):
+class ProductListCreateView(EffectivePriceMixin, FacetedListMixin, ValuesListMixin, generics.ListCreateAPIView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    values_serializer_class = ProductValuesSerializer
     permission_classes = [permissions.AllowAny]
+    cache_policy = PRODUCT_CACHE
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = ProductFilter
     ordering_fields = ['price', 'name']
@@ -26,16 +40,28 @@ class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [permissions.AllowAny]
+    cache_policy = PRODUCT_CACHE
 
     def get_permissions(self):
         if self.request.method in ["PUT", "DELETE"]:
             return [permissions.IsAdminUser()]
         return [permissions.AllowAny()]
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductBatchView(BatchRetrieveMixin, generics.GenericAPIView):
+    """``GET /api/products/batch/?ids=3,1,2``; cached rows expire with the catalog version."""
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    values_serializer_class = ProductValuesSerializer
+    permission_classes = [permissions.AllowAny]
+    cache_policy = PRODUCT_CACHE
+    cache_version = CATALOG_NAMESPACE
+
+class ProductViewSet(EffectivePriceMixin, FacetedListMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    values_serializer_class = ProductValuesSerializer
     permission_classes = [permissions.AllowAny()]  # Admin-only for POST, PUT, DELETE by default
+    cache_policy = PRODUCT_CACHE
     
     # Filtering, Sorting, and Pagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
@@ -49,3 +75,80 @@ class ProductViewSet(viewsets.ModelViewSet):
         if self.request.method in ['POST', 'PUT', 'DELETE']:
             return [permissions.IsAdminUser()]
         return [permissions.AllowAny()]
+
+
+# Async read paths, served by the ASGI workers
+class AsyncProductListView(EffectivePriceMixin, AsyncListAPIView):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    values_serializer_class = ProductValuesSerializer
+    permission_classes = [permissions.AllowAny]
+    cache_policy = PRODUCT_CACHE
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = ProductFilter
+    ordering_fields = ['price', 'name']
+    ordering = ['price']
+    pagination_class = CustomPagination
+
+class AsyncProductDetailView(AsyncRetrieveAPIView):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    permission_classes = [permissions.AllowAny]
+    cache_policy = PRODUCT_CACHE
+
+
+class ProductSuggestView(APIView):
+    """
+    Search-as-you-type: ``?q=red cha`` returns the most popular products and
+    categories whose words start with every query word, from the in-process
+    index in ``products.suggest``. Until the index is built the same lookup
+    is answered by a (slower) ``istartswith`` query.
+    """
+    permission_classes = [permissions.AllowAny]
+    cache_policy = CachePolicy(public=True, keys=('products', 'categories'))
+    authentication_classes = []
+    default_limit = 8
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+
+        results = suggester.suggest(query, limit) if query else {'products': [], 'categories': []}
+        if results is None:
+            results = {
+                'products': Product.objects.filter(name__istartswith=query).values_list('id', 'name')[:limit],
+                'categories': Category.objects.filter(name__istartswith=query).values_list('id', 'name')[:limit],
+            }
+        data = {'query': query}
+        for kind, rows in results.items():
+            data[kind] = [{'id': pk, 'name': name} for pk, name in rows]
+        return Response(data)
+
+
+class ProductRecommendationsView(APIView):
+    """
+    Precomputed "frequently bought together" and "also wishlisted" products
+    (see ``products.recommendations``), read with a single query.
+    """
+    permission_classes = [permissions.AllowAny]
+    cache_policy = CachePolicy(public=True, url_keys={'pk': 'product'})
+    groups = {
+        ProductRecommendation.BOUGHT_TOGETHER: 'bought_together',
+        ProductRecommendation.ALSO_WISHLISTED: 'also_wishlisted',
+    }
+
+    def get(self, request, pk, *args, **kwargs):
+        rows = (
+            ProductRecommendation.objects.filter(product_id=pk).order_by('kind', 'rank')
+            .values_list('kind', 'recommended_id', 'recommended__name', 'recommended__price', 'score')
+        )
+        data = {'product': pk, **{name: [] for name in self.groups.values()}}
+        for kind, product_id, name, price, score in rows:
+            data[self.groups[kind]].append({'id': product_id, 'name': name, 'price': price, 'score': score})
+        if not rows and not Product.objects.filter(pk=pk).exists():
+            raise NotFound()
+        return Response(data)
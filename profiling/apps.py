@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    from .sampler import record_query
+
+    if record_query not in connection.execute_wrappers:
+        # first, so that connection.execute_wrapper() blocks around the connect still pop their own wrapper
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class ProfilingConfig(AppConfig):
+    name = 'profiling'
+
+    def ready(self):
+        if settings.PROFILING_SLOW_MS or settings.PROFILING_SAMPLE_RATE:
+            connection_created.connect(install_query_recorder, dispatch_uid='profiling-query-recorder')
@@ -0,0 +1,64 @@
+"""
+Write the stack samples of the stored captures as collapsed stacks, one
+``frame;frame;frame count`` line per distinct stack, the input format of
+flamegraph.pl, speedscope and inferno:
+
+    manage.py dump_profiles > stacks.txt && flamegraph.pl stacks.txt > flame.svg
+    manage.py dump_profiles --endpoint "GET api/products/" --reason slowest
+    manage.py dump_profiles --id 3f2c... --output one.txt
+    manage.py dump_profiles --list
+
+Stacks of several captures are summed; each stack starts with the endpoint
+as its root frame unless ``--no-endpoint-frame`` is given.
+"""
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from profiling import store
+
+
+class Command(BaseCommand):
+    help = "Dump the sampled stacks of the captured requests as collapsed stacks (flamegraph input)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', help='Only this endpoint, e.g. "GET api/products/<int:pk>/".')
+        parser.add_argument('--reason', choices=store.KINDS, help="Only the slowest or only the sampled captures.")
+        parser.add_argument('--id', dest='capture_id', help="Only this capture.")
+        parser.add_argument('--output', help="Write to this file instead of stdout.")
+        parser.add_argument('--no-endpoint-frame', action='store_true',
+                            help="Do not add the endpoint as the root frame.")
+        parser.add_argument('--list', action='store_true', help="List the captures instead.")
+
+    def handle(self, *args, **options):
+        if options['capture_id']:
+            capture = store.get(options['capture_id'])
+            if capture is None:
+                raise CommandError(f"No capture {options['capture_id']}.")
+            captures = [capture]
+        else:
+            kinds = [options['reason']] if options['reason'] else store.KINDS
+            captures = store.captures(options['endpoint'], kinds)
+
+        if options['list']:
+            for capture in captures:
+                self.stdout.write(
+                    f"{capture['id']}  {capture['duration_ms']:>9.1f} ms  {capture['reason']:<7}  "
+                    f"{capture['query_count']:>4} queries  {capture['samples']:>5} samples  "
+                    f"{capture['status']}  {capture['endpoint']}"
+                )
+            return
+
+        stacks = Counter()
+        for capture in captures:
+            root = '' if options['no_endpoint_frame'] else capture['endpoint'].replace(';', ':') + ';'
+            for stack, count in capture['stacks'].items():
+                stacks[root + stack] += count
+        lines = [f'{stack} {count}' for stack, count in sorted(stacks.items())]
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write('\n'.join(lines) + '\n' if lines else '')
+            self.stderr.write(f"{len(lines)} stacks from {len(captures)} capture(s) written to {options['output']}.")
+        else:
+            for line in lines:
+                self.stdout.write(line)
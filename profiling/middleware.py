@@ -0,0 +1,138 @@
+"""
+Request profiling (see ``sampler.py`` and ``store.py``).
+
+With ``PROFILING_SLOW_MS`` set, every request is stack-sampled and its SQL
+recorded while it runs; requests that end up slower than the threshold are
+stored, the others are dropped. ``PROFILING_SAMPLE_RATE`` picks a share of
+all requests that is additionally run under cProfile (sync requests only)
+and always stored. With both at 0 the middleware removes itself.
+
+Async requests (the async views under ASGI) are timed and their SQL is
+recorded; their stacks are sampled in the ``sync_to_async`` threads that ran
+queries, the event loop thread is shared with other requests and is not.
+"""
+import cProfile
+import logging
+import pstats
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from . import store
+from .sampler import Capture, collapse, current, module_name, sampler
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERIES = 100
+MAX_STACKS = 500
+MAX_FUNCTIONS = 50
+
+
+def profile_rows(profiler, limit=MAX_FUNCTIONS):
+    """The ``limit`` functions with the highest cumulative time."""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: -item[1][3])[:limit]
+    return [
+        {
+            'function': name if filename == '~' else f'{module_name(filename)}:{line}({name})',
+            'calls': calls,
+            'self_ms': round(self_time * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in rows
+    ]
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.slow = settings.PROFILING_SLOW_MS / 1000
+        self.rate = settings.PROFILING_SAMPLE_RATE
+        if not self.slow and not self.rate:
+            raise MiddlewareNotUsed
+        sampler.interval = settings.PROFILING_INTERVAL_MS / 1000
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sampled = self.rate and random.random() < self.rate
+        if not sampled and not self.slow:
+            return self.get_response(request)
+
+        capture = Capture(MAX_QUERIES)
+        token = current.set(capture)
+        # stacks start below this frame
+        capture.watch(threading.get_ident(), ProfilingMiddleware.__call__.__code__)
+        profiler = cProfile.Profile() if sampled else None
+        started_at, started = timezone.now(), time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            duration = time.perf_counter() - started
+            current.reset(token)
+            samples = capture.finish()
+        self.save(request, response, capture, samples, started_at, duration, sampled, profiler)
+        return response
+
+    async def __acall__(self, request):
+        sampled = self.rate and random.random() < self.rate
+        if not sampled and not self.slow:
+            return await self.get_response(request)
+
+        capture = Capture(MAX_QUERIES)
+        token = current.set(capture)
+        started_at, started = timezone.now(), time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            duration = time.perf_counter() - started
+            current.reset(token)
+            samples = capture.finish()
+        self.save(request, response, capture, samples, started_at, duration, sampled)
+        return response
+
+    def save(self, request, response, capture, samples, started_at, duration, sampled, profiler=None):
+        if sampled:
+            kind = 'sampled'
+        elif duration >= self.slow:
+            kind = 'slowest'
+        else:
+            return
+        match = request.resolver_match
+        queries = sorted(capture.queries.items(), key=lambda item: -item[1][1])
+        try:
+            store.add({
+                'endpoint': f"{request.method} {match.route if match else '<unmatched>'}",
+                'path': request.path,
+                'status': response.status_code,
+                'reason': kind,
+                'started_at': started_at.isoformat(),
+                'duration_ms': round(duration * 1000, 2),
+                'query_count': capture.query_count,
+                'sql_ms': round(capture.sql_seconds * 1000, 2),
+                'queries': [
+                    {'sql': sql, 'count': count, 'ms': round(seconds * 1000, 3)}
+                    for sql, (count, seconds) in queries
+                ],
+                'interval_ms': settings.PROFILING_INTERVAL_MS,
+                'samples': sum(samples.values()),
+                'stacks': collapse(samples, MAX_STACKS),
+                'profile': profile_rows(profiler) if profiler is not None else None,
+            }, kind)
+        except Exception:
+            logger.exception("Storing a profiling capture failed")
@@ -0,0 +1,150 @@
+"""
+Stack sampling and SQL recording for the requests being captured.
+
+``sampler`` is a daemon thread that wakes every ``PROFILING_INTERVAL_MS``
+while at least one request is registered, reads ``sys._current_frames()``
+and counts the stack of every registered thread. A stack is kept as a tuple
+of code objects (cheap to hash); frame names are only built for requests
+that end up stored. The thread sleeps on an event while nothing is
+registered, and is restarted lazily in a forked worker.
+
+``record_query`` is installed as an execute wrapper on every database
+connection (see ``apps.py``). It only looks at a context variable unless a
+capture is active, so it follows a request into the ``sync_to_async``
+threads of the async views as well.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+
+# the Capture of the request running in this context, if any
+current = ContextVar('profiling_capture', default=None)
+
+
+class Sampler:
+
+    def __init__(self):
+        self.interval = 0.005
+        # thread ident -> (Counter of stacks, code object the stacks stop at)
+        self.threads = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pid = None
+
+    def add(self, ident, samples, stop=None):
+        with self.lock:
+            if self.pid != os.getpid():
+                # first use in this process (threads do not survive a fork)
+                self.pid = os.getpid()
+                self.wakeup = threading.Event()
+                threading.Thread(target=self.run, name='profiling-sampler', daemon=True).start()
+            self.threads[ident] = (samples, stop)
+            self.wakeup.set()
+
+    def remove(self, idents):
+        with self.lock:
+            for ident in idents:
+                self.threads.pop(ident, None)
+
+    def run(self):
+        wakeup = self.wakeup
+        while True:
+            wakeup.wait()
+            time.sleep(self.interval)
+            threads = dict(self.threads)
+            if not threads:
+                with self.lock:
+                    if not self.threads:
+                        wakeup.clear()
+                continue
+            frames = sys._current_frames()
+            for ident, (samples, stop) in threads.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    samples[stack_of(frame, stop)] += 1
+            del frames
+
+
+def stack_of(frame, stop=None):
+    """Code objects from the outermost frame (below ``stop``) to ``frame``."""
+    codes = []
+    while frame is not None and frame.f_code is not stop:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return tuple(codes)
+
+
+@lru_cache(maxsize=None)
+def module_name(filename):
+    for entry in sorted(sys.path, key=len, reverse=True):
+        if entry and filename.startswith(entry.rstrip(os.sep) + os.sep):
+            filename = filename[len(entry.rstrip(os.sep)) + 1:]
+            break
+    return filename.removesuffix('.py').replace(os.sep, '.')
+
+
+def frame_name(code):
+    return f'{module_name(code.co_filename)}:{code.co_qualname}'
+
+
+def collapse(samples, limit):
+    """``{"a;b;c": count}`` of the ``limit`` most frequent stacks."""
+    return {
+        ';'.join(frame_name(code) for code in stack): count
+        for stack, count in Counter(samples).most_common(limit)
+        if stack
+    }
+
+
+class Capture:
+    """What is recorded for one request while it runs."""
+
+    def __init__(self, max_queries):
+        self.samples = Counter()
+        self.threads = set()
+        self.queries = {}
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.max_queries = max_queries
+
+    def watch(self, ident, stop=None):
+        self.threads.add(ident)
+        sampler.add(ident, self.samples, stop)
+
+    def finish(self):
+        sampler.remove(list(self.threads))
+        # the sampler may still be counting into it
+        return dict(self.samples)
+
+    def add_query(self, sql, seconds):
+        self.query_count += 1
+        self.sql_seconds += seconds
+        entry = self.queries.get(sql)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] += seconds
+        elif len(self.queries) < self.max_queries:
+            self.queries[sql] = [1, seconds]
+
+
+def record_query(execute, sql, params, many, context):
+    capture = current.get()
+    if capture is None:
+        return execute(sql, params, many, context)
+    ident = threading.get_ident()
+    if ident not in capture.threads:
+        # an ORM call of an async view, running in a sync_to_async thread
+        capture.watch(ident)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        capture.add_query(sql, time.perf_counter() - start)
+
+
+sampler = Sampler()
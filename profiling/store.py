@@ -0,0 +1,80 @@
+"""
+Captured requests, kept in the cache so every worker sees them (with
+``REDIS_URL``; LocMem keeps them per process).
+
+Per endpoint (``"GET api/products/<int:pk>/"``) the index holds two bounded
+lists of ``(duration_ms, capture id)``:
+
+* ``slowest``: the ``PROFILING_KEEP`` slowest requests over
+  ``PROFILING_SLOW_MS``, a faster one never displaces a slower one;
+* ``sampled``: the last ``PROFILING_KEEP`` requests picked by
+  ``PROFILING_SAMPLE_RATE`` (ring buffer). Their duration includes the
+  cProfile overhead, which is why they are not ranked with the others.
+
+The captures themselves are stored under their own keys. Updates of the
+index are read-modify-write without a lock: two workers storing at the same
+moment may lose one capture, which is fine for a diagnostic tool.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+INDEX_KEY = 'profiling:index'
+KINDS = ('slowest', 'sampled')
+TIMEOUT = 60 * 60 * 24 * 7
+
+
+def capture_key(capture_id):
+    return f'profiling:capture:{capture_id}'
+
+
+def add(capture, kind):
+    """Store ``capture`` (a dict) if it makes it into its list; returns its id or ``None``."""
+    keep = settings.PROFILING_KEEP
+    index = cache.get(INDEX_KEY) or {}
+    lists = index.setdefault(capture['endpoint'], {name: [] for name in KINDS})
+    entries = lists[kind]
+    duration = capture['duration_ms']
+    if kind == 'slowest' and len(entries) >= keep and duration <= entries[-1][0]:
+        return None
+
+    capture_id = capture['id'] = uuid.uuid4().hex
+    entries.append((duration, capture_id))
+    if kind == 'slowest':
+        entries.sort(key=lambda entry: -entry[0])
+        evicted, lists[kind] = entries[keep:], entries[:keep]
+    else:
+        evicted, lists[kind] = entries[:-keep], entries[-keep:]
+
+    cache.set(capture_key(capture_id), capture, TIMEOUT)
+    cache.set(INDEX_KEY, index, TIMEOUT)
+    if evicted:
+        cache.delete_many([capture_key(evicted_id) for _, evicted_id in evicted])
+    return capture_id
+
+
+def get(capture_id):
+    return cache.get(capture_key(capture_id))
+
+
+def endpoints():
+    """``{endpoint: {'slowest': [(duration_ms, id)], 'sampled': [...]}}``"""
+    return cache.get(INDEX_KEY) or {}
+
+
+def captures(endpoint=None, kinds=KINDS):
+    """The stored captures of ``endpoint`` (all by default), slowest first."""
+    ids = [
+        capture_id
+        for name, lists in endpoints().items() if endpoint in (None, name)
+        for kind in kinds
+        for _, capture_id in lists[kind]
+    ]
+    found = cache.get_many([capture_key(capture_id) for capture_id in ids])
+    return sorted(found.values(), key=lambda capture: -capture['duration_ms'])
+
+
+def clear():
+    ids = [capture_id for lists in endpoints().values() for entries in lists.values() for _, capture_id in entries]
+    cache.delete_many([capture_key(capture_id) for capture_id in ids] + [INDEX_KEY])
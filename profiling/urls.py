@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import CaptureDetailView, CaptureListView
+
+urlpatterns = [
+    path('', CaptureListView.as_view(), name='profiling-captures'),
+    path('<str:capture_id>/', CaptureDetailView.as_view(), name='profiling-capture'),
+]
@@ -0,0 +1,45 @@
+from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import store
+
+SUMMARY_FIELDS = ('id', 'endpoint', 'path', 'status', 'reason', 'started_at', 'duration_ms', 'query_count', 'sql_ms')
+
+
+class CaptureListView(APIView):
+    """
+    Stored captures, slowest first, without their stacks and SQL (``?endpoint=``
+    to restrict to one endpoint, ``?reason=slowest|sampled``). ``DELETE``
+    drops all of them.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        reason = request.query_params.get('reason')
+        captures = store.captures(
+            request.query_params.get('endpoint'), kinds=[reason] if reason in store.KINDS else store.KINDS
+        )
+        return Response({
+            'endpoints': {
+                endpoint: {kind: len(entries) for kind, entries in lists.items()}
+                for endpoint, lists in store.endpoints().items()
+            },
+            'captures': [{field: capture[field] for field in SUMMARY_FIELDS} for capture in captures],
+        })
+
+    def delete(self, request, *args, **kwargs):
+        store.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CaptureDetailView(APIView):
+    """One capture with its collapsed stacks, SQL and cProfile functions."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, capture_id, *args, **kwargs):
+        capture = store.get(capture_id)
+        if capture is None:
+            raise NotFound()
+        return Response(capture)
@@ -0,0 +1,39 @@
+from django.contrib import admin
+from .models import PaymentRollup, ProductSalesRollup, SalesRollup, Watermark
+
+
+class RollupAdmin(admin.ModelAdmin):
+    """Rollups are derived data: browse only, rebuild with ``backfill_reports``."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(RollupAdmin):
+    list_display = ['start', 'period', 'status', 'orders', 'revenue']
+    list_filter = ['period', 'status']
+    date_hierarchy = 'start'
+
+
+@admin.register(PaymentRollup)
+class PaymentRollupAdmin(RollupAdmin):
+    list_display = ['start', 'period', 'payment_method', 'payments', 'completed', 'failed', 'amount']
+    list_filter = ['period', 'payment_method']
+    date_hierarchy = 'start'
+
+
+@admin.register(ProductSalesRollup)
+class ProductSalesRollupAdmin(RollupAdmin):
+    list_display = ['day', 'product', 'units', 'revenue']
+    list_select_related = ['product']
+    raw_id_fields = ['product']
+    date_hierarchy = 'day'
+
+
+@admin.register(Watermark)
+class WatermarkAdmin(admin.ModelAdmin):
+    list_display = ['name', 'value', 'refreshed_at']
@@ -0,0 +1,33 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+import django_filters
+from .models import PaymentRollup, Period, SalesRollup
+
+
+def day_start(value):
+    return datetime.combine(value, time.min, tzinfo=dt_timezone.utc)
+
+
+class RollupFilter(django_filters.FilterSet):
+    period = django_filters.ChoiceFilter(choices=Period.choices)
+    # inclusive range of UTC days
+    start = django_filters.DateFilter(method='filter_start')
+    end = django_filters.DateFilter(method='filter_end')
+
+    def filter_start(self, queryset, name, value):
+        return queryset.filter(start__gte=day_start(value))
+
+    def filter_end(self, queryset, name, value):
+        return queryset.filter(start__lt=day_start(value) + timedelta(days=1))
+
+
+class SalesRollupFilter(RollupFilter):
+    class Meta:
+        model = SalesRollup
+        fields = ['period', 'start', 'end', 'status']
+
+
+class PaymentRollupFilter(RollupFilter):
+    class Meta:
+        model = PaymentRollup
+        fields = ['period', 'start', 'end', 'payment_method']
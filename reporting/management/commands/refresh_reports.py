@@ -0,0 +1,34 @@
+"""
+Fold order/payment changes since the last run into the reporting rollups.
+
+    manage.py refresh_reports                  # once, e.g. from cron every minute
+    manage.py refresh_reports --interval 60    # as a long-running worker
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reporting import rollups
+
+
+class Command(BaseCommand):
+    help = "Incrementally refresh the sales/payment/product rollups from the updated_at watermark."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lag', type=int, default=int(rollups.LAG.total_seconds()),
+                            help="Ignore changes younger than this many seconds (default: %(default)s).")
+        parser.add_argument('--interval', type=int, help="Keep running, refreshing every N seconds.")
+
+    def handle(self, *args, **options):
+        lag = timedelta(seconds=options['lag'])
+        while True:
+            start = time.perf_counter()
+            days = rollups.refresh(lag=lag)
+            self.stdout.write(f"Recomputed {len(days)} day(s) in {time.perf_counter() - start:.2f}s"
+                              + (f": {days[0]} .. {days[-1]}" if days else "."))
+            if not options['interval']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
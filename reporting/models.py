@@ -0,0 +1,70 @@
+from django.db import models
+from orders.models import Order
+from payments.models import Payment
+
+
+class Period(models.TextChoices):
+    HOUR = 'hour', 'Hour'
+    DAY = 'day', 'Day'
+
+
+class SalesRollup(models.Model):
+    """Orders created in ``[start, start + period)`` with a given status."""
+    period = models.CharField(max_length=4, choices=Period.choices)
+    start = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    orders = models.PositiveIntegerField()
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'start', 'status'], name='unique_sales_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.start:%Y-%m-%d %H:%M} {self.status}: {self.orders}"
+
+
+class PaymentRollup(models.Model):
+    """Payments created in ``[start, start + period)`` with a given method."""
+    period = models.CharField(max_length=4, choices=Period.choices)
+    start = models.DateTimeField()
+    payment_method = models.CharField(max_length=20, choices=Payment.PAYMENT_METHOD_CHOICES)
+    payments = models.PositiveIntegerField()
+    completed = models.PositiveIntegerField()
+    failed = models.PositiveIntegerField()
+    amount = models.DecimalField(max_digits=14, decimal_places=2)  # completed payments only
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'start', 'payment_method'], name='unique_payment_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.start:%Y-%m-%d %H:%M} {self.payment_method}: {self.payments}"
+
+
+class ProductSalesRollup(models.Model):
+    """Units of a product in the orders (not cancelled) created on ``day``."""
+    day = models.DateField()
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='+')
+    units = models.PositiveIntegerField()
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'product'], name='unique_product_sales_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.product_id}: {self.units}"
+
+
+class Watermark(models.Model):
+    """Highest source ``updated_at`` already folded into the rollups."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
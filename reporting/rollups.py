@@ -0,0 +1,159 @@
+"""
+Incremental sales rollups.
+
+Every rollup row belongs to the UTC day its source rows were created on
+(hour rows included). A refresh finds the orders and payments whose
+``updated_at`` moved past the watermark, collects the days they were
+*created* on and recomputes those days from scratch. Recomputing whole days
+keeps status changes right (an order going from PENDING to COMPLETED leaves
+one bucket and enters another) and costs one indexed scan of that day's
+rows, so a refresh is O(rows of the touched days) and a dashboard read is
+O(days). Orders and payments moved to the archive tables
+(``orders/archive.py``) still count towards the day they were created on.
+
+Only rows whose ``updated_at`` is at least ``LAG`` old are picked up, so a
+transaction committing shortly after it stamped ``updated_at`` is not
+skipped. Deletes do not move any watermark: run ``backfill_reports`` over
+the affected days after bulk deletions.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from orders.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+from payments.models import ArchivedPayment, Payment
+
+from .models import PaymentRollup, Period, ProductSalesRollup, SalesRollup, Watermark
+
+WATERMARK = 'sales'
+LAG = timedelta(seconds=30)
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+ZERO = Decimal('0.00')
+
+
+def day_bounds(day):
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def sales_rows(start, end):
+    hourly, daily = defaultdict(lambda: [0, ZERO]), defaultdict(lambda: [0, ZERO])
+    for model in (Order, ArchivedOrder):
+        rows = (
+            model.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .order_by().values('bucket', 'status')
+            .annotate(count=Count('pk'), total=Sum('total_amount'))
+        )
+        for row in rows:
+            for totals in (hourly[row['bucket'], row['status']], daily[row['status']]):
+                totals[0] += row['count']
+                totals[1] += row['total'] or ZERO
+    return [
+        SalesRollup(period=Period.HOUR, start=bucket, status=status, orders=count, revenue=revenue)
+        for (bucket, status), (count, revenue) in hourly.items()
+    ] + [
+        SalesRollup(period=Period.DAY, start=start, status=status, orders=count, revenue=revenue)
+        for status, (count, revenue) in daily.items()
+    ]
+
+
+def payment_rows(start, end):
+    hourly, daily = defaultdict(lambda: [0, 0, 0, ZERO]), defaultdict(lambda: [0, 0, 0, ZERO])
+    for model in (Payment, ArchivedPayment):
+        rows = (
+            model.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .order_by().values('bucket', 'payment_method')
+            .annotate(
+                count=Count('pk'),
+                completed=Count('pk', filter=Q(status='COMPLETED')),
+                failed=Count('pk', filter=Q(status='FAILED')),
+                total=Sum('amount', filter=Q(status='COMPLETED')),
+            )
+        )
+        for row in rows:
+            values = [row['count'], row['completed'], row['failed'], row['total'] or ZERO]
+            for totals in (hourly[row['bucket'], row['payment_method']], daily[row['payment_method']]):
+                for index, value in enumerate(values):
+                    totals[index] += value
+    return [
+        PaymentRollup(period=Period.HOUR, start=bucket, payment_method=method,
+                      payments=count, completed=completed, failed=failed, amount=amount)
+        for (bucket, method), (count, completed, failed, amount) in hourly.items()
+    ] + [
+        PaymentRollup(period=Period.DAY, start=start, payment_method=method,
+                      payments=count, completed=completed, failed=failed, amount=amount)
+        for method, (count, completed, failed, amount) in daily.items()
+    ]
+
+
+def product_rows(day, start, end):
+    totals = defaultdict(lambda: [0, ZERO])
+    for model in (OrderItem, ArchivedOrderItem):
+        rows = (
+            model.objects.filter(order__created_at__gte=start, order__created_at__lt=end)
+            .exclude(order__status='CANCELLED')
+            .order_by().values('product')
+            .annotate(count=Sum('quantity'), total=Sum(F('quantity') * F('unit_price')))
+        )
+        for row in rows:
+            totals[row['product']][0] += row['count']
+            totals[row['product']][1] += row['total'] or ZERO
+    return [
+        ProductSalesRollup(day=day, product_id=product, units=units, revenue=revenue)
+        for product, (units, revenue) in totals.items()
+    ]
+
+
+def recompute_day(day):
+    """Replace every rollup row of ``day`` (a ``date``, UTC)."""
+    start, end = day_bounds(day)
+    sales, payments, products = sales_rows(start, end), payment_rows(start, end), product_rows(day, start, end)
+    with transaction.atomic():
+        for model, rows in ((SalesRollup, sales), (PaymentRollup, payments)):
+            for period in Period.values:
+                model.objects.filter(period=period, start__gte=start, start__lt=end).delete()
+            model.objects.bulk_create(rows)
+        ProductSalesRollup.objects.filter(day=day).delete()
+        ProductSalesRollup.objects.bulk_create(products, batch_size=5000)
+
+
+def changed_days(since, until):
+    days = set()
+    for model in (Order, Payment):
+        days.update(
+            model.objects.filter(updated_at__gt=since, updated_at__lte=until)
+            .annotate(day=TruncDate('created_at', tzinfo=dt_timezone.utc))
+            .order_by().values_list('day', flat=True).distinct()
+        )
+    return sorted(days)
+
+
+def refresh(now=None, lag=LAG):
+    """Fold the changes since the watermark into the rollups; returns the recomputed days."""
+    until = (now or timezone.now()) - lag
+    watermark, _ = Watermark.objects.get_or_create(name=WATERMARK, defaults={'value': EPOCH})
+    if watermark.value >= until:
+        return []
+    days = changed_days(watermark.value, until)
+    for day in days:
+        recompute_day(day)
+    # never move backwards if a slower refresh finishes after us
+    Watermark.objects.filter(name=WATERMARK, value__lt=until).update(value=until, refreshed_at=timezone.now())
+    return days
+
+
+def backfill(first_day, last_day):
+    """Recompute every day of ``[first_day, last_day]``; returns the number of days."""
+    day, count = first_day, 0
+    while day <= last_day:
+        recompute_day(day)
+        day += timedelta(days=1)
+        count += 1
+    return count
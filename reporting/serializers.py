@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from .models import PaymentRollup, SalesRollup
+
+
+class SalesRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SalesRollup
+        fields = ['period', 'start', 'status', 'orders', 'revenue']
+
+
+class PaymentRollupSerializer(serializers.ModelSerializer):
+    # share of the settled (completed or failed) payments that completed
+    success_rate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PaymentRollup
+        fields = ['period', 'start', 'payment_method', 'payments', 'completed', 'failed', 'amount', 'success_rate']
+
+    def get_success_rate(self, obj):
+        settled = obj.completed + obj.failed
+        return round(obj.completed / settled, 4) if settled else None
+
+
+class ProductSalesSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    name = serializers.CharField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
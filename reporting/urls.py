@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import PaymentReportView, ProductSalesReportView, SalesReportView
+
+urlpatterns = [
+    path('sales/', SalesReportView.as_view(), name='report-sales'),
+    path('payments/', PaymentReportView.as_view(), name='report-payments'),
+    path('products/', ProductSalesReportView.as_view(), name='report-products'),
+]
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.db.models import F, Sum
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .filters import PaymentRollupFilter, SalesRollupFilter, day_start
+from .models import PaymentRollup, Period, ProductSalesRollup, SalesRollup
+from .serializers import PaymentRollupSerializer, ProductSalesSerializer, SalesRollupSerializer
+
+DEFAULT_DAYS = 30
+
+
+def default_range(request):
+    """``(first day, last day)`` from ``?start=&end=``, the last 30 days by default."""
+    filterset = SalesRollupFilter(request.query_params)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    data = filterset.form.cleaned_data
+    last = data.get('end') or timezone.now().date()
+    return data.get('start') or last - timedelta(days=DEFAULT_DAYS - 1), last
+
+
+class RollupListView(generics.ListAPIView):
+    """
+    Rollup rows of one ``?period=`` (``day`` by default) between ``?start=``
+    and ``?end=`` (inclusive UTC days, the last 30 days by default).
+    Refreshed by ``manage.py refresh_reports``.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = None
+    model = None
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = self.model.objects.filter(period=params.get('period') or Period.DAY)
+        if not params.get('start'):
+            first, _ = default_range(self.request)
+            queryset = queryset.filter(start__gte=day_start(first))
+        return queryset.order_by('start')
+
+
+class SalesReportView(RollupListView):
+    model = SalesRollup
+    serializer_class = SalesRollupSerializer
+    filterset_class = SalesRollupFilter
+
+
+class PaymentReportView(RollupListView):
+    model = PaymentRollup
+    serializer_class = PaymentRollupSerializer
+    filterset_class = PaymentRollupFilter
+
+
+class ProductSalesReportView(APIView):
+    """Best selling products between ``?start=`` and ``?end=`` (``?limit=``, 20 by default)."""
+    permission_classes = [permissions.IsAdminUser]
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        first, last = default_range(request)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': ["A valid integer is required."]})
+        rows = (
+            ProductSalesRollup.objects.filter(day__gte=first, day__lte=last)
+            .values('product').annotate(name=F('product__name'), units=Sum('units'), revenue=Sum('revenue'))
+            .order_by('-units', 'product')[:limit]
+        )
+        return Response({
+            'start': first,
+            'end': last,
+            'products': ProductSalesSerializer(rows, many=True).data,
+        })
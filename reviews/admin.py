@@ -1,8 +1,23 @@
 from django.contrib import admin
+
+from ecommerce.admin_tools import FastAdmin
 from .models import Review
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(FastAdmin):
     list_display = ['id', 'product', 'user', 'rating', 'is_approved', 'created_at']
     list_filter = ['is_approved', 'rating']
-    search_fields = ['product__name', 'user__username']
\ No newline at end of file
+    list_select_related = ['product', 'user']
+    raw_id_fields = ['product', 'user']
+    indexed_search_fields = {'product__name': 'prefix', 'user__username': 'prefix'}
+    actions = ['approve_reviews', 'reject_reviews']
+
+    @admin.action(description="Approve selected reviews", permissions=['change'])
+    def approve_reviews(self, request, queryset):
+        count = queryset.moderate(approve=True)
+        self.message_user(request, f"{count} review(s) approved.")
+
+    @admin.action(description="Reject (delete) selected pending reviews", permissions=['delete'])
+    def reject_reviews(self, request, queryset):
+        count = queryset.moderate(approve=False)
+        self.message_user(request, f"{count} review(s) rejected.")
\ No newline at end of file
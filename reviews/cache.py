@@ -0,0 +1,74 @@
+"""
+Cached first pages of a product's approved reviews.
+
+Pages are cached per product under a versioned namespace
+(``reviews:product:<id>``, see ``ecommerce.cache``): creating, editing,
+voting on or deleting a review bumps its product's version only (see
+``signals.py``), and bulk moderation bumps all the touched products with
+one ``get_many``/``set_many``. Only the first ``CACHED_PAGES`` pages of the
+plain listing (``page``, ``ordering``, ``fields``, ``expand``) are cached,
+deeper pages are rarely read and go to the database.
+"""
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from ecommerce.cache import bump_version, bump_versions, get_version
+
+CACHED_PAGES = 3
+PAGE_TIMEOUT = 60 * 10
+CACHED_PARAMS = {'page', 'ordering', 'fields', 'expand'}
+
+
+def namespace(product_id):
+    return f'reviews:product:{product_id}'
+
+
+def invalidate(product_id):
+    bump_version(namespace(product_id))
+
+
+def invalidate_many(product_ids):
+    bump_versions({namespace(product_id) for product_id in product_ids})
+
+
+def page_key(product_id, request):
+    """Cache key of the requested page, or ``None`` when the page is not cached."""
+    params = request.query_params
+    if not set(params) <= CACHED_PARAMS:
+        return None
+    try:
+        page = int(params.get('page', 1))
+    except ValueError:
+        return None
+    if not 1 <= page <= CACHED_PAGES:
+        return None
+    # next/previous links are absolute, so the host and path (sync or async route) are part of the key
+    raw = repr((request.get_host(), request.path, sorted(params.items())))
+    version = get_version(namespace(product_id))
+    return f'{namespace(product_id)}:{version}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+
+def cached_page(product_id, request, render):
+    """``render()`` the response data of a page, through the cache when the page is cacheable."""
+    key = page_key(product_id, request)
+    if key is None:
+        return render()
+    data = cache.get(key)
+    if data is None:
+        data = render()
+        cache.set(key, data, PAGE_TIMEOUT)
+    return data
+
+
+async def acached_page(product_id, request, render):
+    """Async ``cached_page``, ``render`` being a coroutine function."""
+    key = await sync_to_async(page_key)(product_id, request)
+    if key is None:
+        return await render()
+    data = await cache.aget(key)
+    if data is None:
+        data = await render()
+        await cache.aset(key, data, PAGE_TIMEOUT)
+    return data
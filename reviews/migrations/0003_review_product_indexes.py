@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_productrecommendation'),
+        ('reviews', '0002_alter_review_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'is_approved', '-created_at'], name='review_product_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'is_approved', '-helpful_votes', '-created_at'], name='review_product_helpful_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_productrecommendation'),
+        ('reviews', '0003_review_product_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # the new indexes first, so the list never runs without one
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['product', '-created_at'], name='review_approved_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['product', '-helpful_votes', '-created_at'], name='review_approved_helpful_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_approved', False)), fields=['id'], name='review_pending_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_product_recent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_product_helpful_idx',
+        ),
+    ]
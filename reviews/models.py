@@ -1,9 +1,41 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from products.models import Product  # Assuming you have a Product model
+from . import cache
 
 User = get_user_model()
 
+
+class ReviewQuerySet(models.QuerySet):
+
+    def moderate(self, approve):
+        """
+        Approve (``approve=True``) or reject (delete) the pending reviews of
+        the queryset; approved reviews are left as they are either way.
+        Approval is a single UPDATE instead of per-row saves, followed by
+        one batched invalidation of the touched products' cached pages.
+        Returns the number of reviews changed.
+        """
+        from ecommerce.cache import bump_version
+        from products.facets import CATALOG_NAMESPACE
+
+        queryset = self.filter(is_approved=False)
+        if not approve:
+            # pending reviews are on no cached page and in no rating: the delete
+            # signals have nothing to invalidate (see signals.py)
+            _, deleted = queryset.delete()
+            return deleted.get(self.model._meta.label, 0)
+        with transaction.atomic():
+            product_ids = set(queryset.order_by().values_list('product_id', flat=True).distinct())
+            count = queryset.update(is_approved=True, updated_at=timezone.now())
+            if count:
+                # after the commit, as the per-row signals do
+                transaction.on_commit(lambda: cache.invalidate_many(product_ids))
+                transaction.on_commit(lambda: bump_version(CATALOG_NAMESPACE))
+        return count
+
+
 class Review(models.Model):
     RATING_CHOICES = [
         (1, '1 Star'),
@@ -22,6 +54,32 @@ class Review(models.Model):
     helpful_votes = models.PositiveIntegerField(default=0)
     is_approved = models.BooleanField(default=False)  # For moderation
 
+    objects = ReviewQuerySet.as_manager()
+
+    class Meta:
+        # approved reviews of a product, newest or most helpful first, and the moderation
+        # queue. Partial: SQLite never matches a bare boolean term (`WHERE "is_approved"`)
+        # against an index column, only against the condition of a partial index.
+        indexes = [
+            models.Index(fields=['product', '-created_at'], condition=models.Q(is_approved=True),
+                         name='review_approved_recent_idx'),
+            models.Index(fields=['product', '-helpful_votes', '-created_at'], condition=models.Q(is_approved=True),
+                         name='review_approved_helpful_idx'),
+            models.Index(fields=['id'], condition=models.Q(is_approved=False), name='review_pending_idx'),
+        ]
+
+    # what the catalog (ratings, popularity) reads of a review, see products/signals.py
+    CATALOG_FIELDS = ('is_approved', 'rating', 'product_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_catalog = instance.catalog_state()
+        return instance
+
+    def catalog_state(self):
+        return tuple(self.__dict__.get(field) for field in self.CATALOG_FIELDS)
+
     def __str__(self):
         username = self.user.username if self.user else "Anonymous"
         return f"Review by {username} for {self.product.name}"
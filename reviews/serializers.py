@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import Review
+from ecommerce.serializers import ValuesSerializer
+from products.serializers import ProductValuesSerializer
 
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,4 +22,13 @@ class ReviewUpdateSerializer(serializers.ModelSerializer):
 class HelpfulVoteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
-        fields = ['helpful_votes']
\ No newline at end of file
+        fields = ['helpful_votes']
+
+class ReviewModerationSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=['approve', 'reject'])
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=10000)
+
+class ReviewValuesSerializer(ValuesSerializer):
+    class Meta:
+        serializer = ReviewSerializer
+        expandable = {'product': ProductValuesSerializer}
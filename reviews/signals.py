@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import Review
+
+
+@receiver(post_save, sender=Review)
+def invalidate_review_pages(sender, instance, **kwargs):
+    # after the commit, so a concurrent read cannot cache the old page under the new version
+    product_id = instance.product_id
+    transaction.on_commit(lambda: cache.invalidate(product_id))
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review(sender, instance, **kwargs):
+    # pages list approved reviews only
+    if instance.is_approved:
+        product_id = instance.product_id
+        transaction.on_commit(lambda: cache.invalidate(product_id))
@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import ReviewListView, ReviewCreateView, ReviewUpdateView, ReviewDeleteView, HelpfulVoteView
+from .views import ReviewListView, AsyncReviewListView, ReviewCreateView, ReviewUpdateView, ReviewDeleteView, HelpfulVoteView, ReviewModerationView
 
 urlpatterns = [
     path('product/<int:product_id>/', ReviewListView.as_view(), name='review-list'),
+    path('product/<int:product_id>/async/', AsyncReviewListView.as_view(), name='review-list-async'),
     path('', ReviewCreateView.as_view(), name='review-create'),
+    path('moderate/', ReviewModerationView.as_view(), name='review-moderate'),
     path('<int:pk>/', ReviewUpdateView.as_view(), name='review-update'),
     path('<int:pk>/delete/', ReviewDeleteView.as_view(), name='review-delete'),
     path('<int:pk>/helpful/', HelpfulVoteView.as_view(), name='review-helpful'),
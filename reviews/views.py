@@ -1,16 +1,60 @@
-from rest_framework import generics, permissions, status
+from rest_framework import filters, generics, permissions, status
 from rest_framework.response import Response
+from . import cache
 from .models import Review
-from .serializers import ReviewSerializer, ReviewCreateSerializer, ReviewUpdateSerializer, HelpfulVoteSerializer
+from ecommerce.async_views import AsyncListAPIView
+from ecommerce.http_cache import CachePolicy
+from .serializers import (
+    ReviewSerializer, ReviewCreateSerializer, ReviewUpdateSerializer, HelpfulVoteSerializer, ReviewValuesSerializer,
+    ReviewModerationSerializer,
+)
+from ecommerce.mixins import ValuesListMixin
 
-class ReviewListView(generics.ListAPIView):
+# keyed by product: a new or moderated review purges that product's pages, not every review list
+REVIEW_CACHE = CachePolicy(public=True, kind='review', related={'product': 'product'}, url_keys={'product_id': 'product'})
+
+class ReviewListMixin:
+    """Approved reviews of a product, newest first; shared by the sync and async lists."""
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = [permissions.AllowAny]
+    cache_policy = REVIEW_CACHE
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['created_at', 'helpful_votes']
+    ordering = ['-created_at']
 
     def get_queryset(self):
         product_id = self.kwargs.get('product_id')
         return Review.objects.filter(product_id=product_id, is_approved=True)
 
+class ReviewListView(ReviewListMixin, ValuesListMixin, generics.ListAPIView):
+    """
+    Approved reviews of a product, newest first (``?ordering=-helpful_votes``
+    for the most helpful). The first pages are cached per product, see
+    ``reviews.cache``.
+    """
+
+    def list(self, request, *args, **kwargs):
+        data = cache.cached_page(
+            self.kwargs.get('product_id'), request, lambda: self.render_page(request, *args, **kwargs)
+        )
+        return Response(data)
+
+    def render_page(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs).data
+
+class AsyncReviewListView(ReviewListMixin, AsyncListAPIView):
+    """``ReviewListView`` on the async ORM, through the same page cache."""
+
+    async def list(self, request, *args, **kwargs):
+        data = await cache.acached_page(
+            self.kwargs.get('product_id'), request, lambda: self.render_page(request, *args, **kwargs)
+        )
+        return Response(data)
+
+    async def render_page(self, request, *args, **kwargs):
+        return (await super().list(request, *args, **kwargs)).data
+
 class ReviewCreateView(generics.ListCreateAPIView):
     serializer_class = ReviewCreateSerializer
     permission_classes = [permissions.AllowAny]
@@ -46,3 +90,16 @@ class HelpfulVoteView(generics.UpdateAPIView):
         review.helpful_votes += 1
         review.save()
         return Response({'helpful_votes': review.helpful_votes}, status=status.HTTP_200_OK)
+
+
+class ReviewModerationView(generics.GenericAPIView):
+    """Approve or reject (delete) up to 10,000 pending reviews at once, see ``ReviewQuerySet.moderate``."""
+    serializer_class = ReviewModerationSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        action, ids = serializer.validated_data['action'], serializer.validated_data['ids']
+        count = Review.objects.filter(pk__in=ids).moderate(approve=action == 'approve')
+        return Response({'action': action, 'count': count}, status=status.HTTP_200_OK)
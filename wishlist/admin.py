@@ -1,8 +1,11 @@
 from django.contrib import admin
+
+from ecommerce.admin_tools import FastAdmin
 from .models import Wishlist
 
 @admin.register(Wishlist)
-class WishlistAdmin(admin.ModelAdmin):
+class WishlistAdmin(FastAdmin):
     list_display = ['id', 'user', 'product', 'added_at']
-    list_filter = ['user']
-    search_fields = ['user__username', 'product__name']
\ No newline at end of file
+    list_select_related = ['user', 'product']
+    raw_id_fields = ['user', 'product']
+    indexed_search_fields = {'user__username': 'prefix', 'product__name': 'prefix'}
\ No newline at end of file
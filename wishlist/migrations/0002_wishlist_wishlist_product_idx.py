@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_price_name_indexes'),
+        ('wishlist', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wishlist',
+            index=models.Index(fields=['product', 'id'], name='wishlist_product_idx'),
+        ),
+    ]
@@ -1,16 +1,49 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from products.models import Product  # Assuming you have a Product model
 
 User = get_user_model()
 
+
+class WishlistQuerySet(models.QuerySet):
+
+    def move_to_cart(self, user, ids=None):
+        """
+        Move ``user``'s wishlist items (all of them, or those in ``ids``) to
+        their cart in one transaction of three statements, however many items
+        there are: read the rows, add them to the cart (merging quantities,
+        see ``CartItemQuerySet.add_from``) and delete them. Returns the moved
+        product ids.
+        """
+        from cart.models import CartItem
+
+        rows = self.filter(user=user)
+        if ids is not None:
+            rows = rows.filter(pk__in=ids)
+        with transaction.atomic():
+            moved = list(rows.select_for_update().order_by('pk').values_list('pk', 'product_id'))
+            if not moved:
+                return []
+            # items wishlisted after the read stay where they are
+            rows = rows.filter(pk__lte=moved[-1][0])
+            CartItem.objects.add_from(rows, user=user)
+            rows.delete()
+        return [product_id for _, product_id in moved]
+
+
 class Wishlist(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='wishlists')
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='wishlists')
     added_at = models.DateTimeField(auto_now_add=True)
 
+    objects = WishlistQuerySet.as_manager()
+
     class Meta:
         unique_together = ('user', 'product')  # Ensure a user can't add the same product twice
+        indexes = [
+            # a product's wishlisters in primary key order, walked by notifications.fanout
+            models.Index(fields=['product', 'id'], name='wishlist_product_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s wishlist: {self.product.name}"
\ No newline at end of file
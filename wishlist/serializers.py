@@ -1,13 +1,19 @@
 from rest_framework import serializers
 from .models import Wishlist
+from ecommerce.serializers import SparseFieldsMixin
 
-class WishlistSerializer(serializers.ModelSerializer):
+class WishlistSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Wishlist
         fields = ['id', 'user', 'product', 'added_at']
         read_only_fields = ['id', 'user', 'added_at']
+        expandable_fields = {'product': 'products.serializers.ProductSerializer'}
 
 class WishlistCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Wishlist
-        fields = ['product']
\ No newline at end of file
+        fields = ['product']
+
+class WishlistMoveSerializer(serializers.Serializer):
+    # wishlist item ids to move; all items when omitted
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=1000)
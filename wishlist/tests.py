@@ -1,3 +1,82 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from cart.models import CartItem
+from products.models import Product
+from .models import Wishlist
+
+User = get_user_model()
+
+
+class MoveToCartTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='shopper', email='shopper@example.com', password='pass-1234')
+        cls.other = User.objects.create_user(username='other', email='other@example.com', password='pass-1234')
+        cls.products = Product.objects.bulk_create(
+            Product(name=f'Product {i}', description='', price=Decimal('9.99'), stock=10) for i in range(500)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def wishlist(self, products, user=None):
+        return Wishlist.objects.bulk_create(Wishlist(user=user or self.user, product=product) for product in products)
+
+    def move_queries(self, count):
+        self.wishlist(self.products[:count])
+        with CaptureQueriesContext(connection) as queries:
+            moved = Wishlist.objects.move_to_cart(self.user)
+        self.assertEqual(len(moved), count)
+        return len(queries)
+
+    def test_constant_queries(self):
+        one = self.move_queries(1)
+        CartItem.objects.all().delete()
+        self.assertEqual(self.move_queries(500), one)
+        self.assertEqual(CartItem.objects.filter(user=self.user).count(), 500)
+        self.assertFalse(Wishlist.objects.filter(user=self.user).exists())
+
+    def test_endpoint_constant_queries(self):
+        counts = []
+        for count in (1, 500):
+            self.wishlist(self.products[:count])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/wishlist/move-to-cart/', {}, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['moved'], count)
+            counts.append(len(queries))
+            CartItem.objects.all().delete()
+        self.assertEqual(counts[0], counts[1])
+
+    def test_merges_quantities_and_keeps_other_owners(self):
+        first, second, third = self.products[:3]
+        CartItem.objects.create(user=self.user, product=first, quantity=2)
+        CartItem.objects.create(user=self.other, product=first, quantity=5)
+        CartItem.objects.create(session_key='anonymous-session', product=second, quantity=1)
+        items = self.wishlist([first, second, third])
+        self.wishlist([first], user=self.other)
+
+        response = self.client.post('/api/wishlist/move-to-cart/', {'ids': [items[0].pk, items[1].pk]}, format='json')
+
+        self.assertEqual(response.data['products'], [first.pk, second.pk])
+        quantities = dict(CartItem.objects.filter(user=self.user).values_list('product', 'quantity'))
+        self.assertEqual(quantities, {first.pk: 3, second.pk: 1})
+        self.assertEqual(CartItem.objects.get(user=self.other).quantity, 5)
+        self.assertEqual(CartItem.objects.get(session_key='anonymous-session').quantity, 1)
+        self.assertEqual(list(Wishlist.objects.filter(user=self.user).values_list('product', flat=True)), [third.pk])
+        self.assertTrue(Wishlist.objects.filter(user=self.other).exists())
 
-# Create your tests here.
+    def test_single_item_is_scoped_to_the_user(self):
+        item, = self.wishlist(self.products[:1], user=self.other)
+        response = self.client.post(f'/api/wishlist/{item.pk}/move-to-cart/')
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Wishlist.objects.filter(pk=item.pk).exists())
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import WishlistListView, WishlistCreateView, WishlistDeleteView, MoveToCartView
+from .views import WishlistListView, WishlistCreateView, WishlistDeleteView, MoveToCartView, BulkMoveToCartView
 
 urlpatterns = [
     path('', WishlistListView.as_view(), name='wishlist-list'),
     path('', WishlistCreateView.as_view(), name='wishlist-create'),
+    path('move-to-cart/', BulkMoveToCartView.as_view(), name='wishlist-bulk-move-to-cart'),
     path('<int:pk>/', WishlistDeleteView.as_view(), name='wishlist-delete'),
     path('<int:pk>/move-to-cart/', MoveToCartView.as_view(), name='wishlist-move-to-cart'),
 ]
\ No newline at end of file
@@ -1,10 +1,10 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import Wishlist
-from .serializers import WishlistSerializer, WishlistCreateSerializer
-from cart.models import CartItem  # Import the Cart model from the cart app
+from .serializers import WishlistSerializer, WishlistCreateSerializer, WishlistMoveSerializer
+from ecommerce.mixins import SparseFieldsViewMixin
 
-class WishlistListView(generics.ListAPIView):
+class WishlistListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = WishlistSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -32,17 +32,28 @@ class MoveToCartView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request, *args, **kwargs):
-        # Move the product from wishlist to cart without authentication
-        wishlist_item = Wishlist.objects.filter(id=kwargs['pk']).first()
-
-        if wishlist_item:
-            # Check if the product is already in the cart
-            if not CartItem.objects.filter(product=wishlist_item.product).exists():
-                # Add the product to the cart without associating it with a user
-                CartItem.objects.create(product=wishlist_item.product)
-            
-            # Remove the product from the wishlist
-            wishlist_item.delete()
+        # Move one of the requesting user's wishlist items to their cart
+        moved = move_to_cart(request, ids=[kwargs['pk']])
+        if moved:
             return Response({'message': 'Product moved to cart'}, status=status.HTTP_200_OK)
-        
         return Response({'error': 'Wishlist item not found'}, status=status.HTTP_404_NOT_FOUND)
+
+class BulkMoveToCartView(generics.CreateAPIView):
+    """
+    Move all of the requesting user's wishlist items, or those listed in
+    ``ids``, to their cart with a constant number of queries.
+    """
+    serializer_class = WishlistMoveSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        moved = move_to_cart(request, ids=serializer.validated_data.get('ids'))
+        return Response({'moved': len(moved), 'products': moved}, status=status.HTTP_200_OK)
+
+def move_to_cart(request, ids=None):
+    # wishlist items always belong to a user, anonymous sessions have nothing to move
+    if not request.user.is_authenticated:
+        return []
+    return Wishlist.objects.move_to_cart(request.user, ids=ids)